@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+折线图/散点图绘制前的降采样
+提供 LTTB（Largest-Triangle-Three-Buckets）和按像素列取最大最小值两种方法，
+目标点数由子图宽度和 dpi 决定，点数再多也只画出图上能分辨的部分，同时保留峰值。
+"""
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+METHODS = ('lttb', 'minmax')
+
+
+def axes_pixel_width(ax, dpi):
+    """子图在输出图片中的像素宽度"""
+    fig = ax.get_figure()
+    return max(1, int(fig.get_figwidth() * dpi * ax.get_position().width))
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets 降采样，返回选中点的下标
+    首尾两点固定保留，中间每个桶选出与前一个选中点、后一个桶均值构成三角形面积最大的点
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # 中间 n-2 个点均分为 n_out-2 个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts = edges[:-1]
+    ends = edges[1:]
+
+    # 各桶均值，最后一个桶之后接上末尾点
+    sums_x = np.add.reduceat(x[1:n - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], starts - 1)
+    counts = ends - starts
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = starts[i], ends[i]
+        bx, by = x[lo:hi], y[lo:hi]
+        # 三角形面积的两倍（省略常数 1/2 不影响比较）
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(x, y, n_columns):
+    """按像素列分桶，每个桶保留最小值和最大值所在的点，返回按 x 排序的下标"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= 2 * n_columns:
+        return np.arange(n)
+
+    span = x[-1] - x[0]
+    if span <= 0:
+        bucket = np.zeros(n, dtype=np.int64)
+    else:
+        bucket = np.minimum(((x - x[0]) / span * n_columns).astype(np.int64), n_columns - 1)
+
+    # 先按桶、再按 y 排序，每个桶的第一个和最后一个即为最小值、最大值
+    order = np.lexsort((y, bucket))
+    sorted_bucket = bucket[order]
+    boundary = np.flatnonzero(np.diff(sorted_bucket)) + 1
+    first = np.concatenate(([0], boundary))
+    last = np.concatenate((boundary - 1, [n - 1]))
+    keep = np.union1d(order[first], order[last])
+    return np.union1d(keep, [0, n - 1])
+
+
+def downsample_xy(x, y, n_pixels, method='lttb', px_per_point=2):
+    """
+    对一条序列降采样，返回 (x, y)
+    lttb 保留 n_pixels / px_per_point 个点；minmax 每个像素列最多保留 2 个点
+    """
+    if method not in METHODS:
+        raise ValueError(f"不支持的降采样方法: {method}")
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if method == 'lttb':
+        idx = lttb(x, y, max(3, n_pixels // px_per_point))
+    else:
+        idx = minmax(x, y, n_pixels)
+    return x[idx], y[idx]
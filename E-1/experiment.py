@@ -1,201 +1,125 @@
-import pandas as pd  # pyright: ignore[reportMissingImports]
-import matplotlib.pyplot as plt  # pyright: ignore[reportMissingImports]
-import numpy as np  # pyright: ignore[reportMissingImports]
-from matplotlib import font_manager  # pyright: ignore[reportMissingImports]
-
-plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
+import argparse
+import functools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common import stages
+from common.render_manifest import RenderManifest
+from common.sheet_cache import read_sheets_cached
+from figures import MAX_TOP_K, build_task1, build_task2, build_task3, render_figures
+from history_stream import load_history_rollup
+from image_output import FORMATS, TARGETS
+from render_manifest import task_fingerprint
 
 excel_file = './E-1/covid19_data.xls'
-
-data_history = pd.read_excel(excel_file, sheet_name='data_history')
-data_world = pd.read_excel(excel_file, sheet_name='data_world')
-current_prov = pd.read_excel(excel_file, sheet_name='current_prov')
-
-print("数据读取成功！")
-print(f"data_history 形状: {data_history.shape}")
-print(f"data_world 形状: {data_world.shape}")
-print(f"current_prov 形状: {current_prov.shape}")
-
-# ==================== 任务1：折线图和散点图 ====================
-print("\n正在绘制任务1：折线图和散点图...")
-
-# 准备数据
-dates = data_history['date'] if 'date' in data_history.columns else data_history.iloc[:, 0]
-confirm = data_history['confirm'] if 'confirm' in data_history.columns else data_history.iloc[:, 1]
-dead = data_history['dead'] if 'dead' in data_history.columns else data_history.iloc[:, 2]
-heal = data_history['heal'] if 'heal' in data_history.columns else data_history.iloc[:, 3]
-
-# 如果日期是字符串，转换为索引
-if dates.dtype == 'object':
-    x_values = range(len(dates))
-    x_labels = dates
-else:
-    x_values = dates
-    x_labels = dates
-
-# 创建折线图和散点图的子图
-fig1, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-
-# 折线图
-ax1.plot(x_values, confirm, marker='o', linestyle='-', linewidth=2, 
-         color='#FF6B6B', label='确诊(confirm)', markersize=4)
-ax1.plot(x_values, dead, marker='s', linestyle='-', linewidth=2, 
-         color='#4ECDC4', label='死亡(dead)', markersize=4)
-ax1.plot(x_values, heal, marker='^', linestyle='-', linewidth=2, 
-         color='#95E1D3', label='治愈(heal)', markersize=4)
-ax1.set_xlabel('日期', fontsize=12)
-ax1.set_ylabel('人数', fontsize=12)
-ax1.set_title('新冠疫情数据 - 折线图', fontsize=14, fontweight='bold')
-ax1.legend(loc='best', fontsize=10)
-ax1.grid(True, alpha=0.3, linestyle='--')
-# 设置x轴刻度
-if len(x_labels) > 20:
-    step = len(x_labels) // 10
-    ax1.set_xticks(x_values[::step])
-    ax1.set_xticklabels(x_labels[::step], rotation=45, ha='right')
-else:
-    ax1.set_xticks(x_values)
-    ax1.set_xticklabels(x_labels, rotation=45, ha='right')
-ax1.tick_params(axis='y', labelsize=9)
-
-# 散点图
-ax2.scatter(x_values, confirm, s=50, alpha=0.6, color='#FF6B6B', 
-           marker='o', label='确诊(confirm)', edgecolors='darkred', linewidths=0.5)
-ax2.scatter(x_values, dead, s=50, alpha=0.6, color='#4ECDC4', 
-           marker='s', label='死亡(dead)', edgecolors='darkcyan', linewidths=0.5)
-ax2.scatter(x_values, heal, s=50, alpha=0.6, color='#95E1D3', 
-           marker='^', label='治愈(heal)', edgecolors='darkgreen', linewidths=0.5)
-ax2.set_xlabel('日期', fontsize=12)
-ax2.set_ylabel('人数', fontsize=12)
-ax2.set_title('新冠疫情数据 - 散点图', fontsize=14, fontweight='bold')
-ax2.legend(loc='best', fontsize=10)
-ax2.grid(True, alpha=0.3, linestyle='--')
-# 设置x轴刻度
-if len(x_labels) > 20:
-    step = len(x_labels) // 10
-    ax2.set_xticks(x_values[::step])
-    ax2.set_xticklabels(x_labels[::step], rotation=45, ha='right')
-else:
-    ax2.set_xticks(x_values)
-    ax2.set_xticklabels(x_labels, rotation=45, ha='right')
-ax2.tick_params(axis='y', labelsize=9)
-
-plt.tight_layout()
-plt.savefig('task1_line_scatter.png', dpi=300, bbox_inches='tight')
-print("任务1完成，图片已保存为 task1_line_scatter.png")
-plt.close()
-
-# ==================== 任务2：饼图 ====================
-print("\n正在绘制任务2：饼图...")
-
-# 获取确诊人数最多的前4个国家
-top4_world = data_world.nlargest(4, 'confirm' if 'confirm' in data_world.columns else data_world.columns[1])
-
-# 准备饼图数据
-countries = top4_world.iloc[:, 0] if top4_world.columns[0] != 'confirm' else top4_world.index
-confirm_data = top4_world['confirm'] if 'confirm' in top4_world.columns else top4_world.iloc[:, 1]
-dead_data = top4_world['dead'] if 'dead' in top4_world.columns else top4_world.iloc[:, 2]
-heal_data = top4_world['heal'] if 'heal' in top4_world.columns else top4_world.iloc[:, 3]
-suspect_data = top4_world['suspect'] if 'suspect' in top4_world.columns else top4_world.iloc[:, 4]
-
-# 创建4个子图，每个国家一个饼图
-fig2, axes = plt.subplots(2, 2, figsize=(14, 12))
-axes = axes.flatten()
-
-colors = ['#FF6B6B', '#4ECDC4', '#95E1D3', '#FFE66D']
-labels = ['确诊(confirm)', '死亡(dead)', '治愈(heal)', '疑似(suspect)']
-
-for i, country in enumerate(countries):
-    values = [confirm_data.iloc[i], dead_data.iloc[i], heal_data.iloc[i], suspect_data.iloc[i]]
-    # 过滤掉0值
-    non_zero_values = [v for v in values if v > 0]
-    non_zero_labels = [labels[j] for j, v in enumerate(values) if v > 0]
-    non_zero_colors = [colors[j] for j, v in enumerate(values) if v > 0]
-    
-    axes[i].pie(non_zero_values, labels=non_zero_labels, colors=non_zero_colors, 
-                autopct='%1.1f%%', startangle=90, textprops={'fontsize': 9})
-    axes[i].set_title(f'{country}\n(确诊: {confirm_data.iloc[i]:,})', 
-                     fontsize=12, fontweight='bold')
-
-plt.suptitle('前4个国家新冠疫情数据分布饼图', fontsize=16, fontweight='bold', y=0.98)
-plt.tight_layout()
-plt.savefig('task2_pie_chart.png', dpi=300, bbox_inches='tight')
-print("任务2完成，图片已保存为 task2_pie_chart.png")
-plt.close()
-
-# ==================== 任务3：直方图和条形图 ====================
-print("\n正在绘制任务3：直方图和条形图...")
-
-# 准备数据
-provinces = current_prov.iloc[:, 0] if current_prov.columns[0] != 'confirm' else current_prov.index
-confirm_prov = current_prov['confirm'] if 'confirm' in current_prov.columns else current_prov.iloc[:, 1]
-dead_prov = current_prov['dead'] if 'dead' in current_prov.columns else current_prov.iloc[:, 2]
-heal_prov = current_prov['heal'] if 'heal' in current_prov.columns else current_prov.iloc[:, 3]
-
-# 创建直方图和条形图的子图
-fig3, axes = plt.subplots(2, 2, figsize=(16, 12))
-
-# 直方图 - 确诊人数分布
-axes[0, 0].hist(confirm_prov, bins=15, color='#FF6B6B', alpha=0.7, edgecolor='black', linewidth=1)
-axes[0, 0].set_xlabel('确诊人数', fontsize=11)
-axes[0, 0].set_ylabel('省份数量', fontsize=11)
-axes[0, 0].set_title('各省确诊人数分布 - 直方图', fontsize=12, fontweight='bold')
-axes[0, 0].grid(True, alpha=0.3, axis='y', linestyle='--')
-
-# 直方图 - 死亡人数分布
-axes[0, 1].hist(dead_prov, bins=15, color='#4ECDC4', alpha=0.7, edgecolor='black', linewidth=1)
-axes[0, 1].set_xlabel('死亡人数', fontsize=11)
-axes[0, 1].set_ylabel('省份数量', fontsize=11)
-axes[0, 1].set_title('各省死亡人数分布 - 直方图', fontsize=12, fontweight='bold')
-axes[0, 1].grid(True, alpha=0.3, axis='y', linestyle='--')
-
-# 条形图 - 堆叠条形图（显示前15个省份）
-top_n = min(15, len(provinces))
-x_pos = np.arange(top_n)
-width = 0.6
-
-axes[1, 0].bar(x_pos, confirm_prov[:top_n], width, label='确诊(confirm)', 
-               color='#FF6B6B', alpha=0.8, edgecolor='black', linewidth=0.5)
-axes[1, 0].bar(x_pos, dead_prov[:top_n], width, bottom=confirm_prov[:top_n], 
-               label='死亡(dead)', color='#4ECDC4', alpha=0.8, edgecolor='black', linewidth=0.5)
-axes[1, 0].bar(x_pos, heal_prov[:top_n], width, 
-               bottom=confirm_prov[:top_n] + dead_prov[:top_n], 
-               label='治愈(heal)', color='#95E1D3', alpha=0.8, edgecolor='black', linewidth=0.5)
-axes[1, 0].set_xlabel('省份', fontsize=11)
-axes[1, 0].set_ylabel('人数', fontsize=11)
-axes[1, 0].set_title(f'前{top_n}个省份新冠疫情数据 - 堆叠条形图', fontsize=12, fontweight='bold')
-axes[1, 0].set_xticks(x_pos)
-axes[1, 0].set_xticklabels(provinces[:top_n], rotation=45, ha='right', fontsize=8)
-axes[1, 0].legend(loc='best', fontsize=9)
-axes[1, 0].grid(True, alpha=0.3, axis='y', linestyle='--')
-
-# 条形图 - 分组条形图（显示前15个省份）
-x_pos = np.arange(top_n)
-width = 0.25
-
-axes[1, 1].bar(x_pos - width, confirm_prov[:top_n], width, label='确诊(confirm)', 
-               color='#FF6B6B', alpha=0.8, edgecolor='black', linewidth=0.5)
-axes[1, 1].bar(x_pos, dead_prov[:top_n], width, label='死亡(dead)', 
-               color='#4ECDC4', alpha=0.8, edgecolor='black', linewidth=0.5)
-axes[1, 1].bar(x_pos + width, heal_prov[:top_n], width, label='治愈(heal)', 
-               color='#95E1D3', alpha=0.8, edgecolor='black', linewidth=0.5)
-axes[1, 1].set_xlabel('省份', fontsize=11)
-axes[1, 1].set_ylabel('人数', fontsize=11)
-axes[1, 1].set_title(f'前{top_n}个省份新冠疫情数据 - 分组条形图', fontsize=12, fontweight='bold')
-axes[1, 1].set_xticks(x_pos)
-axes[1, 1].set_xticklabels(provinces[:top_n], rotation=45, ha='right', fontsize=8)
-axes[1, 1].legend(loc='best', fontsize=9)
-axes[1, 1].grid(True, alpha=0.3, axis='y', linestyle='--')
-
-plt.tight_layout()
-plt.savefig('task3_histogram_bar.png', dpi=300, bbox_inches='tight')
-print("任务3完成，图片已保存为 task3_histogram_bar.png")
-plt.close()
-
-print("\n所有任务完成！")
-print("生成的图片文件：")
-print("  - task1_line_scatter.png (折线图和散点图)")
-print("  - task2_pie_chart.png (饼图)")
-print("  - task3_histogram_bar.png (直方图和条形图)")
-
+manifest_file = './E-1/.cache/render_manifest.json'
+
+
+def positive_int(text):
+    """argparse 类型：大于 0 的整数"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"必须是正整数：{text}")
+    return value
+
+
+def top_k_value(text):
+    """argparse 类型：1 到 MAX_TOP_K 之间的整数"""
+    value = positive_int(text)
+    if value > MAX_TOP_K:
+        raise argparse.ArgumentTypeError(f"不能大于 {MAX_TOP_K}：{text}")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='实验一：matplotlib库应用')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='并行渲染图表的进程数，0 表示使用全部CPU核心（默认: 1）')
+    parser.add_argument('--history', default=None,
+                        help='从 CSV/Parquet 文件流式读取 data_history（替代工作簿中的 data_history 表）')
+    parser.add_argument('--history-group', default=None,
+                        help='历史数据中的地区列名，各地区累计值先按地区取每天最后一条再求和')
+    parser.add_argument('--chunksize', type=int, default=500_000,
+                        help='流式读取时每块的行数（默认: 500000）')
+    parser.add_argument('--downsample', choices=['lttb', 'minmax', 'none'], default='lttb',
+                        help='任务1折线图/散点图的降采样方法（默认: lttb）')
+    parser.add_argument('--top-k', type=top_k_value, default=4,
+                        help=f'任务2饼图显示确诊人数最多的前k个国家，最多 {MAX_TOP_K} 个（默认: 4）')
+    parser.add_argument('--force', action='store_true',
+                        help='忽略渲染清单，重新生成所有图片')
+    parser.add_argument('--watch', type=float, default=0,
+                        help='每隔多少秒重新检查数据并只刷新有变化的图片（默认: 0，只运行一次）')
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=['print'],
+                        help='输出的图片尺寸：thumb（50dpi）、screen（100dpi）、print（300dpi）（默认: print）')
+    parser.add_argument('--format', choices=FORMATS, default='png', dest='image_format',
+                        help='图片编码格式（默认: png）')
+    stages.add_arguments(parser)
+    args = parser.parse_args()
+    stages.configure(args)
+
+    manifest = RenderManifest(manifest_file)
+    while True:
+        run(args, manifest)
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+
+def run(args, manifest):
+    stages.start('数据读取', kind='load')
+    # 使用列式缓存读取，工作簿未变化时不再经过 xlrd 解析
+    sheets = read_sheets_cached(excel_file, ['data_history', 'data_world', 'current_prov'])
+    data_history = sheets['data_history']
+    data_world = sheets['data_world']
+    current_prov = sheets['current_prov']
+
+    if args.history:
+        # 大规模历史数据：按块读取并汇总，只把汇总结果交给绘图
+        data_history, freq, rows = load_history_rollup(
+            args.history, chunksize=args.chunksize, group_col=args.history_group)
+        print(f"已流式读取 {args.history}：{rows} 行，按 {freq} 粒度汇总为 {len(data_history)} 个点")
+
+    stages.stop()
+
+    print("数据读取成功！")
+    print(f"data_history 形状: {data_history.shape}")
+    print(f"data_world 形状: {data_world.shape}")
+    print(f"current_prov 形状: {current_prov.shape}")
+
+    output_opts = {'targets': tuple(args.targets), 'fmt': args.image_format}
+    downsample = None if args.downsample == 'none' else args.downsample
+    tasks = [
+        (functools.partial(build_task1, downsample=downsample, **output_opts),
+         data_history, 'task1_line_scatter.png'),
+        (functools.partial(build_task2, top_k=args.top_k, **output_opts), data_world, 'task2_pie_chart.png'),
+        (functools.partial(build_task3, **output_opts), current_prov, 'task3_histogram_bar.png'),
+    ]
+    names = ['任务1', '任务2', '任务3']
+
+    # 输入数据和参数都没有变化的图片直接跳过
+    fingerprints = [task_fingerprint(builder, data) for builder, data, _ in tasks]
+    pending = []
+    for name, task, fingerprint in zip(names, tasks, fingerprints):
+        if not args.force and manifest.is_fresh(task[2], fingerprint):
+            print(f"{name}输入未变化，跳过（{task[2]}）")
+        else:
+            pending.append((name, task, fingerprint))
+
+    print(f"\n正在绘制{len(pending)}个图表，并行进程数: {args.jobs}...")
+    outputs = render_figures([(name, *task) for name, task, _ in pending], jobs=args.jobs)
+    for (name, task, fingerprint), files in zip(pending, outputs):
+        manifest.record(task[2], fingerprint, files)
+        print(f"{name}完成，图片已保存为 {', '.join(files)}")
+    manifest.save()
+
+    print("\n所有任务完成！")
+    print("生成的图片文件：")
+    print("  - task1_line_scatter.png (折线图和散点图)")
+    print("  - task2_pie_chart.png (饼图)")
+    print("  - task3_histogram_bar.png (直方图和条形图)")
+
+
+if __name__ == '__main__':
+    main()
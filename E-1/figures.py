@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+"""
+实验一的图表构建函数
+每个任务是一个独立的构建函数：输入 DataFrame，输出 PNG 文件，
+可以在进程池中各自渲染，互不依赖。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib  # pyright: ignore[reportMissingImports]
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # pyright: ignore[reportMissingImports]
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+from common import stages
+from common.binning import equal_width_edges, histogram
+from downsample import axes_pixel_width, downsample_xy
+from image_output import DEFAULT_TARGETS, render_dpi, save_figure, tight_crop, write_image
+from pie_data import pie_slices, top_k_pies
+
+plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
+plt.rcParams['axes.unicode_minus'] = False
+
+
+# ==================== 任务1：折线图和散点图 ====================
+SERIES_STYLES = [
+    # (列名, 颜色, 标记, 图例, 散点边框色)
+    ('confirm', '#FF6B6B', 'o', '确诊(confirm)', 'darkred'),
+    ('dead', '#4ECDC4', 's', '死亡(dead)', 'darkcyan'),
+    ('heal', '#95E1D3', '^', '治愈(heal)', 'darkgreen'),
+]
+
+
+class LineScatterFigure:
+    """
+    任务1的持久化图表模板
+    坐标轴、标题、网格、图例等静态元素只创建一次；刷新时只更新折线和散点的数据。
+    坐标范围按数据范围留出余量后固定，数据仍在范围内且刻度不变时用 blit 在缓存的背景上只重画数据；
+    数据超出（或远小于）当前范围、刻度变化时才重新确定范围、整图重绘并重新缓存背景。
+    """
+
+    # 重新确定范围时在数据上方/右侧留出的余量（占数据跨度的比例），追加的数据在余量内时不需要整图重绘
+    HEADROOM = 0.25
+    MARGIN = 0.05
+
+    def __init__(self, downsample='lttb', dpi=300):
+        self.downsample = downsample
+        self.dpi = dpi
+        # 创建折线图和散点图的子图
+        self.fig, (self.ax1, self.ax2) = plt.subplots(1, 2, figsize=(16, 6), dpi=dpi)
+        ax1, ax2 = self.ax1, self.ax2
+
+        # 折线图
+        self.lines = [
+            ax1.plot([], [], marker=marker, linestyle='-', linewidth=2,
+                     color=color, label=label, markersize=4, animated=True)[0]
+            for _, color, marker, label, _ in SERIES_STYLES
+        ]
+        ax1.set_xlabel('日期', fontsize=12)
+        ax1.set_ylabel('人数', fontsize=12)
+        ax1.set_title('新冠疫情数据 - 折线图', fontsize=14, fontweight='bold')
+        ax1.grid(True, alpha=0.3, linestyle='--')
+        ax1.tick_params(axis='y', labelsize=9)
+
+        # 散点图
+        self.scatters = [
+            ax2.scatter(np.empty(0), np.empty(0), s=50, alpha=0.6, color=color, marker=marker,
+                        label=label, edgecolors=edge, linewidths=0.5, animated=True)
+            for _, color, marker, label, edge in SERIES_STYLES
+        ]
+        ax2.set_xlabel('日期', fontsize=12)
+        ax2.set_ylabel('人数', fontsize=12)
+        ax2.set_title('新冠疫情数据 - 散点图', fontsize=14, fontweight='bold')
+        ax2.grid(True, alpha=0.3, linestyle='--')
+        ax2.tick_params(axis='y', labelsize=9)
+
+        self.n_pixels = axes_pixel_width(ax1, dpi=dpi)
+        self._limits = None
+        self._layout_state = None
+        self._background = None
+        self._crop = None
+        self._image = None
+
+    def update(self, data_history):
+        """更新数据；返回 True 表示需要整图重绘"""
+        # 准备数据
+        dates = data_history['date'] if 'date' in data_history.columns else data_history.iloc[:, 0]
+        values = [data_history[col] if col in data_history.columns else data_history.iloc[:, i + 1]
+                  for i, (col, *_) in enumerate(SERIES_STYLES)]
+
+        # 横轴统一使用位置下标，刻度显示原始日期；点数超过子图像素宽度时先降采样
+        x_values = np.arange(len(dates))
+        x_labels = dates.astype(str).tolist()
+        y_all = [np.asarray(y, dtype=float) for y in values]
+        for line, scatter, y in zip(self.lines, self.scatters, y_all):
+            if self.downsample and len(x_values) > self.n_pixels:
+                x, y = downsample_xy(x_values, y, self.n_pixels, method=self.downsample)
+            else:
+                x = x_values
+            line.set_data(x, y)
+            scatter.set_offsets(np.column_stack((x, y)))
+
+        finite = np.concatenate(y_all) if y_all else np.empty(0)
+        finite = finite[np.isfinite(finite)]
+        y_range = (finite.min(), finite.max()) if len(finite) else (0.0, 1.0)
+        x_range = (0.0, float(max(len(x_values) - 1, 0)))
+        if self._limits is None or not (self._covers(self._limits[0], x_range)
+                                        and self._covers(self._limits[1], y_range)):
+            self._limits = (self._padded(*x_range), self._padded(*y_range))
+        xlim, ylim = self._limits
+
+        # 设置x轴刻度：间隔由固定的横轴范围决定，追加数据时已有刻度不变，只在跨过下一个刻度时增加一个
+        if xlim[1] > 20:
+            step = int(xlim[1]) // 10
+            ticks, tick_labels = x_values[::step], x_labels[::step]
+        else:
+            ticks, tick_labels = x_values, x_labels
+
+        layout_state = (tuple(ticks), tuple(tick_labels), xlim, ylim)
+        full = layout_state != self._layout_state
+        if full:
+            for ax in (self.ax1, self.ax2):
+                ax.set_xlim(*xlim)
+                ax.set_ylim(*ylim)
+                ax.set_xticks(ticks)
+                ax.set_xticklabels(tick_labels, rotation=45, ha='right')
+                ax.legend(loc='best', fontsize=10)
+            self._layout_state = layout_state
+        self._redraw(full)
+        return full
+
+    @classmethod
+    def _padded(cls, lo, hi):
+        """数据范围 [lo, hi] 加上余量后的坐标范围"""
+        span = max(hi - lo, 1.0)
+        return (lo - cls.MARGIN * span, hi + (cls.MARGIN + cls.HEADROOM) * span)
+
+    @classmethod
+    def _covers(cls, limits, data_range):
+        """当前坐标范围仍适合数据：数据在范围内，且没有缩小到只占范围的一小部分"""
+        lo, hi = data_range
+        if lo < limits[0] or hi > limits[1]:
+            return False
+        fitted = cls._padded(lo, hi)
+        return (fitted[1] - fitted[0]) * 2 > limits[1] - limits[0]
+
+    def _redraw(self, full):
+        canvas = self.fig.canvas
+        if full or self._background is None:
+            self.fig.tight_layout()
+            canvas.draw()
+            self._background = canvas.copy_from_bbox(self.fig.bbox)
+            self._crop = tight_crop(self.fig, self.dpi)
+        else:
+            canvas.restore_region(self._background)
+        for artist in self.lines:
+            self.ax1.draw_artist(artist)
+        for artist in self.scatters:
+            self.ax2.draw_artist(artist)
+        self._image = np.asarray(canvas.buffer_rgba())[self._crop]
+
+    def save(self, output, targets=DEFAULT_TARGETS, fmt='png'):
+        return write_image(self._image, output, self.dpi, targets=targets, fmt=fmt)
+
+
+# 同一进程内重复渲染（如 --watch 定时刷新）时复用图表模板；
+# 模板保存在本进程中，render_figures 总是在主进程中运行 build_task1（见 MAIN_PROCESS_BUILDERS）
+_TASK1_FIGURES = {}
+
+
+def build_task1(data_history, output='task1_line_scatter.png', downsample='lttb',
+                targets=DEFAULT_TARGETS, fmt='png'):
+    dpi = render_dpi(targets)
+    key = (os.path.abspath(output), downsample, dpi)
+    figure = _TASK1_FIGURES.get(key)
+    if figure is None:
+        figure = _TASK1_FIGURES[key] = LineScatterFigure(downsample=downsample, dpi=dpi)
+    figure.update(data_history)
+    return figure.save(output, targets=targets, fmt=fmt)
+
+
+# ==================== 任务2：饼图 ====================
+# 每个饼图的尺寸（英寸）和整张图的上限：国家较多时缩小每个饼图，画布不随 top_k 无限增大；
+# MAX_TOP_K 个饼图（5 x 5）时每个约 4.2 x 3.6 英寸，再多就看不清了
+PIE_SIZE = (7, 6)
+MAX_PIE_FIGSIZE = (21, 18)
+MAX_TOP_K = 25
+
+
+def build_task2(data_world, output='task2_pie_chart.png', top_k=4, targets=DEFAULT_TARGETS, fmt='png'):
+    # 准备“国家 × 指标”矩阵
+    countries = data_world.iloc[:, 0] if data_world.columns[0] != 'confirm' else data_world.index
+    metric_cols = ['confirm', 'dead', 'heal', 'suspect']
+    metric_cols = [col if col in data_world.columns else data_world.columns[i + 1]
+                   for i, col in enumerate(metric_cols)]
+    matrix = data_world[metric_cols].to_numpy()
+
+    # 获取确诊人数最多的前k个国家，并一次性算出各国的非零掩码
+    top_countries, top_values, non_zero = top_k_pies(countries, matrix, top_k)
+
+    # 创建k个子图，每个国家一个饼图
+    ncols = int(np.ceil(np.sqrt(len(top_countries))))
+    nrows = int(np.ceil(len(top_countries) / ncols))
+    figsize = (min(PIE_SIZE[0] * ncols, MAX_PIE_FIGSIZE[0]), min(PIE_SIZE[1] * nrows, MAX_PIE_FIGSIZE[1]))
+    fig2, axes = plt.subplots(nrows, ncols, figsize=figsize, squeeze=False)
+    axes = axes.flatten()
+
+    colors = ['#FF6B6B', '#4ECDC4', '#95E1D3', '#FFE66D']
+    labels = ['确诊(confirm)', '死亡(dead)', '治愈(heal)', '疑似(suspect)']
+
+    for i, country in enumerate(top_countries):
+        # 过滤掉0值
+        non_zero_values, non_zero_labels, non_zero_colors = pie_slices(
+            top_values[i], non_zero[i], labels, colors)
+
+        axes[i].pie(non_zero_values, labels=non_zero_labels, colors=non_zero_colors,
+                    autopct='%1.1f%%', startangle=90, textprops={'fontsize': 9})
+        axes[i].set_title(f'{country}\n(确诊: {top_values[i, 0]:,})',
+                          fontsize=12, fontweight='bold')
+    for ax in axes[len(top_countries):]:
+        ax.set_visible(False)
+
+    plt.suptitle(f'前{len(top_countries)}个国家新冠疫情数据分布饼图', fontsize=16, fontweight='bold', y=0.98)
+    plt.tight_layout()
+    outputs = save_figure(fig2, output, targets=targets, fmt=fmt)
+    plt.close(fig2)
+    return outputs
+
+
+# ==================== 任务3：直方图和条形图 ====================
+def build_task3(current_prov, output='task3_histogram_bar.png', targets=DEFAULT_TARGETS, fmt='png'):
+    # 准备数据
+    provinces = current_prov.iloc[:, 0] if current_prov.columns[0] != 'confirm' else current_prov.index
+    confirm_prov = current_prov['confirm'] if 'confirm' in current_prov.columns else current_prov.iloc[:, 1]
+    dead_prov = current_prov['dead'] if 'dead' in current_prov.columns else current_prov.iloc[:, 2]
+    heal_prov = current_prov['heal'] if 'heal' in current_prov.columns else current_prov.iloc[:, 3]
+
+    # 创建直方图和条形图的子图
+    fig3, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    # 确诊、死亡两列一次完成分箱，各列使用各自的等宽边界
+    hist_edges = equal_width_edges(np.column_stack((confirm_prov, dead_prov)), bins=15)
+    hist_counts = histogram(np.column_stack((confirm_prov, dead_prov)), hist_edges)
+
+    # 直方图 - 确诊人数分布
+    axes[0, 0].hist(hist_edges[:-1, 0], bins=hist_edges[:, 0], weights=hist_counts[:, 0],
+                    color='#FF6B6B', alpha=0.7, edgecolor='black', linewidth=1)
+    axes[0, 0].set_xlabel('确诊人数', fontsize=11)
+    axes[0, 0].set_ylabel('省份数量', fontsize=11)
+    axes[0, 0].set_title('各省确诊人数分布 - 直方图', fontsize=12, fontweight='bold')
+    axes[0, 0].grid(True, alpha=0.3, axis='y', linestyle='--')
+
+    # 直方图 - 死亡人数分布
+    axes[0, 1].hist(hist_edges[:-1, 1], bins=hist_edges[:, 1], weights=hist_counts[:, 1],
+                    color='#4ECDC4', alpha=0.7, edgecolor='black', linewidth=1)
+    axes[0, 1].set_xlabel('死亡人数', fontsize=11)
+    axes[0, 1].set_ylabel('省份数量', fontsize=11)
+    axes[0, 1].set_title('各省死亡人数分布 - 直方图', fontsize=12, fontweight='bold')
+    axes[0, 1].grid(True, alpha=0.3, axis='y', linestyle='--')
+
+    # 条形图 - 堆叠条形图（显示前15个省份）
+    top_n = min(15, len(provinces))
+    x_pos = np.arange(top_n)
+    width = 0.6
+
+    axes[1, 0].bar(x_pos, confirm_prov[:top_n], width, label='确诊(confirm)',
+                   color='#FF6B6B', alpha=0.8, edgecolor='black', linewidth=0.5)
+    axes[1, 0].bar(x_pos, dead_prov[:top_n], width, bottom=confirm_prov[:top_n],
+                   label='死亡(dead)', color='#4ECDC4', alpha=0.8, edgecolor='black', linewidth=0.5)
+    axes[1, 0].bar(x_pos, heal_prov[:top_n], width,
+                   bottom=confirm_prov[:top_n] + dead_prov[:top_n],
+                   label='治愈(heal)', color='#95E1D3', alpha=0.8, edgecolor='black', linewidth=0.5)
+    axes[1, 0].set_xlabel('省份', fontsize=11)
+    axes[1, 0].set_ylabel('人数', fontsize=11)
+    axes[1, 0].set_title(f'前{top_n}个省份新冠疫情数据 - 堆叠条形图', fontsize=12, fontweight='bold')
+    axes[1, 0].set_xticks(x_pos)
+    axes[1, 0].set_xticklabels(provinces[:top_n], rotation=45, ha='right', fontsize=8)
+    axes[1, 0].legend(loc='best', fontsize=9)
+    axes[1, 0].grid(True, alpha=0.3, axis='y', linestyle='--')
+
+    # 条形图 - 分组条形图（显示前15个省份）
+    x_pos = np.arange(top_n)
+    width = 0.25
+
+    axes[1, 1].bar(x_pos - width, confirm_prov[:top_n], width, label='确诊(confirm)',
+                   color='#FF6B6B', alpha=0.8, edgecolor='black', linewidth=0.5)
+    axes[1, 1].bar(x_pos, dead_prov[:top_n], width, label='死亡(dead)',
+                   color='#4ECDC4', alpha=0.8, edgecolor='black', linewidth=0.5)
+    axes[1, 1].bar(x_pos + width, heal_prov[:top_n], width, label='治愈(heal)',
+                   color='#95E1D3', alpha=0.8, edgecolor='black', linewidth=0.5)
+    axes[1, 1].set_xlabel('省份', fontsize=11)
+    axes[1, 1].set_ylabel('人数', fontsize=11)
+    axes[1, 1].set_title(f'前{top_n}个省份新冠疫情数据 - 分组条形图', fontsize=12, fontweight='bold')
+    axes[1, 1].set_xticks(x_pos)
+    axes[1, 1].set_xticklabels(provinces[:top_n], rotation=45, ha='right', fontsize=8)
+    axes[1, 1].legend(loc='best', fontsize=9)
+    axes[1, 1].grid(True, alpha=0.3, axis='y', linestyle='--')
+
+    plt.tight_layout()
+    outputs = save_figure(fig3, output, targets=targets, fmt=fmt)
+    plt.close(fig3)
+    return outputs
+
+
+# ==================== 并行调度 ====================
+# 在进程之间保留状态的构建函数，并行渲染时也留在主进程中执行，状态不会随工作进程丢失
+MAIN_PROCESS_BUILDERS = (build_task1,)
+
+
+def _runs_in_main_process(builder):
+    return getattr(builder, 'func', builder) in MAIN_PROCESS_BUILDERS
+
+
+def _render_local(name, builder, data, output):
+    with stages.stage(name, kind='render'):
+        return builder(data, output)
+
+
+def render_figures(tasks, jobs=1):
+    """
+    渲染一组图表任务，tasks 为 [(名称, 构建函数, 数据, 输出文件), ...]，构建函数可以是 functools.partial
+    jobs=1 时在当前进程顺序执行；jobs>1 时每个图表交给一个工作进程（Agg 后端），
+    MAIN_PROCESS_BUILDERS 中的任务在其他任务提交后于主进程中执行
+    每个任务记为一个 render 阶段（以名称命名），工作进程中的计时由主进程用 stages.add_record 记录
+    按任务顺序依次 yield 每个任务写出的文件列表
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, sum(1 for _, builder, _, _ in tasks if not _runs_in_main_process(builder)))
+
+    if jobs <= 1:
+        for task in tasks:
+            yield _render_local(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [None if _runs_in_main_process(builder) else pool.submit(stages.measure, builder, data, output)
+                   for _, builder, data, output in tasks]
+        local = [_render_local(*task) if future is None else None
+                 for task, future in zip(tasks, futures)]
+        for (name, *_), future, files in zip(tasks, futures, local):
+            if future is not None:
+                files, timing = future.result()
+                stages.add_record(name, 'render', timing)
+            yield files
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+data_history 流式读取与滚动汇总
+按块读取 CSV/Parquet 格式的历史数据，只保留按天汇总后的结果，
+内存占用取决于天数（和地区数），与原始行数无关。
+周、月汇总由日汇总推导得到。
+"""
+
+import os
+
+import pandas as pd  # pyright: ignore[reportMissingImports]
+
+VALUE_COLUMNS = ('confirm', 'dead', 'heal')
+
+# 汇总粒度由细到粗
+FREQS = ('D', 'W', 'M')
+_PERIOD_FREQ = {'D': 'D', 'W': 'W-SUN', 'M': 'M'}
+
+
+def iter_history_chunks(path, chunksize=500_000, columns=None):
+    """按块读取历史数据文件，根据扩展名选择 CSV 或 Parquet"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.parquet', '.pq'):
+        try:
+            import pyarrow.parquet as pq  # pyright: ignore[reportMissingImports]
+        except ImportError as e:
+            raise ImportError("读取 Parquet 文件需要安装 pyarrow") from e
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+
+
+class HistoryRollup:
+    """
+    历史数据的滚动汇总
+    how='sum'：各行是增量，按天求和；
+    how='last'：各行是累计值，取每天最后一条（有 group_col 时先按地区取最后一条再求和）；
+    how='max'：按天取最大值
+    """
+
+    def __init__(self, date_col='date', columns=VALUE_COLUMNS, how='last', group_col=None):
+        if how not in ('sum', 'last', 'max'):
+            raise ValueError(f"不支持的汇总方式: {how}")
+        self.date_col = date_col
+        self.columns = list(columns)
+        self.how = how
+        self.group_col = group_col
+        self.rows = 0
+        self._state = None
+
+    @property
+    def input_columns(self):
+        cols = [self.date_col] + self.columns
+        if self.group_col:
+            cols.append(self.group_col)
+        return cols
+
+    def _keys(self):
+        return ['day', self.group_col] if self.group_col else ['day']
+
+    def _reduce(self, frame):
+        keys = self._keys()
+        if self.how == 'sum':
+            return frame.groupby(keys, sort=False)[self.columns].sum()
+        if self.how == 'max':
+            return frame.groupby(keys, sort=False)[self.columns].max()
+        # last：按时间戳排序后取每个键的最后一条，时间戳保留下来用于跨块合并
+        frame = frame.sort_values('ts', kind='stable')
+        return frame.groupby(keys, sort=False)[self.columns + ['ts']].last()
+
+    def update(self, chunk):
+        """合并一个数据块"""
+        ts = pd.to_datetime(chunk[self.date_col])
+        frame = chunk[self.columns].copy()
+        frame['ts'] = ts
+        frame['day'] = ts.dt.normalize()
+        if self.group_col:
+            frame[self.group_col] = chunk[self.group_col]
+        reduced = self._reduce(frame)
+
+        if self._state is not None:
+            reduced = self._reduce(pd.concat([self._state, reduced]).reset_index())
+        self._state = reduced
+        self.rows += len(chunk)
+        return self
+
+    def consume(self, chunks):
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def daily(self):
+        """日汇总，索引为日期"""
+        if self._state is None:
+            return pd.DataFrame(columns=self.columns, index=pd.DatetimeIndex([], name='day'))
+        state = self._state[self.columns]
+        if self.group_col:
+            state = state.groupby(level='day').sum()
+        return state.sort_index()
+
+    def rollup(self, freq='D'):
+        """按 D/W/M 粒度返回汇总结果"""
+        daily = self.daily()
+        if freq == 'D':
+            return daily
+        periods = daily.index.to_period(_PERIOD_FREQ[freq])
+        grouped = daily.groupby(periods)
+        if self.how == 'sum':
+            result = grouped.sum()
+        elif self.how == 'max':
+            result = grouped.max()
+        else:
+            result = grouped.last()
+        # 以每个周期的起始日期作为索引
+        result.index = result.index.to_timestamp()
+        result.index.name = 'day'
+        return result
+
+
+def choose_freq(rollup, max_points):
+    """选择不超过 max_points 个点的最细粒度"""
+    for freq in FREQS:
+        if len(rollup.rollup(freq)) <= max_points:
+            return freq
+    return FREQS[-1]
+
+
+def max_points_for_axes(figsize=(16, 6), dpi=300, ncols=2, px_per_point=4):
+    """按图宽和 dpi 估算单个子图能分辨的点数"""
+    return max(1, int(figsize[0] * dpi / ncols / px_per_point))
+
+
+def load_history_rollup(path, chunksize=500_000, max_points=None, **rollup_kwargs):
+    """
+    流式读取历史数据并返回可直接交给 build_task1 的 DataFrame
+    （date 为字符串，其余为汇总后的 confirm/dead/heal）
+    """
+    rollup = HistoryRollup(**rollup_kwargs)
+    rollup.consume(iter_history_chunks(path, chunksize=chunksize, columns=rollup.input_columns))
+
+    freq = choose_freq(rollup, max_points or max_points_for_axes())
+    frame = rollup.rollup(freq)
+    result = pd.DataFrame({'date': frame.index.strftime('%Y-%m-%d')})
+    for col in rollup.columns:
+        result[col] = frame[col].to_numpy()
+    return result, freq, rollup.rows
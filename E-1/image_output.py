@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+图片输出
+同一张图只按所需的最高 dpi 渲染一次，再缩放成缩略图、屏幕、打印等多个尺寸，
+每个尺寸使用各自的压缩级别，PNG/WebP 编码在线程池中并行进行（Pillow 编码时会释放 GIL）。
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+from PIL import Image, features  # pyright: ignore[reportMissingImports]
+
+# 输出规格：dpi、PNG 压缩级别（0~9）、WebP 质量、文件名后缀
+TARGETS = {
+    'thumb': {'dpi': 50, 'compress_level': 1, 'quality': 70, 'suffix': '_thumb'},
+    'screen': {'dpi': 100, 'compress_level': 3, 'quality': 85, 'suffix': '_screen'},
+    'print': {'dpi': 300, 'compress_level': 6, 'quality': 95, 'suffix': ''},
+}
+DEFAULT_TARGETS = ('print',)
+FORMATS = ('png', 'webp')
+
+
+def render_dpi(targets):
+    """渲染时使用的 dpi：所有输出规格中最高的一个"""
+    return max(TARGETS[t]['dpi'] for t in targets)
+
+
+def target_path(output, target, fmt='png'):
+    base = os.path.splitext(output)[0]
+    return f"{base}{TARGETS[target]['suffix']}.{fmt}"
+
+
+def tight_crop(fig, dpi, pad_inches=0.1):
+    """与 bbox_inches='tight' 一致的像素裁剪区域，需在 canvas.draw() 之后调用"""
+    canvas = fig.canvas
+    bbox = fig.get_tightbbox(canvas.get_renderer()).padded(pad_inches)
+    width, height = canvas.get_width_height()
+    x0 = max(0, int(np.floor(bbox.x0 * dpi)))
+    x1 = min(width, int(np.ceil(bbox.x1 * dpi)))
+    y0 = max(0, height - int(np.ceil(bbox.y1 * dpi)))
+    y1 = min(height, height - int(np.floor(bbox.y0 * dpi)))
+    return slice(y0, y1), slice(x0, x1)
+
+
+def render_rgba(fig, dpi):
+    """按指定 dpi 渲染整张图并按 tight 边界裁剪，返回 RGBA 数组"""
+    fig.set_dpi(dpi)
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba())[tight_crop(fig, dpi)]
+
+
+def _encode(image, path, spec, fmt):
+    if fmt == 'webp':
+        image.save(path, format='webp', quality=spec['quality'], method=4)
+    else:
+        image.save(path, format='png', compress_level=spec['compress_level'],
+                   dpi=(spec['dpi'], spec['dpi']))
+    return path
+
+
+def write_image(rgba, output, source_dpi, targets=DEFAULT_TARGETS, fmt='png', max_workers=None):
+    """
+    把一次渲染的结果写成多个尺寸，返回写出的文件列表（顺序与 targets 一致）
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"不支持的图片格式: {fmt}")
+    if fmt == 'webp' and not features.check('webp'):
+        raise RuntimeError("当前 Pillow 不支持 WebP 编码")
+
+    source = Image.fromarray(np.ascontiguousarray(rgba))
+    jobs = []
+    for target in targets:
+        spec = TARGETS[target]
+        scale = spec['dpi'] / source_dpi
+        if scale >= 1:
+            image = source
+        elif float(1 / scale).is_integer():
+            image = source.reduce(int(1 / scale))
+        else:
+            size = (max(1, round(source.width * scale)), max(1, round(source.height * scale)))
+            image = source.resize(size, Image.Resampling.LANCZOS)
+        jobs.append((image, target_path(output, target, fmt), spec))
+
+    if len(jobs) == 1:
+        return [_encode(*jobs[0], fmt)]
+    with ThreadPoolExecutor(max_workers=max_workers or len(jobs)) as pool:
+        return list(pool.map(lambda job: _encode(*job, fmt), jobs))
+
+
+def save_figure(fig, output, targets=DEFAULT_TARGETS, fmt='png'):
+    """渲染一次 matplotlib 图表并写出所有尺寸"""
+    dpi = render_dpi(targets)
+    return write_image(render_rgba(fig, dpi), output, dpi, targets=targets, fmt=fmt)
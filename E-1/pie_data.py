@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+饼图数据构建
+在“国家 × 指标”的 NumPy 矩阵上一次性选出前 k 个国家并过滤 0 值，
+k 可以是 4，也可以是 50 或全部国家。
+"""
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+
+def top_k_indices(key, k):
+    """
+    按 key 从大到小选出前 k 行的下标，结果与 DataFrame.nlargest(k) 一致（并列时保留靠前的行）
+    """
+    key = np.asarray(key)
+    n = len(key)
+    if k >= n:
+        candidates = np.arange(n)
+    else:
+        part = np.argpartition(-key, k - 1)[:k]
+        threshold = key[part].min()
+        greater = np.flatnonzero(key > threshold)
+        equal = np.flatnonzero(key == threshold)[:k - len(greater)]
+        candidates = np.concatenate((greater, equal))
+    # 先按值降序，值相同时按原顺序
+    order = np.lexsort((candidates, -key[candidates]))
+    return candidates[order]
+
+
+def top_k_pies(names, matrix, k, key_col=0):
+    """
+    选出前 k 个国家的饼图数据
+    返回 (国家名, k×m 数值矩阵, k×m 非零掩码)
+    """
+    names = np.asarray(names)
+    matrix = np.asarray(matrix)
+    idx = top_k_indices(matrix[:, key_col], k)
+    values = matrix[idx]
+    return names[idx], values, values > 0
+
+
+def pie_slices(values, mask, labels, colors):
+    """按掩码取出单个饼图的数值、标签和颜色"""
+    labels = np.asarray(labels)
+    colors = np.asarray(colors)
+    return values[mask], labels[mask].tolist(), colors[mask].tolist()
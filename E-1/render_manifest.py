@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+图表渲染清单的输入指纹
+每个输出图片的指纹由数据内容 + 构建函数及参数算出，记录在 common.render_manifest.RenderManifest 中，
+输入没有变化且图片仍存在时跳过渲染和 PNG 编码。
+"""
+
+import functools
+import hashlib
+
+import pandas as pd  # pyright: ignore[reportMissingImports]
+
+
+def frame_fingerprint(df):
+    """DataFrame 内容指纹（包括列名和索引）"""
+    h = hashlib.sha1()
+    h.update(repr(list(df.columns)).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def builder_key(builder):
+    """构建函数的标识，functools.partial 时包含绑定的参数"""
+    if isinstance(builder, functools.partial):
+        return f"{builder_key(builder.func)}{builder.args!r}{sorted(builder.keywords.items())!r}"
+    return f"{builder.__module__}.{builder.__qualname__}"
+
+
+def task_fingerprint(builder, data):
+    return hashlib.sha1(f"{builder_key(builder)}|{frame_fingerprint(data)}".encode('utf-8')).hexdigest()
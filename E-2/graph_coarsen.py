@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+关系图的多级粗化（细节层次）
+把同一分类或同一社区的节点合并为超级节点，value 求和、symbolSize 按面积合并，
+连接按超级节点两端聚合权重，坐标取成员的质心。每一级都从上一级继续粗化，
+直到节点数不超过该级的预算，这样缩小显示时仍然覆盖整个网络，而不是只保留 value 最大的节点。
+
+分组方式依次尝试：
+    category   按分类合并（节点较多的分类优先）
+    community  标签传播得到的社区
+    grid       按布局坐标划分网格，保证最终能降到预算以内
+"""
+
+import math
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+from graph_store import GraphStore
+
+MIN_SYMBOL_SIZE = 5
+MAX_SYMBOL_SIZE = 50
+
+
+def _first_per_group(inverse, key):
+    """每组中 key 最小的成员下标（组编号为 0..g-1）"""
+    order = np.lexsort((key, inverse))
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(inverse[order])) + 1))
+    return order[starts]
+
+
+def _unique_names(names):
+    seen = set()
+    result = []
+    for name in names:
+        candidate, i = name, 1
+        while candidate in seen:
+            i += 1
+            candidate = f"{name}#{i}"
+        seen.add(candidate)
+        result.append(candidate)
+    return result
+
+
+class Level:
+    """
+    一个细节层次
+    store       该层的关系图
+    positions   节点坐标
+    members     每个节点包含的原始节点数
+    base_names  每个节点的代表名称（成员中 value 最大的原始节点）
+    """
+
+    def __init__(self, store, positions, members=None, base_names=None):
+        self.store = store
+        self.positions = positions
+        self.members = np.ones(store.node_count, dtype=np.int64) if members is None else members
+        self.base_names = [store.names[n] for n in store.node_name.tolist()] if base_names is None else base_names
+
+    @property
+    def node_count(self):
+        return self.store.node_count
+
+
+def coarsen(level, labels):
+    """
+    按 labels 合并节点，labels 相同的节点成为一个超级节点，返回新的 Level
+    只有一个成员的组保持原来的名称和属性
+    """
+    store = level.store
+    groups, inverse = np.unique(labels, return_inverse=True)
+    g = len(groups)
+    count = np.bincount(inverse, minlength=g)
+    members = np.bincount(inverse, weights=level.members, minlength=g).astype(np.int64)
+    value = np.bincount(inverse, weights=store.node_value, minlength=g)
+    area = np.bincount(inverse, weights=store.node_size.astype(float) ** 2, minlength=g)
+    size = np.clip(np.round(np.sqrt(area)), MIN_SYMBOL_SIZE, MAX_SYMBOL_SIZE)
+
+    # 代表节点：value 最大的成员（并列时取靠前的）
+    rep = _first_per_group(inverse, -store.node_value)
+    # 分类：成员中最多的分类
+    ncat = len(store.categories) + 1
+    key, votes = np.unique(inverse * ncat + (store.node_category + 1), return_counts=True)
+    best = _first_per_group(key // ncat, -votes)
+    category = (key % ncat - 1)[best]
+
+    base_names = [level.base_names[r] for r in rep.tolist()]
+    names = [
+        store.names[store.node_name[r]] if c == 1 else f"{base}等{m}个节点"
+        for r, c, m, base in zip(rep.tolist(), count.tolist(), members.tolist(), base_names)
+    ]
+
+    # 连接：两端映射到超级节点，去掉组内连接，相同方向的连接合并权重
+    src, dst = store.link_node_index()
+    mask = (src >= 0) & (dst >= 0)
+    gs, gd = inverse[src[mask]], inverse[dst[mask]]
+    weight = store.link_value[mask]
+    cross = gs != gd
+    pair, pair_index = np.unique(gs[cross] * g + gd[cross], return_inverse=True)
+    link_value = np.bincount(pair_index, weights=weight[cross], minlength=len(pair))
+
+    # 坐标：按原始节点数加权的质心
+    positions = np.empty((g, 2))
+    for axis in range(2):
+        positions[:, axis] = np.bincount(inverse, weights=level.positions[:, axis] * level.members,
+                                         minlength=g) / members
+
+    coarse = GraphStore(
+        names=_unique_names(names),
+        categories=store.categories,
+        node_name=np.arange(g),
+        node_size=size,
+        node_value=value,
+        node_category=category,
+        link_source=pair // g,
+        link_target=pair % g,
+        link_value=link_value,
+    )
+    return Level(coarse, positions, members, base_names)
+
+
+# ==================== 分组方式 ====================
+def category_groups(store, positions, budget):
+    """按分类分组，没有分类的节点不参与合并（-1）"""
+    return store.node_category.astype(np.int64)
+
+
+def community_groups(store, positions, budget, iterations=10):
+    """同步标签传播：每个节点取邻居（含自身）中出现次数最多的标签，并列时取较小的标签"""
+    n = store.node_count
+    src, dst = store.link_node_index()
+    mask = (src >= 0) & (dst >= 0) & (src != dst)
+    nodes = np.arange(n)
+    a = np.concatenate((src[mask], dst[mask], nodes))
+    b = np.concatenate((dst[mask], src[mask], nodes))
+    labels = nodes.copy()
+    for _ in range(iterations):
+        key, votes = np.unique(a * n + labels[b], return_counts=True)
+        node, label = key // n, key % n
+        best = _first_per_group(node, label - votes * n)
+        updated = labels.copy()
+        updated[node[best]] = label[best]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    return labels
+
+
+def grid_groups(store, positions, budget):
+    """按坐标划分为不超过 budget 个网格"""
+    side = max(1, math.isqrt(budget))
+    lo = positions.min(axis=0)
+    span = np.maximum(positions.max(axis=0) - lo, 1e-9)
+    cell = np.minimum(((positions - lo) / span * side).astype(np.int64), side - 1)
+    return cell[:, 0] * side + cell[:, 1]
+
+
+GROUPINGS = (category_groups, community_groups, grid_groups)
+
+
+def limit_groups(labels, budget):
+    """
+    从成员最多的组开始合并，合并到节点数不超过 budget 为止，其余节点保持独立
+    labels 为 -1 的节点不参与合并；返回新的标签（独立节点各自一个标签）
+    """
+    n = len(labels)
+    labels = np.asarray(labels, dtype=np.int64)
+    singles = np.arange(n, dtype=np.int64)
+    grouped = labels >= 0
+    if n <= budget or not grouped.any():
+        return singles
+
+    groups, inverse, sizes = np.unique(labels[grouped], return_inverse=True, return_counts=True)
+    order = np.argsort(-sizes, kind='stable')
+    reduced = np.cumsum(sizes[order] - 1)
+    take = min(int(np.searchsorted(reduced, n - budget)) + 1, len(groups))
+    merged = np.zeros(len(groups), dtype=bool)
+    merged[order[:take]] = True
+
+    result = singles.copy()
+    member = np.flatnonzero(grouped)
+    collapse = merged[inverse]
+    # 合并的组用 n + 组编号作为标签，和独立节点的标签不冲突
+    result[member[collapse]] = n + inverse[collapse]
+    return result
+
+
+def coarsen_to_budget(level, budget):
+    """依次按分类、社区、网格合并，直到节点数不超过 budget"""
+    for grouping in GROUPINGS:
+        if level.node_count <= budget:
+            break
+        labels = limit_groups(grouping(level.store, level.positions, budget), budget)
+        if len(np.unique(labels)) < level.node_count:
+            level = coarsen(level, labels)
+    return level
+
+
+def build_levels(store, positions, budgets):
+    """
+    生成多个细节层次，返回 Level 列表
+    第一级是完整的关系图，之后每一级从上一级粗化到对应的预算以内（预算从大到小）
+    """
+    levels = [Level(store, positions)]
+    for budget in sorted(budgets, reverse=True):
+        if levels[-1].node_count <= budget:
+            continue
+        levels.append(coarsen_to_budget(levels[-1], budget))
+    return levels
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+关系图的离线力导向布局
+在 NumPy 中运行 Fruchterman–Reingold 迭代，斥力分三层计算，每个点对恰好属于其中一层：
+    近场  细网格（边长 2 * 理想边长）中同一格和相邻格的点对逐对精确计算
+    中场  粗网格（每格由 ratio x ratio 个细网格组成）同一格和相邻格中、细网格不相邻的点对，按细网格质心计算
+    远场  粗网格不相邻的格之间按粗网格质心计算
+近场的点对数只与局部密度有关，粗网格每个方向最多 grid 格，远场的计算量不随布局范围增长。
+弹簧引力按连接向量化计算，再加上指向中心的重力让各连通分量不会散开。
+坐标算好后以 layout="none" 写入 Graph，浏览器打开页面时不需要再跑力导向模拟。
+"""
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+
+def link_endpoints(store):
+    """把连接两端的名称 id 转换为节点下标，去掉端点不是节点的连接和自环"""
+    src, dst = store.link_node_index()
+    mask = (src >= 0) & (dst >= 0) & (src != dst)
+    return src[mask], dst[mask]
+
+
+# 半平面的相邻网格偏移，每个无序点对只枚举一次
+_HALF_OFFSETS = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _grid_cells(pos, size):
+    """每个节点所在网格的整数坐标，形状为 (n, 2)，从 0 开始"""
+    c = np.floor(pos / size).astype(np.int64)
+    return c - c.min(axis=0)
+
+
+def _neighbor_pairs(cells):
+    """
+    近场点对 (i, j)：两点位于同一网格或相邻网格
+    每个无序点对只出现一次
+    """
+    n = len(cells)
+    width = int(cells[:, 1].max()) + 3
+    key = (cells[:, 0] + 1) * width + (cells[:, 1] + 1)
+    order = np.argsort(key, kind='stable')
+    sorted_key = key[order]
+
+    ii, jj = [], []
+    for dx, dy in _HALF_OFFSETS:
+        target = key + dx * width + dy
+        lo = np.searchsorted(sorted_key, target, side='left')
+        hi = np.searchsorted(sorted_key, target, side='right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        starts = np.cumsum(counts) - counts
+        offsets = np.arange(total) - np.repeat(starts, counts)
+        i = np.repeat(np.arange(n), counts)
+        j = order[np.repeat(lo, counts) + offsets]
+        if dx == 0 and dy == 0:
+            keep = i < j
+            i, j = i[keep], j[keep]
+        ii.append(i)
+        jj.append(j)
+
+    if not ii:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(ii), np.concatenate(jj)
+
+
+def _unique_cells(cells):
+    """网格坐标 -> (每项所在的非空网格编号, 非空网格的坐标)"""
+    width = int(cells[:, 1].max()) + 1
+    occupied, cell_of = np.unique(cells[:, 0] * width + cells[:, 1], return_inverse=True)
+    return cell_of, np.column_stack((occupied // width, occupied % width))
+
+
+def _far_cells(fine, ratio):
+    """
+    中场和远场的划分（fine 为每个节点所在细网格的坐标，粗网格由 ratio x ratio 个细网格组成）
+    返回 (节点 -> 细网格, 细网格节点数, 中场的细网格对 (a, b), 细网格 -> 粗网格, 粗网格节点数, 不相邻粗网格对的掩码)
+    """
+    fine_of, fine_xy = _unique_cells(fine)
+    fine_mass = np.bincount(fine_of, minlength=len(fine_xy)).astype(float)
+
+    coarse_of, coarse_xy = _unique_cells(fine_xy // ratio)
+    coarse_mass = np.bincount(coarse_of, weights=fine_mass, minlength=len(coarse_xy))
+    far = np.abs(coarse_xy[:, None, :] - coarse_xy[None, :, :]).max(axis=2) > 1
+
+    # 粗网格相邻（含同一格）、细网格不相邻的细网格对；细网格相邻的点对已在近场中计算
+    a, b = _neighbor_pairs(fine_xy // ratio)
+    keep = np.abs(fine_xy[a] - fine_xy[b]).max(axis=1) > 1
+    return fine_of, fine_mass, a[keep], b[keep], coarse_of, coarse_mass, far
+
+
+def _far_field(pos, fine_of, fine_mass, mid_a, mid_b, coarse_of, coarse_mass, far, k2):
+    """
+    中场和远场斥力（Barnes–Hut 式近似），同一细网格内的节点共享所在网格受到的力
+    """
+    m = len(fine_mass)
+    fx = np.bincount(fine_of, weights=pos[:, 0], minlength=m) / fine_mass
+    fy = np.bincount(fine_of, weights=pos[:, 1], minlength=m) / fine_mass
+
+    # 中场：细网格质心之间，a 受 b 的全部质量作用，b 受 a 的
+    dx = fx[mid_a] - fx[mid_b]
+    dy = fy[mid_a] - fy[mid_b]
+    w = k2 / np.maximum(dx * dx + dy * dy, 1e-9)
+    force = np.empty((m, 2))
+    for axis, d in enumerate((dx * w, dy * w)):
+        force[:, axis] = (np.bincount(mid_a, weights=d * fine_mass[mid_b], minlength=m)
+                          - np.bincount(mid_b, weights=d * fine_mass[mid_a], minlength=m))
+
+    # 远场：不相邻的粗网格质心之间
+    mc = len(coarse_mass)
+    cx = np.bincount(coarse_of, weights=fx * fine_mass, minlength=mc) / coarse_mass
+    cy = np.bincount(coarse_of, weights=fy * fine_mass, minlength=mc) / coarse_mass
+    dx = cx[:, None] - cx[None, :]
+    dy = cy[:, None] - cy[None, :]
+    weight = np.where(far, k2 * coarse_mass[None, :] / np.maximum(dx * dx + dy * dy, 1e-9), 0.0)
+    # sum_j w_ij * (c_i - c_j) = c_i * sum_j w_ij - (W @ c)_i
+    total = weight.sum(axis=1)
+    force += np.column_stack((cx * total - weight @ cx, cy * total - weight @ cy))[coarse_of]
+    return force[fine_of]
+
+
+def _pair_forces(x, y, i, j, scale, n):
+    """
+    点对 (i, j) 上沿 i - j 方向的力：大小为 |d| * scale(d^2)，加到 i 上、从 j 上减去
+    x、y 分开存放，比按 (n, 2) 数组取行快
+    """
+    dx = x[i] - x[j]
+    dy = y[i] - y[j]
+    w = scale(dx * dx + dy * dy)
+    dx *= w
+    dy *= w
+    out = np.empty((n, 2))
+    out[:, 0] = np.bincount(i, weights=dx, minlength=n) - np.bincount(j, weights=dx, minlength=n)
+    out[:, 1] = np.bincount(i, weights=dy, minlength=n) - np.bincount(j, weights=dy, minlength=n)
+    return out
+
+
+def force_layout(store, iterations=200, ideal_length=30.0, gravity=1.0, grid=32, seed=0):
+    """
+    计算每个节点的 (x, y) 坐标，返回 (node_count, 2) 的数组
+    ideal_length 为理想边长（也就是坐标单位）。近场细网格的边长固定为 2 * ideal_length；
+    粗网格边长取细网格的整数倍，使每个方向大约 grid 格（远场的计算量与非空粗网格数的平方成正比，最多 grid^4）
+    """
+    n = store.node_count
+    if n == 0:
+        return np.zeros((0, 2))
+
+    k = float(ideal_length)
+    cutoff = 2 * k
+    src, dst = link_endpoints(store)
+    rng = np.random.default_rng(seed)
+    side = k * np.sqrt(n)
+    pos = rng.uniform(-side / 2, side / 2, size=(n, 2))
+
+    # 温度（单步最大位移）按几何级数从 side / 10 降到 k / 100
+    temperature = side / 10
+    cooling = (0.01 * k / temperature) ** (1.0 / max(iterations, 1))
+    eps = 1e-9
+    # 网格划分（近场点对、中场和远场的网格）在建立后沿用，直到某个节点离开建立时的位置超过 skin / 2；
+    # 划分固定时每个点对仍然恰好属于近场、中场、远场之一，重建只影响近似的精度
+    skin = 0.5 * k
+    built_at = None
+    for _ in range(iterations):
+        if built_at is None or np.abs(pos - built_at).max() * np.sqrt(2) > skin / 2:
+            extent = float((pos.max(axis=0) - pos.min(axis=0)).max())
+            fine = _grid_cells(pos, cutoff)
+            pair_i, pair_j = _neighbor_pairs(fine)
+            far_cells = _far_cells(fine, max(1, int(np.ceil(extent / grid / cutoff))))
+            built_at = pos.copy()
+
+        x = np.ascontiguousarray(pos[:, 0])
+        y = np.ascontiguousarray(pos[:, 1])
+        # 斥力 k^2 / d：近场逐对计算，中场、远场按网格质心
+        disp = _pair_forces(x, y, pair_i, pair_j, lambda d2: k * k / np.maximum(d2, eps), n)
+        disp += _far_field(pos, *far_cells, k * k)
+
+        # 引力 d^2 / k
+        if len(src):
+            disp -= _pair_forces(x, y, src, dst, lambda d2: np.sqrt(d2) / k, n)
+
+        disp -= gravity * pos
+
+        # 位移不超过当前温度
+        length = np.maximum(np.hypot(disp[:, 0], disp[:, 1]), eps)
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature *= cooling
+
+    return pos - pos.mean(axis=0)
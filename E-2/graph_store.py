@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+紧凑的关系图存储
+名称驻留为整数 id，节点属性保存在 NumPy 数组中，连接保存为 int32 的 COO 数组（按需生成 CSR），
+筛选、度数统计、前 k 个节点裁剪和连接过滤都是向量化操作，最后才导出成 pyecharts 需要的字典列表。
+"""
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+
+class GraphStore:
+    """
+    names        名称池，id -> 名称（节点名和连接两端的名称共用）
+    node_name    每个节点的名称 id（int32）
+    node_size    symbolSize（int16）
+    node_value   value（float64）
+    node_category 分类编号（int32，-1 表示没有分类），categories 为编号 -> 分类名
+    link_source / link_target  连接两端的名称 id（int32），link_value 为连接权重
+    """
+
+    def __init__(self, names, categories, node_name, node_size, node_value, node_category,
+                 link_source, link_target, link_value):
+        self.names = names
+        self.categories = categories
+        self.node_name = np.asarray(node_name, dtype=np.int32)
+        self.node_size = np.asarray(node_size, dtype=np.int16)
+        self.node_value = np.asarray(node_value, dtype=np.float64)
+        self.node_category = np.asarray(node_category, dtype=np.int32)
+        self.link_source = np.asarray(link_source, dtype=np.int32)
+        self.link_target = np.asarray(link_target, dtype=np.int32)
+        self.link_value = np.asarray(link_value, dtype=np.float64)
+        self._name_ids = None
+        self._csr = None
+
+    @classmethod
+    def from_tables(cls, tables):
+        """由 weibo_stream.WeiboTables 构建，array 直接转换为 NumPy 数组"""
+        return cls(
+            names=tables.pool.strings,
+            categories=tables.categories.strings,
+            node_name=np.frombuffer(tables.node_name, dtype=np.int32) if tables.node_count else [],
+            node_size=tables.node_size,
+            node_value=np.frombuffer(tables.node_value, dtype=np.float64) if tables.node_count else [],
+            node_category=tables.node_category,
+            link_source=np.frombuffer(tables.link_source, dtype=np.int32) if tables.link_count else [],
+            link_target=np.frombuffer(tables.link_target, dtype=np.int32) if tables.link_count else [],
+            link_value=tables.link_value,
+        )
+
+    @property
+    def node_count(self):
+        return len(self.node_name)
+
+    @property
+    def link_count(self):
+        return len(self.link_source)
+
+    @property
+    def nbytes(self):
+        arrays = (self.node_name, self.node_size, self.node_value, self.node_category,
+                  self.link_source, self.link_target, self.link_value)
+        return sum(a.nbytes for a in arrays)
+
+    def name_id(self, name):
+        if self._name_ids is None:
+            self._name_ids = {s: i for i, s in enumerate(self.names)}
+        return self._name_ids.get(name)
+
+    # ==================== 连接 ====================
+    def add_links(self, source, target, value=1.0):
+        """追加连接（两端均为名称 id）"""
+        source = np.asarray(source, dtype=np.int32)
+        target = np.asarray(target, dtype=np.int32)
+        value = np.broadcast_to(np.asarray(value, dtype=np.float64), source.shape)
+        self.link_source = np.concatenate((self.link_source, source))
+        self.link_target = np.concatenate((self.link_target, target))
+        self.link_value = np.concatenate((self.link_value, value))
+        self._csr = None
+
+    def csr(self):
+        """按起点组织的 CSR：indptr 长度为名称数+1，indices 为终点 id，order 为对应的连接下标"""
+        if self._csr is None:
+            order = np.argsort(self.link_source, kind='stable').astype(np.int32)
+            counts = np.bincount(self.link_source, minlength=len(self.names))
+            indptr = np.zeros(len(self.names) + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            self._csr = (indptr, self.link_target[order], order)
+        return self._csr
+
+    def neighbors(self, name_id):
+        indptr, indices, _ = self.csr()
+        return indices[indptr[name_id]:indptr[name_id + 1]]
+
+    def link_node_index(self):
+        """连接两端对应的节点下标，端点不是节点时为 -1"""
+        node_of = np.full(len(self.names), -1, dtype=np.int64)
+        node_of[self.node_name] = np.arange(self.node_count)
+        return node_of[self.link_source], node_of[self.link_target]
+
+    # ==================== 统计 ====================
+    def name_degree(self):
+        """每个名称 id 的度数（出度+入度）"""
+        n = len(self.names)
+        return (np.bincount(self.link_source, minlength=n)
+                + np.bincount(self.link_target, minlength=n))
+
+    def node_degree(self):
+        """每个节点的度数"""
+        return self.name_degree()[self.node_name]
+
+    # ==================== 筛选 ====================
+    def subgraph(self, node_index):
+        """保留指定下标的节点，并只保留两端都在保留节点中的连接"""
+        node_index = np.asarray(node_index)
+        keep = np.zeros(len(self.names), dtype=bool)
+        keep[self.node_name[node_index]] = True
+        link_mask = keep[self.link_source] & keep[self.link_target]
+        return GraphStore(
+            names=self.names,
+            categories=self.categories,
+            node_name=self.node_name[node_index],
+            node_size=self.node_size[node_index],
+            node_value=self.node_value[node_index],
+            node_category=self.node_category[node_index],
+            link_source=self.link_source[link_mask],
+            link_target=self.link_target[link_mask],
+            link_value=self.link_value[link_mask],
+        )
+
+    def top_k_index(self, k, by='value'):
+        """按 value（或 degree）降序的前 k 个节点下标，并列时保持原顺序"""
+        key = self.node_value if by == 'value' else self.node_degree()
+        return np.argsort(-key, kind='stable')[:k]
+
+    def top_k(self, k, by='value'):
+        return self.subgraph(self.top_k_index(k, by=by))
+
+    # ==================== 导出 ====================
+    def to_pyecharts(self, positions=None):
+        """导出为 pyecharts Graph 使用的 (nodes, links)，给出 positions 时节点带固定的 x/y 坐标"""
+        names = self.names
+        cats = self.categories
+        nodes = [
+            {
+                "name": names[n],
+                "symbolSize": s,
+                "value": _plain_number(v),
+                "category": cats[c] if c >= 0 else "",
+            }
+            for n, s, v, c in zip(self.node_name.tolist(), self.node_size.tolist(),
+                                  self.node_value.tolist(), self.node_category.tolist())
+        ]
+        if positions is not None:
+            for node, (x, y) in zip(nodes, np.round(positions, 1).tolist()):
+                node["x"] = x
+                node["y"] = y
+        links = [
+            {"source": names[s], "target": names[t], "value": _plain_number(v)}
+            for s, t, v in zip(self.link_source.tolist(), self.link_target.tolist(), self.link_value.tolist())
+        ]
+        return nodes, links
+
+
+def _plain_number(v):
+    return int(v) if float(v).is_integer() else v
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+热搜词条的单次遍历提取
+不构建 BeautifulSoup 文档树，而是用预编译的正则把网页切分为标签和文本，顺序扫描一遍：
+所有 CSS 选择器预先编译为 (标签, class 集合, 属性子串) 规则，每个开始标签同时对全部规则求值，
+匹配的元素在结束标签处得到文本；<script> 中的内容用一个合并后的正则扫描一次。
+最后按原来的优先级（选择器顺序 -> 脚本规则顺序）合并，返回前 limit 个不重复的词条。
+
+支持的选择器语法：标签名、.class、[attr*="value"] 的组合，以及用空格表示的后代关系。
+元素嵌套、未闭合标签、空元素和 get_text(strip=True) 的处理方式与 BeautifulSoup（html.parser）一致。
+"""
+
+import html as html_lib
+import re
+
+# 选择器按优先级排列，每个选择器最多取前 30 个元素
+SELECTORS = (
+    '.c-single-text-ellipsis',
+    '.title-text',
+    '.content_1YWBm',
+    'a[class*="title"]',
+    '.item-title',
+    '[class*="title"]',
+    'div[class*="content"] a',
+    '.hot-item-title',
+)
+SELECTOR_LIMIT = 30
+# 脚本中的 JSON 字段，按优先级排列
+SCRIPT_KEYS = ('title', 'keyword', 'word')
+
+VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr',
+))
+# 这些元素的内容是原始文本，不计入 get_text
+RAW_TEXT_TAGS = frozenset(('script', 'style'))
+
+_COMPOUND = re.compile(r'([a-zA-Z][\w-]*)?((?:\.[\w-]+|\[[\w-]+\*="[^"]*"\])*)$')
+_PART = re.compile(r'\.([\w-]+)|\[([\w-]+)\*="([^"]*)"\]')
+
+# 注释、声明、处理指令、开始/结束标签
+_TOKEN = re.compile(
+    r'<!--.*?(?:-->|\Z)'
+    r'|<![^>]*>?'
+    r'|<\?[^>]*>?'
+    r'|<(/?)([a-zA-Z][^\s/>]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.S,
+)
+_ATTR = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+_SCRIPT_PATTERN = re.compile(r'"(%s)":"([^"]+)"' % '|'.join(SCRIPT_KEYS))
+
+
+def _compile_compound(text):
+    """把复合选择器编译为 (标签或 None, 必须包含的 class 集合, ((属性, 子串), ...))"""
+    match = _COMPOUND.match(text)
+    if not match:
+        raise ValueError(f"不支持的选择器: {text}")
+    tag = match.group(1).lower() if match.group(1) else None
+    classes, contains = [], []
+    for cls, attr, value in _PART.findall(match.group(2)):
+        if cls:
+            classes.append(cls)
+        else:
+            contains.append((attr.lower(), value))
+    return tag, frozenset(classes), tuple(contains)
+
+
+def _compound_matches(compound, element):
+    tag, classes, contains = compound
+    if tag is not None and element[0] != tag:
+        return False
+    if classes and not classes <= element[1]:
+        return False
+    for attr, value in contains:
+        if value not in (element[2].get(attr) or ''):
+            return False
+    return True
+
+
+def compile_selector(selector):
+    """编译选择器，返回 (目标元素的复合选择器, 祖先复合选择器元组（从外到内）)"""
+    parts = [_compile_compound(part) for part in selector.split()]
+    return parts[-1], tuple(parts[:-1])
+
+
+def _ancestors_match(chain, stack):
+    """后代关系：从内到外依次在祖先栈中匹配，栈中元素的第二项为祖先 element"""
+    i = len(stack)
+    for compound in reversed(chain):
+        i -= 1
+        while i >= 0 and not _compound_matches(compound, stack[i][1]):
+            i -= 1
+        if i < 0:
+            return False
+    return True
+
+
+def _parse_attrs(text):
+    attrs = {}
+    for name, v1, v2, v3 in _ATTR.findall(text):
+        name = name.lower()
+        if name not in attrs:
+            value = v1 or v2 or v3
+            attrs[name] = html_lib.unescape(value) if '&' in value else value
+    return attrs
+
+
+def scan(html, rules):
+    """
+    扫描一遍网页，返回 (buckets, scripts)
+    buckets[i] 为第 i 个选择器匹配到的元素文本（文档顺序，最多 SELECTOR_LIMIT 个），
+    scripts 为每个 <script> 中按字段分组的匹配结果
+    """
+    buckets = [[] for _ in rules]
+    scripts = []
+    stack = []          # [(标签, element, 该元素占用的 (桶, 下标, 文本片段) 列表)]
+    collecting = []     # 正在收集文本的槽位
+    active = list(enumerate(rules))   # 尚未取满的选择器
+
+    def finish(slots):
+        for slot in slots:
+            buckets[slot[0]][slot[1]] = ''.join(slot[2])
+            collecting.remove(slot)
+
+    def add_text(text):
+        # 与 get_text(strip=True) 相同：每段文本去掉首尾空白后直接连接
+        if '&' in text:
+            text = html_lib.unescape(text)
+        piece = text.strip()
+        if piece:
+            for slot in collecting:
+                slot[2].append(piece)
+
+    pos = 0
+    end = len(html)
+    while pos < end:
+        match = _TOKEN.search(html, pos)
+        if match is None:
+            if collecting:
+                add_text(html[pos:])
+            break
+        if collecting and match.start() > pos:
+            add_text(html[pos:match.start()])
+        pos = match.end()
+        tag = match.group(2)
+        if tag is None:
+            continue
+        tag = tag.lower()
+
+        if match.group(1):
+            # 结束标签：弹出到最近的同名元素，没有同名元素时忽略
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == tag:
+                    while len(stack) > depth:
+                        finish(stack.pop()[2])
+                    break
+            continue
+
+        attr_text = match.group(3)
+        attrs = _parse_attrs(attr_text) if attr_text.strip() else {}
+        classes = frozenset((attrs.get('class') or '').split())
+        element = (tag, classes, attrs)
+        slots = []
+        full = False
+        for index, ((rule_tag, rule_classes, rule_contains), chain) in active:
+            # 先做最便宜的标签和 class 判断
+            if rule_tag is not None and rule_tag != tag:
+                continue
+            if rule_classes and not rule_classes <= classes:
+                continue
+            if rule_contains and not all(value in (attrs.get(attr) or '') for attr, value in rule_contains):
+                continue
+            if chain and not _ancestors_match(chain, stack):
+                continue
+            bucket = buckets[index]
+            bucket.append(None)
+            full = full or len(bucket) == SELECTOR_LIMIT
+            slot = (index, len(bucket) - 1, [])
+            slots.append(slot)
+            collecting.append(slot)
+        if full:
+            active = [(index, rule) for index, rule in active if len(buckets[index]) < SELECTOR_LIMIT]
+
+        if tag in RAW_TEXT_TAGS:
+            # 原始文本一直到对应的结束标签
+            close = re.compile(r'</%s\s*>' % tag, re.I).search(html, pos)
+            content = html[pos:close.start()] if close else html[pos:]
+            pos = close.end() if close else end
+            # 选择器直接匹配到 script/style 元素时，文本为其原始内容
+            for slot in slots:
+                if content.strip():
+                    slot[2].append(content.strip())
+            if tag == 'script' and content:
+                found = {key: [] for key in SCRIPT_KEYS}
+                for key, value in _SCRIPT_PATTERN.findall(content):
+                    found[key].append(value)
+                scripts.append(found)
+            finish(slots)
+        elif tag in VOID_TAGS or attr_text.endswith('/'):
+            finish(slots)
+        else:
+            stack.append((tag, element, slots))
+
+    while stack:
+        finish(stack.pop()[2])
+    return buckets, scripts
+
+
+_RULES = tuple(compile_selector(s) for s in SELECTORS)
+
+
+def extract_hot_words(html, limit=20):
+    """从热搜网页中提取前 limit 个不重复的词条，返回 [(词条, 权重)]，权重从 limit+1 递减"""
+    buckets, scripts = scan(html, _RULES)
+
+    hot_words, seen = [], set()
+
+    def take(text):
+        if text and 2 <= len(text) <= 50 and text not in seen:
+            seen.add(text)
+            hot_words.append((text, limit + 1 - len(hot_words)))
+        return len(hot_words) >= limit
+
+    for bucket in buckets:
+        for text in bucket:
+            if take(text):
+                return hot_words
+    for found in scripts:
+        for key in SCRIPT_KEYS:
+            for text in found[key][:limit]:
+                if take(text):
+                    return hot_words
+    return hot_words
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+百度热搜抓取
+带磁盘 HTTP 缓存（ETag / Last-Modified 条件请求 + TTL）和连接池，可以用 asyncio 同时抓取多个榜单。
+缓存中同时保存解析出的热搜词，缓存命中时既不访问网络也不重新解析 HTML。
+
+缓存目录结构（每个 URL 一个子目录，名称为 URL 的 sha1）：
+    meta.json    URL、ETag、Last-Modified、抓取时间、编码、正文摘要
+    body.html    网页原文（也可以作为离线测试和基准测试用的榜单快照）
+    words.json   从该正文解析出的热搜词（按正文摘要和解析器版本校验）
+
+离线使用：serve_directory() 用标准库启动一个本地 HTTP 服务器提供保存好的快照，
+再用 --board-url 指向它即可。
+"""
+
+import argparse
+import asyncio
+import hashlib
+import http.server
+import json
+import os
+import threading
+import time
+from functools import partial
+
+import requests  # pyright: ignore[reportMissingModuleSource]
+from requests.adapters import HTTPAdapter  # pyright: ignore[reportMissingModuleSource]
+
+from hot_extract import extract_hot_words
+
+DEFAULT_BOARD_URL = "https://top.baidu.com/board?platform=wise"
+DEFAULT_TTL = 600
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+# 解析规则变化时修改版本号，旧的解析结果会失效
+PARSER_VERSION = 2
+
+def _write_atomic(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class CacheEntry:
+    """一次抓取的结果；from_cache 表示没有下载正文（TTL 内命中或服务器返回 304）"""
+
+    def __init__(self, url, directory, meta, from_cache):
+        self.url = url
+        self.directory = directory
+        self.meta = meta
+        self.from_cache = from_cache
+
+    @property
+    def body_path(self):
+        return os.path.join(self.directory, 'body.html')
+
+    def text(self):
+        with open(self.body_path, 'rb') as f:
+            return f.read().decode(self.meta.get('encoding') or 'utf-8', errors='replace')
+
+
+class HttpCache:
+    """以 URL 为键的磁盘缓存"""
+
+    def __init__(self, cache_dir, ttl=DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def directory(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def load_meta(self, url):
+        directory = self.directory(url)
+        try:
+            with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or not os.path.exists(os.path.join(directory, 'body.html')):
+            return None
+        return meta
+
+    def save_meta(self, url, meta):
+        directory = self.directory(url)
+        os.makedirs(directory, exist_ok=True)
+        _write_atomic(os.path.join(directory, 'meta.json'),
+                      json.dumps(meta, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def is_fresh(self, meta, now=None):
+        return meta is not None and (now or time.time()) - meta.get('fetched_at', 0) < self.ttl
+
+    def store(self, url, response):
+        """保存 200 响应的正文和校验头"""
+        directory = self.directory(url)
+        os.makedirs(directory, exist_ok=True)
+        body = response.content
+        _write_atomic(os.path.join(directory, 'body.html'), body)
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': 'utf-8',
+            'fetched_at': time.time(),
+            'digest': hashlib.sha1(body).hexdigest(),
+        }
+        self.save_meta(url, meta)
+        return meta
+
+    def load_words(self, url, meta):
+        try:
+            with open(os.path.join(self.directory(url), 'words.json'), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('digest') != meta.get('digest') or cached.get('parser') != PARSER_VERSION:
+            return None
+        return [tuple(item) for item in cached['words']]
+
+    def save_words(self, url, meta, words):
+        payload = {'digest': meta.get('digest'), 'parser': PARSER_VERSION, 'words': words}
+        _write_atomic(os.path.join(self.directory(url), 'words.json'),
+                      json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+
+
+def make_session(pool_size=8, retries=2):
+    """带连接池和重试的 requests.Session"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+class HotSearchFetcher:
+    def __init__(self, cache_dir='.cache/hot_search', ttl=DEFAULT_TTL, timeout=10, session=None,
+                 extractor=extract_hot_words):
+        self.cache = HttpCache(cache_dir, ttl)
+        self.timeout = timeout
+        self.session = session or make_session()
+        self.extractor = extractor
+
+    def fetch(self, url):
+        """抓取 URL；TTL 内直接使用缓存，过期后发送条件请求，返回 CacheEntry"""
+        meta = self.cache.load_meta(url)
+        if self.cache.is_fresh(meta):
+            return CacheEntry(url, self.cache.directory(url), meta, from_cache=True)
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and meta is not None:
+            meta['fetched_at'] = time.time()
+            self.cache.save_meta(url, meta)
+            return CacheEntry(url, self.cache.directory(url), meta, from_cache=True)
+        response.raise_for_status()
+        meta = self.cache.store(url, response)
+        return CacheEntry(url, self.cache.directory(url), meta, from_cache=False)
+
+    def hot_words(self, entry, limit=20):
+        """解析抓取结果中的热搜词，同一正文只解析一次"""
+        words = self.cache.load_words(entry.url, entry.meta)
+        if words is None:
+            words = self.extractor(entry.text(), limit=limit)
+            self.cache.save_words(entry.url, entry.meta, words)
+        return words[:limit]
+
+    async def fetch_async(self, urls):
+        """并发抓取多个榜单，结果顺序与 urls 一致；单个榜单失败时对应位置为异常对象"""
+        tasks = [asyncio.to_thread(self.fetch, url) for url in urls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def fetch_many(self, urls):
+        return asyncio.run(self.fetch_async(urls))
+
+    def close(self):
+        self.session.close()
+
+
+def merge_boards(boards, limit=20):
+    """按榜单顺序合并多个榜单的词条，去重后取前 limit 个并重新计算权重"""
+    merged, seen = [], set()
+    for words in boards:
+        for text, _ in words:
+            if text not in seen:
+                seen.add(text)
+                merged.append((text, limit + 1 - len(merged)))
+                if len(merged) >= limit:
+                    return merged
+    return merged
+
+
+# ==================== 离线测试 ====================
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(directory, port=0):
+    """
+    在后台线程中用标准库提供 directory 下的文件（支持 Last-Modified / If-Modified-Since），
+    返回 (server, base_url)，用完后调用 server.shutdown()
+    """
+    handler = partial(_QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def add_arguments(parser):
+    parser.add_argument('--board-url', action='append', default=None,
+                        help=f'热搜榜单地址，可重复指定以同时抓取多个榜单（默认 {DEFAULT_BOARD_URL}）')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL,
+                        help='热搜缓存的有效期（秒），0 表示每次都向服务器确认')
+    return parser
+
+
+def options_from_argv():
+    """供没有命令行解析的脚本使用，返回 (榜单地址列表, TTL)"""
+    args, _ = add_arguments(argparse.ArgumentParser(add_help=False)).parse_known_args()
+    return args.board_url or [DEFAULT_BOARD_URL], args.cache_ttl
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+按分类生成连接
+weibo.json 没有连接时，把每个分类的中心节点和同分类的其他节点连起来。
+全部在紧凑节点表上分组完成：按分类编号稳定排序得到各组的起点，组内名次用数组算出，
+不需要构建 分类 -> 名称列表 的字典，数百万节点也只需几次排序。
+
+中心节点的选择（hub）：
+    first   分类中最先出现的节点（与原来的实现一致）
+    value   value 最大的节点
+只有在没有连接时才会生成连接，此时所有节点的度数都是 0，所以不提供按度数选择。
+组内其余节点按同样的顺序排列，中心节点连接其后的 max_links 个节点。
+连接按排序后的节点分块生成，写入文件时每次只保留一块连接。
+"""
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+
+HUBS = ('first', 'value')
+
+
+def _member_order(store, hub):
+    """有分类的节点按 (分类, 组内顺序) 排序后的节点下标"""
+    if hub not in HUBS:
+        raise ValueError(f"不支持的中心节点选择方式: {hub}")
+    category = store.node_category
+    valid = np.flatnonzero(category >= 0)
+    if hub == 'first':
+        return valid[np.argsort(category[valid], kind='stable')]
+    # lexsort 是稳定排序，并列时保持原来的顺序
+    return valid[np.lexsort((-store.node_value[valid], category[valid]))]
+
+
+def _link_plan(store, hub, max_links, min_size, max_size):
+    """返回 (排序后的节点下标, 各分类的节点数, 各分类在排序结果中的起点, 连接总数)"""
+    order = _member_order(store, hub)
+    sizes = np.bincount(store.node_category[order]) if len(order) else np.zeros(0, dtype=np.int64)
+    starts = np.cumsum(sizes) - sizes
+    eligible = (sizes >= min_size) & (sizes <= max_size)
+    total = int(np.minimum(sizes - 1, max_links)[eligible].sum())
+    return order, sizes, starts, total
+
+
+def _iter_members(store, plan, chunk_size, max_links, min_size, max_size):
+    """按排序后的节点分块产出 (中心节点下标, 连接的另一端节点下标)，跳过没有连接的块"""
+    order, sizes, starts, _ = plan
+    for lo in range(0, len(order), chunk_size):
+        block = order[lo:lo + chunk_size]
+        block_cat = store.node_category[block]
+        rank = np.arange(lo, lo + len(block)) - starts[block_cat]
+        selected = ((rank >= 1) & (rank <= max_links)
+                    & (sizes[block_cat] >= min_size) & (sizes[block_cat] <= max_size))
+        if selected.any():
+            yield order[starts[block_cat[selected]]], block[selected]
+
+
+def hub_link_members(store, hub='first', max_links=19, min_size=2, max_size=50):
+    """
+    返回 (中心节点下标, 连接的另一端节点下标)，两者等长
+    只处理节点数在 [min_size, max_size] 之间的分类
+    """
+    plan = _link_plan(store, hub, max_links, min_size, max_size)
+    parts = list(_iter_members(store, plan, max(len(plan[0]), 1), max_links, min_size, max_size))
+    if not parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    return parts[0]
+
+
+def category_hub_links(store, hub='first', **kwargs):
+    """生成的连接，(source, target) 为名称 id 数组"""
+    hubs, members = hub_link_members(store, hub, **kwargs)
+    return store.node_name[hubs], store.node_name[members]
+
+
+def iter_category_hub_links(store, hub='first', chunk_size=1 << 20, max_links=19, min_size=2, max_size=50):
+    """按块产出 (source, target)，每块最多 chunk_size 条连接（按排序后的节点分块，只保留当前块）"""
+    plan = _link_plan(store, hub, max_links, min_size, max_size)
+    for hubs, members in _iter_members(store, plan, chunk_size, max_links, min_size, max_size):
+        yield store.node_name[hubs], store.node_name[members]
+
+
+def write_category_hub_links(store, path, hub='first', chunk_size=1 << 20, max_links=19, min_size=2, max_size=50):
+    """
+    把生成的连接逐块写入 .npy 文件（形状为 (连接数, 2) 的 int32，内容为名称 id），返回连接数
+    连接总数由各分类的节点数先算出，之后每块连接生成后立即写入，不在内存中保留全部连接；
+    文件以内存映射方式打开，可以用 np.load(path, mmap_mode='r') 读取而不整体载入内存
+    """
+    plan = _link_plan(store, hub, max_links, min_size, max_size)
+    total = plan[3]
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=np.int32, shape=(total, 2))
+    pos = 0
+    for hubs, members in _iter_members(store, plan, chunk_size, max_links, min_size, max_size):
+        out[pos:pos + len(hubs), 0] = store.node_name[hubs]
+        out[pos:pos + len(hubs), 1] = store.node_name[members]
+        pos += len(hubs)
+    out.flush()
+    del out
+    return total
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+批量生成学生成绩报表
+对一个目录（或通配符）下的所有班级工作簿生成 E-2 任务3 的四张图表，并写出一个汇总的 index.html：
+
+    python student_batch.py 班级目录/ --output student_reports --jobs 0
+    python student_batch.py "2024秋/*.xls" "2025春/*.xlsx"
+
+工作簿在进程池中读取（表格和列角色都走 common.sheet_cache 的缓存），所有班级拼成一张长表后
+用 groupby / bincount 一次算出各班级的图表数据，再把各班级的图表交给进程池并行渲染。
+"""
+
+import argparse
+import glob
+import html
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common import chart_payload, stages
+from common.student_schema import read_student_sheet
+from student_charts import CHART_FILES, render_report
+from student_report import class_reports, normalize_sheet
+
+WORKBOOK_PATTERNS = ('*.xls', '*.xlsx')
+
+_INDEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <title>学生成绩报表</title>
+    <style>
+        body {{ font-family: 'Arial', 'Microsoft YaHei', sans-serif; margin: 30px; color: #333; }}
+        h1 {{ font-size: 28px; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border: 1px solid #e9ecef; padding: 8px 12px; text-align: left; }}
+        th {{ background: #f8f9fa; }}
+        tr:hover {{ background: #f1f3ff; }}
+        a {{ color: #5470C6; text-decoration: none; margin-right: 12px; }}
+        .skipped {{ color: #999; margin-right: 12px; }}
+    </style>
+</head>
+<body>
+    <h1>学生成绩报表</h1>
+    <p>共 {classes} 个班级、{students} 名学生</p>
+    <table>
+        <tr><th>班级</th><th>人数</th><th>平均总分</th><th>最高总分</th><th>图表</th></tr>
+{rows}
+    </table>
+</body>
+</html>
+"""
+
+
+def find_workbooks(sources):
+    """目录取其中所有 .xls/.xlsx 文件，其他参数按通配符展开，结果去重并保持顺序"""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            matches = sorted(p for pattern in WORKBOOK_PATTERNS for p in glob.glob(os.path.join(source, pattern)))
+        else:
+            matches = sorted(glob.glob(source)) or ([source] if os.path.exists(source) else [])
+        paths.extend(os.path.abspath(p) for p in matches)
+    return list(dict.fromkeys(paths))
+
+
+def class_labels(paths):
+    """以文件名（不含扩展名）作为班级名，重名时加上序号"""
+    labels, seen = [], {}
+    for path in paths:
+        label = os.path.splitext(os.path.basename(path))[0]
+        seen[label] = seen.get(label, 0) + 1
+        labels.append(label if seen[label] == 1 else f"{label}-{seen[label]}")
+    return labels
+
+
+def load_class(path):
+    """工作进程：读取一个工作簿并整理为统一列名，失败时返回 (None, 错误信息)"""
+    try:
+        df, roles = read_student_sheet(path)
+        return normalize_sheet(df, roles)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def render_class(report, directory, payload_opts):
+    """工作进程：渲染一个班级的图表"""
+    os.makedirs(directory, exist_ok=True)
+    return render_report(report, directory, payload_opts)
+
+
+def _cell(value):
+    return '-' if value is None else html.escape(str(value))
+
+
+def write_index(output, reports, written):
+    rows = []
+    for report, files in zip(reports, written):
+        summary = report.summary()
+        links = []
+        for _, filename, title in CHART_FILES:
+            if filename in files:
+                href = html.escape(f"{report.label}/{filename}", quote=True)
+                links.append(f'<a href="{href}">{title}</a>')
+            else:
+                links.append(f'<span class="skipped">{title}（无数据）</span>')
+        rows.append(
+            f"        <tr><td>{_cell(report.label)}</td><td>{summary['students']}</td>"
+            f"<td>{_cell(summary['mean_total'])}</td><td>{_cell(summary['max_total'])}</td>"
+            f"<td>{''.join(links)}</td></tr>"
+        )
+    path = os.path.join(output, 'index.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(_INDEX_TEMPLATE.format(
+            classes=len(reports), students=sum(r.count for r in reports), rows='\n'.join(rows)))
+    return path
+
+
+def run(args):
+    paths = find_workbooks(args.sources)
+    if not paths:
+        print("没有找到工作簿")
+        return 1
+    labels = class_labels(paths)
+    jobs = args.jobs or os.cpu_count() or 1
+    payload_opts = {'mode': args.payload, 'precision': args.precision}
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        stages.start('读取', kind='load')
+        chunksize = max(1, len(paths) // (jobs * 4))
+        loaded = list(pool.map(load_class, paths, chunksize=chunksize))
+
+        frames, infos, kept = [], [], []
+        for path, label, (frame, info) in zip(paths, labels, loaded):
+            if frame is None:
+                print(f"跳过 {path}：{info}")
+                continue
+            frames.append(frame)
+            infos.append(info)
+            kept.append(label)
+        print(f"已读取 {len(frames)}/{len(paths)} 个工作簿，并行进程数: {jobs}")
+        if not frames:
+            return 1
+
+        stages.start('汇总', kind='transform')
+        reports = class_reports(frames, kept, infos)
+
+        stages.start('渲染', kind='render')
+        futures = [pool.submit(render_class, report, os.path.join(args.output, report.label), payload_opts)
+                   for report in reports]
+        written = [future.result() for future in futures]
+
+    stages.start('索引页', kind='render')
+    index_path = write_index(args.output, reports, written)
+    stages.stop()
+
+    skipped = sum(1 for report in reports if report.gender_skip)
+    print(f"已生成 {len(reports)} 个班级的报表，{sum(len(files) for files in written)} 个图表")
+    if skipped:
+        print(f"其中 {skipped} 个班级缺少性别或成绩数据，没有男女对比图")
+    print(f"汇总页: {index_path}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量生成学生成绩报表（E-2 任务3）')
+    parser.add_argument('sources', nargs='+', help='工作簿所在目录，或工作簿路径/通配符')
+    parser.add_argument('--output', default='student_reports', help='输出目录（默认: student_reports）')
+    parser.add_argument('--jobs', type=int, default=0,
+                        help='读取和渲染的进程数，0 表示使用全部CPU核心（默认: 0）')
+    chart_payload.add_arguments(parser)
+    stages.add_arguments(parser)
+    args = parser.parse_args()
+    stages.configure(args)
+    sys.exit(run(args))
+
+
+if __name__ == '__main__':
+    main()
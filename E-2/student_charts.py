@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+学生成绩的四张图表（E-2 任务3）
+输入为 student_report.ClassReport，E-2 实验脚本和批量报表共用这些构建函数。
+"""
+
+import os
+
+from pyecharts.charts import Bar, Grid, Line, Pie  # pyright: ignore[reportMissingImports]
+from pyecharts import options as opts  # pyright: ignore[reportMissingImports]
+from pyecharts.globals import ThemeType  # pyright: ignore[reportMissingImports]
+
+from common.chart_payload import render_chart
+
+# (任务, 输出文件名, 说明)
+CHART_FILES = (
+    ('任务3.1', 'task3_1_total_bar.html', '总分条形图'),
+    ('任务3.2', 'task3_2_top3_pie.html', '前3名饼图'),
+    ('任务3.3', 'task3_3_score_distribution.html', '成绩分布图'),
+    ('任务3.4', 'task3_4_gender_comparison.html', '男女成绩对比图'),
+)
+
+
+def total_bar(report):
+    return (
+        Bar(init_opts=opts.InitOpts(width="1600px", height="600px", theme=ThemeType.MACARONS))
+        .add_xaxis(report.students)
+        .add_yaxis("总分", report.totals, color="#5470C6")
+        .set_global_opts(
+            title_opts=opts.TitleOpts(title="所有学生总分条形图", subtitle="按学生姓名排序"),
+            xaxis_opts=opts.AxisOpts(axislabel_opts=opts.LabelOpts(rotate=-45)),
+            yaxis_opts=opts.AxisOpts(name="分数"),
+            datazoom_opts=[opts.DataZoomOpts(type_="slider", range_start=0, range_end=100)],
+        )
+        .set_series_opts(
+            label_opts=opts.LabelOpts(is_show=True, position="top"),
+        )
+    )
+
+
+def top_pies(report):
+    pie_charts = []
+    for student_name, total_score, pie_data in report.top:
+        title_text = f"{student_name}\n总分: {total_score}"
+        if len(title_text) > 20:
+            title_text = f"{student_name[:15]}...\n总分: {total_score}"
+
+        pie = (
+            Pie(init_opts=opts.InitOpts(width="450px", height="500px", theme=ThemeType.MACARONS))
+            .add(
+                series_name="",
+                data_pair=pie_data,
+                radius=["30%", "70%"],
+                center=["50%", "55%"],
+            )
+            .set_global_opts(
+                title_opts=opts.TitleOpts(
+                    title=title_text,
+                    pos_left="center",
+                    pos_top="5%",
+                    title_textstyle_opts=opts.TextStyleOpts(font_size=12, font_weight="bold"),
+                ),
+                legend_opts=opts.LegendOpts(
+                    orient="vertical",
+                    pos_left="5%",
+                    pos_top="15%",
+                    item_width=15,
+                    item_height=12,
+                    textstyle_opts=opts.TextStyleOpts(font_size=10)
+                ),
+            )
+            .set_series_opts(
+                label_opts=opts.LabelOpts(
+                    formatter="{b}: {c}分\n({d}%)",
+                    font_size=9
+                ),
+            )
+        )
+        pie_charts.append(pie)
+
+    grid = Grid(init_opts=opts.InitOpts(width="1600px", height="600px", theme=ThemeType.MACARONS))
+    for i, pie in enumerate(pie_charts):
+        grid.add(
+            pie,
+            grid_opts=opts.GridOpts(
+                pos_left=f"{5 + i*30}%",
+                pos_top="5%",
+                width="28%",
+                height="90%"
+            )
+        )
+    return grid
+
+
+def distribution_line(report):
+    line = (
+        Line(init_opts=opts.InitOpts(width="1200px", height="600px", theme=ThemeType.MACARONS))
+        .set_global_opts(
+            title_opts=opts.TitleOpts(title="四门课程成绩分布图", subtitle="按每10分统计人数"),
+            xaxis_opts=opts.AxisOpts(name="分数段"),
+            yaxis_opts=opts.AxisOpts(name="人数"),
+            legend_opts=opts.LegendOpts(pos_top="10%"),
+        )
+    )
+
+    if report.distribution:
+        x_labels, courses = report.distribution
+        line.add_xaxis(x_labels)
+
+        for course_name, counts in courses:
+            if len(counts) == len(x_labels):
+                line.add_yaxis(
+                    course_name,
+                    counts,
+                    is_smooth=True,
+                    symbol="circle",
+                    symbol_size=8,
+                    label_opts=opts.LabelOpts(is_show=True),
+                )
+    return line
+
+
+def gender_bar(report):
+    """没有性别或成绩数据时返回 None（原因见 report.gender_skip）"""
+    if report.gender is None:
+        return None
+    categories, male_label, female_label, male_scores, female_scores = report.gender
+    return (
+        Bar(init_opts=opts.InitOpts(width="1000px", height="600px", theme=ThemeType.MACARONS))
+        .add_xaxis(categories)
+        .add_yaxis("男生平均分" if male_label else "第一组", male_scores, color="#5470C6")
+        .add_yaxis("女生平均分" if female_label else "第二组", female_scores, color="#EE6666")
+        .set_global_opts(
+            title_opts=opts.TitleOpts(title="男生和女生各科平均成绩对比"),
+            yaxis_opts=opts.AxisOpts(name="平均分"),
+            legend_opts=opts.LegendOpts(pos_top="10%"),
+        )
+        .set_series_opts(
+            label_opts=opts.LabelOpts(is_show=True, position="top"),
+        )
+    )
+
+
+BUILDERS = (total_bar, top_pies, distribution_line, gender_bar)
+
+
+def render_report(report, directory='.', payload_opts=None):
+    """渲染一个班级的全部图表，返回 {输出文件名: 写出的文件列表}，跳过的图表不在其中"""
+    written = {}
+    for builder, (_, filename, _) in zip(BUILDERS, CHART_FILES):
+        chart = builder(report)
+        if chart is not None:
+            written[filename] = render_chart(chart, os.path.join(directory, filename), **(payload_opts or {}))
+    return written
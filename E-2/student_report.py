@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+学生成绩报表的数据准备
+每个工作簿先整理为统一列名的成绩表（normalize_sheet），多个班级的成绩表拼接为一张长表后，
+总分排名、前3名、成绩分布、男女平均分都用一次 groupby / bincount 对所有班级同时计算（class_reports），
+结果为每个班级一个 ClassReport，只包含画图需要的列表数据。
+
+单个班级（E-2 任务3）和批量报表（student_batch.py）使用同一套计算，输出一致。
+"""
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+import pandas as pd  # pyright: ignore[reportMissingImports]
+
+from common.binning import fixed_width_group_edges, group_histogram
+from common.student_schema import COURSE_ROLES
+
+BIN_SIZE = 10
+TOP_N = 3
+COURSES = tuple(role for role, _ in COURSE_ROLES)
+COURSE_LABELS = dict(COURSE_ROLES)
+
+
+def _plain_number(v):
+    return int(v) if float(v).is_integer() else v
+
+
+def normalize_sheet(df, roles):
+    """
+    按列角色整理成绩表，返回 (表格, 信息)
+    表格的列为 name / gender / 四门课程 / total，缺少的课程为空值；
+    信息为 {'courses': 存在的课程, 'has_gender': 是否有性别列, 'computed_total': 总分是否由各科相加得到}
+    """
+    n = len(df)
+    courses = [role for role in COURSES if roles.get(role) is not None]
+    out = pd.DataFrame(index=pd.RangeIndex(n))
+    out['name'] = df[roles['name']].to_numpy() if roles.get('name') is not None else [f"学生{i+1}" for i in range(n)]
+    out['gender'] = df[roles['gender']].to_numpy() if roles.get('gender') is not None else None
+    for role in COURSES:
+        out[role] = df[roles[role]].to_numpy() if role in courses else np.nan
+
+    computed_total = False
+    if roles.get('total') is not None:
+        out['total'] = df[roles['total']].to_numpy()
+    elif courses:
+        out['total'] = df[[roles[role] for role in courses]].sum(axis=1).to_numpy()
+        computed_total = True
+    else:
+        raise ValueError("没有找到总分列，也没有可以相加的成绩列")
+    return out, {'courses': courses, 'has_gender': roles.get('gender') is not None,
+                 'computed_total': computed_total}
+
+
+class ClassReport:
+    """一个班级四张图表的数据"""
+
+    def __init__(self, label, courses, students, totals, top, distribution, gender, gender_skip):
+        self.label = label
+        self.courses = courses
+        self.students = students            # 姓名列表
+        self.totals = totals                # 与 students 对应的总分
+        self.top = top                      # [(姓名, 总分, [(课程名, 分数)])]，总分从高到低
+        self.distribution = distribution    # (分数段标签, [(课程名, 各分数段人数)])，没有课程时为 None
+        self.gender = gender                # (课程名列表, 男生标签, 女生标签, 男生平均分, 女生平均分)
+        self.gender_skip = gender_skip      # gender 为 None 时跳过对比图的原因
+
+    @property
+    def count(self):
+        return len(self.students)
+
+    def summary(self):
+        totals = [t for t in self.totals if t == t]
+        return {
+            'students': self.count,
+            'mean_total': round(sum(totals) / len(totals), 2) if totals else None,
+            'max_total': max(totals) if totals else None,
+        }
+
+
+def pick_gender_labels(labels):
+    """从分组标签中找出男、女对应的标签，找不到时按顺序取前两个"""
+    male_label = None
+    female_label = None
+    for label in labels:
+        label_str = str(label).strip()
+        if '男' in label_str or label_str.upper() in ['M', 'MALE', '男']:
+            male_label = label
+        elif '女' in label_str or label_str.upper() in ['F', 'FEMALE', '女']:
+            female_label = label
+    if not male_label and len(labels) > 0:
+        male_label = labels[0]
+    if not female_label and len(labels) > 1:
+        female_label = labels[1]
+    return male_label, female_label
+
+
+def _top_rows(frame, top_n):
+    """每个班级总分最高的 top_n 行，并列时保持原来的顺序（同 DataFrame.nlargest）"""
+    ranked = frame[frame['total'].notna()].sort_values(
+        ['class', 'total', 'row'], ascending=[True, False, True], kind='stable')
+    return ranked.groupby('class', sort=False).head(top_n)
+
+
+def _distributions(frame, n_classes, bin_size):
+    """
+    每个班级每门课程的分数段人数（边界对齐到 bin_size 的整数倍，左闭右开），
+    返回 {课程: (各班级起点, 各班级分段数, 各班级在计数中的起点, 拼接后的计数)}
+    """
+    result = {}
+    cls = frame['class'].to_numpy()
+    for role in COURSES:
+        scores = frame[role].to_numpy(dtype=float)
+        lo, nbins = fixed_width_group_edges(scores, cls, n_classes, bin_size)
+        offsets, counts = group_histogram(scores, cls, lo, nbins, bin_size)
+        result[role] = (lo, nbins, offsets, counts)
+    return result
+
+
+def class_reports(frames, labels, infos, top_n=TOP_N, bin_size=BIN_SIZE):
+    """frames / infos 为各班级 normalize_sheet 的结果，返回与 labels 对应的 ClassReport 列表"""
+    n_classes = len(frames)
+    sizes = np.array([len(f) for f in frames], dtype=np.int64)
+    frame = pd.concat(frames, ignore_index=True)
+    frame['class'] = np.repeat(np.arange(n_classes), sizes)
+    frame['row'] = np.arange(len(frame)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+    # 前 N 名
+    top = _top_rows(frame, top_n)
+    top_by_class = {c: [] for c in range(n_classes)}
+    course_values = {role: top[role].tolist() for role in COURSES}
+    for i, (c, name, total) in enumerate(zip(top['class'].tolist(), top['name'].tolist(), top['total'].tolist())):
+        pie_data = [(COURSE_LABELS[role], _plain_number(course_values[role][i]))
+                    for role in infos[c]['courses'] if pd.notna(course_values[role][i])]
+        top_by_class[c].append((name, _plain_number(total), pie_data))
+
+    # 成绩分布
+    dist = _distributions(frame, n_classes, bin_size)
+
+    # 男女平均分
+    gender_avg = (frame[frame['gender'].notna()]
+                  .groupby(['class', 'gender'], sort=True)[list(COURSES)].mean().round(2))
+    gender_groups = {}
+    for (c, gender), row in zip(gender_avg.index.tolist(), gender_avg.to_numpy().tolist()):
+        gender_groups.setdefault(c, {})[gender] = dict(zip(COURSES, row))
+
+    names = np.split(frame['name'].to_numpy(), np.cumsum(sizes)[:-1])
+    totals = np.split(frame['total'].to_numpy(), np.cumsum(sizes)[:-1])
+
+    reports = []
+    for c, (label, info) in enumerate(zip(labels, infos)):
+        courses = info['courses']
+        distribution = None
+        if courses:
+            lines = []
+            for role in courses:
+                lo, nbins, offsets, counts = dist[role]
+                k = int(nbins[c])
+                lines.append((COURSE_LABELS[role], lo[c] + bin_size * np.arange(k + 1),
+                              counts[offsets[c]:offsets[c] + k].tolist()))
+            edges = lines[0][1]
+            x_labels = [f"{edges[i]}-{edges[i+1]}" for i in range(len(edges) - 1)]
+            distribution = (x_labels, [(name, counts) for name, _, counts in lines])
+
+        gender, gender_skip = None, None
+        if not info['has_gender']:
+            gender_skip = "警告：未找到性别列，跳过任务3.4"
+        elif not courses:
+            gender_skip = "警告：未找到成绩列，跳过任务3.4"
+        else:
+            groups = gender_groups.get(c, {})
+            male_label, female_label = pick_gender_labels(list(groups))
+            categories = [COURSE_LABELS[role] for role in courses]
+            male_scores = [float(groups[male_label][role]) if male_label else 0 for role in courses]
+            female_scores = [float(groups[female_label][role]) if female_label else 0 for role in courses]
+            gender = (categories, male_label, female_label, male_scores, female_scores)
+
+        reports.append(ClassReport(
+            label, courses, names[c].tolist(), [_plain_number(t) if t == t else t for t in totals[c].tolist()],
+            top_by_class[c], distribution, gender, gender_skip,
+        ))
+    return reports
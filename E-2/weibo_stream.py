@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+weibo.json 流式解析
+不把整个 JSON 读进内存，而是逐个解析 nodes / links 数组中的元素，
+规范化后直接追加到基于 array 的紧凑表中。内存占用只取决于最终的节点表和连接表。
+
+支持的顶层结构（与原来的 json.load 版本一致）：
+    [[节点...], [连接...], ...]     第三个及之后的元素会被跳过
+    [节点...]
+    {"nodes": [...], "links": [...]}
+"""
+
+from array import array
+import json
+
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """在文本流上按需读取并逐个解码 JSON 值"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # 丢弃已经消费的部分，缓冲区只保留当前元素
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """跳过空白，返回下一个字符（文件结束时返回空串）"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"weibo.json 格式错误：位置 {self.pos} 处应为 {char!r}")
+        self.pos += 1
+
+    def value(self):
+        """解码下一个完整的 JSON 值，数据不完整时继续读取"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 数字可能恰好被截断在缓冲区末尾
+            if end == len(self.buf) and not self.eof and not isinstance(obj, (dict, list, str)):
+                if self._fill():
+                    continue
+            self.pos = end
+            return obj
+
+    def items(self):
+        """逐个产出当前数组中的元素（调用前应位于 '[' 处）"""
+        self.expect('[')
+        return self.rest_items()
+
+    def rest_items(self):
+        """已经读过 '[' 后，逐个产出剩余元素"""
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            sep = self.peek()
+            self.pos += 1
+            if sep == ']':
+                return
+            if sep != ',':
+                raise ValueError(f"weibo.json 格式错误：数组中出现 {sep!r}")
+
+
+def iter_weibo(path):
+    """逐个产出 ('node', dict) 和 ('link', dict)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f)
+        first = reader.peek()
+        if first == '{':
+            reader.expect('{')
+            while reader.peek() != '}':
+                key = reader.value()
+                reader.expect(':')
+                if key in ('nodes', 'links') and reader.peek() == '[':
+                    kind = key[:-1]
+                    for item in reader.items():
+                        yield kind, item
+                else:
+                    reader.value()
+                if reader.peek() == ',':
+                    reader.pos += 1
+            return
+
+        reader.expect('[')
+        if reader.peek() != '[':
+            # 顶层就是节点数组
+            for item in reader.rest_items():
+                yield 'node', item
+            return
+
+        for kind in ('node', 'link'):
+            if reader.peek() != '[':
+                break
+            for item in reader.items():
+                yield kind, item
+            if reader.peek() != ',':
+                break
+            reader.pos += 1
+        # 其余元素（分类、正文等）不需要，不再继续解析
+
+
+def normalize_symbol_size(symbol_size):
+    if isinstance(symbol_size, str):
+        try:
+            symbol_size = int(symbol_size)
+        except ValueError:
+            symbol_size = 10
+    return int(max(5, min(symbol_size, 50)))
+
+
+class StringPool:
+    """字符串驻留：相同的名称只保存一次，用整数 id 引用"""
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def intern(self, s):
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class WeiboTables:
+    """
+    规范化后的节点表和连接表
+    名称和分类都驻留在字符串池中，各列保存在 array 中
+    """
+
+    def __init__(self):
+        self.pool = StringPool()
+        self.categories = StringPool()
+        self.node_name = array('i')
+        self.node_size = array('i')
+        self.node_value = array('d')
+        self.node_category = array('i')   # -1 表示没有分类
+        self.link_source = array('i')
+        self.link_target = array('i')
+        self.link_value = array('d')
+
+    def add_node(self, node):
+        if not isinstance(node, dict) or 'name' not in node:
+            return
+        name = node.get("name", "")
+        if not (name and name.strip()):
+            return
+        category = node.get("category", "")
+        self.node_name.append(self.pool.intern(name))
+        self.node_size.append(normalize_symbol_size(node.get("symbolSize", 5)))
+        self.node_value.append(_to_float(node.get("value", 1)))
+        self.node_category.append(self.categories.intern(category) if category else -1)
+
+    def add_link(self, link):
+        if not isinstance(link, dict) or 'source' not in link or 'target' not in link:
+            return
+        self.link_source.append(self.pool.intern(link.get("source")))
+        self.link_target.append(self.pool.intern(link.get("target")))
+        self.link_value.append(_to_float(link.get("value", 1)))
+
+    @property
+    def node_count(self):
+        return len(self.node_name)
+
+    @property
+    def link_count(self):
+        return len(self.link_source)
+
+    def node_dicts(self):
+        """导出为 pyecharts 使用的节点字典列表"""
+        names = self.pool.strings
+        cats = self.categories.strings
+        return [
+            {
+                "name": names[n],
+                "symbolSize": s,
+                "value": _plain_number(v),
+                "category": cats[c] if c >= 0 else "",
+            }
+            for n, s, v, c in zip(self.node_name, self.node_size, self.node_value, self.node_category)
+        ]
+
+    def link_dicts(self):
+        names = self.pool.strings
+        return [
+            {"source": names[s], "target": names[t], "value": _plain_number(v)}
+            for s, t, v in zip(self.link_source, self.link_target, self.link_value)
+        ]
+
+
+def _to_float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _plain_number(v):
+    return int(v) if v.is_integer() else v
+
+
+def load_weibo(path):
+    """流式读取 weibo.json，返回 WeiboTables"""
+    tables = WeiboTables()
+    for kind, item in iter_weibo(path):
+        if kind == 'node':
+            tables.add_node(item)
+        else:
+            tables.add_link(item)
+    return tables
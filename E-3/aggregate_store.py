@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+世界杯统计的增量汇总
+把 WorldCupsSummary.csv（以 Year 为键）和 WorldCupMatches.csv（以 MatchID 为键）的汇总结果保存在磁盘上：
+前四名次数、冠军次数、举办洲/冠军洲次数、各届汇总行，以及每届的比赛场数、进球数和观众人数。
+每个 CSV 记录已读取到的字节位置，之后只解析新追加的行，并把这些行作为增量加到计数器上；
+同一个键再次出现时先减去旧行的贡献再加上新行（更正数据）。CSV 被改写（而不是追加）时自动重新汇总。
+
+    store = AggregateStore('.cache/world_cup_aggregates.json')
+    store.refresh('世界杯数据集/WorldCupsSummary.csv', '世界杯数据集/WorldCupMatches.csv')
+    store.save()
+    summary_df = store.summary_frame()
+    champion_count = store.counts('champions')
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+STORE_VERSION = 1
+# 用来确认文件只是追加：已读取部分末尾这么多字节的摘要
+TAIL_BYTES = 4096
+
+SUMMARY_COLUMNS = ('Year', 'HostCountry', 'Winner', 'Second', 'Third', 'Fourth', 'GoalsScored',
+                   'QualifiedTeams', 'MatchesPlayed', 'Attendance', 'HostContinent', 'WinnerContinent')
+# 计数器名 -> 参与计数的列；同票时按首次出现的 (列, 行) 排序，与 Counter / value_counts 的顺序一致
+COUNTERS = {
+    'top4': ('Winner', 'Second', 'Third', 'Fourth'),
+    'champions': ('Winner',),
+    'host_continents': ('HostContinent',),
+    'winner_continents': ('WinnerContinent',),
+}
+GOAL_COLUMNS = ('Home Team Goals', 'Away Team Goals')
+
+
+def _plain_number(v):
+    return int(v) if isinstance(v, float) and v.is_integer() else v
+
+
+def _empty_state():
+    return {
+        'version': STORE_VERSION,
+        'sources': {},
+        'summary': {},        # Year -> [行号, {列: 值}]
+        'counters': {name: {} for name in COUNTERS},   # 值 -> [次数, [列下标, 行号]]
+        'matches': {},        # MatchID -> [Year, 进球数, 观众人数]
+        'match_years': {},    # Year -> [场数, 进球数, 观众人数]
+    }
+
+
+def _tail_digest(f, offset):
+    start = max(0, offset - TAIL_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+class AggregateStore:
+    def __init__(self, path):
+        self.path = path
+        self.state = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return _empty_state()
+        return state if state.get('version') == STORE_VERSION else _empty_state()
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def reset(self):
+        self.state = _empty_state()
+
+    # ==================== 读取新追加的行 ====================
+    def read_appended(self, name, path):
+        """
+        返回 path 中上次之后新追加的完整行组成的 DataFrame（没有新行时为空表）
+        文件不是在原有内容之后追加时返回 None，调用方需要重新汇总
+        """
+        source = self.state['sources'].get(name)
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if source is None:
+                offset, header = 0, b''
+            else:
+                offset = source['offset']
+                if size < offset or _tail_digest(f, offset) != source['tail']:
+                    return None
+                header = source['header'].encode('utf-8')
+            f.seek(offset)
+            chunk = f.read()
+            end = chunk.rfind(b'\n') + 1
+            chunk = chunk[:end]
+            if offset == 0:
+                header = chunk[:chunk.find(b'\n') + 1]
+            new_offset = offset + end
+            tail = _tail_digest(f, new_offset)
+
+        self.state['sources'][name] = {'offset': new_offset, 'tail': tail, 'header': header.decode('utf-8')}
+        # 第一次读取时 chunk 本身以表头开头；没有新行时只解析表头，得到带列名的空表
+        data = chunk if offset == 0 else header + chunk
+        if not data.strip():
+            return pd.DataFrame()
+        return pd.read_csv(io.BytesIO(data))
+
+    # ==================== 计数器 ====================
+    def _counter_add(self, row, position):
+        for name, columns in COUNTERS.items():
+            counter = self.state['counters'][name]
+            for col_index, col in enumerate(columns):
+                key = [col_index, position]
+                entry = counter.setdefault(row[col], [0, key])
+                entry[0] += 1
+                entry[1] = min(entry[1], key)
+
+    def _counter_remove(self, row, position):
+        for name, columns in COUNTERS.items():
+            counter = self.state['counters'][name]
+            for col_index, col in enumerate(columns):
+                entry = counter[row[col]]
+                entry[0] -= 1
+                if entry[0] == 0:
+                    del counter[row[col]]
+                elif entry[1] == [col_index, position]:
+                    entry[1] = self._first_appearance(columns, row[col], exclude=position)
+
+    def _first_appearance(self, columns, value, exclude):
+        return min([col_index, position]
+                   for position, record in self.state['summary'].values() if position != exclude
+                   for col_index, col in enumerate(columns) if record[col] == value)
+
+    def apply_summary(self, df):
+        """把汇总表的新行按 Year 合并，返回合并的行数"""
+        if df.empty:
+            return 0
+        df = df.dropna()
+        summary = self.state['summary']
+        for values in df[list(SUMMARY_COLUMNS)].itertuples(index=False, name=None):
+            row = dict(zip(SUMMARY_COLUMNS, map(_plain_number, values)))
+            key = str(row['Year'])
+            if key in summary:
+                position, old = summary[key]
+                self._counter_remove(old, position)
+            else:
+                position = len(summary)
+            summary[key] = [position, row]
+            self._counter_add(row, position)
+        return len(df)
+
+    def apply_matches(self, df):
+        """把比赛表的新行按 MatchID 合并，返回合并的行数"""
+        if df.empty:
+            return 0
+        df = df.dropna(subset=list(GOAL_COLUMNS) + ['MatchID'])
+        matches = self.state['matches']
+        years = self.state['match_years']
+        goals = (df[GOAL_COLUMNS[0]] + df[GOAL_COLUMNS[1]]).tolist()
+        attendance = df['Attendance'].fillna(0).tolist()
+        for match_id, year, g, a in zip(df['MatchID'].astype('int64').tolist(), df['Year'].astype('int64').tolist(),
+                                        goals, attendance):
+            key = str(match_id)
+            if key in matches:
+                old_year, old_goals, old_attendance = matches[key]
+                total = years[str(old_year)]
+                total[0] -= 1
+                total[1] -= old_goals
+                total[2] -= old_attendance
+            matches[key] = [year, _plain_number(g), _plain_number(a)]
+            total = years.setdefault(str(year), [0, 0, 0])
+            total[0] += 1
+            total[1] = _plain_number(total[1] + g)
+            total[2] = _plain_number(total[2] + a)
+        return len(df)
+
+    def refresh(self, summary_path, matches_path):
+        """读取两个 CSV 新追加的行并合并，返回 {'summary': 新行数, 'matches': 新行数, 'rebuilt': 是否重新汇总}"""
+        summary_new = self.read_appended('summary', summary_path)
+        matches_new = self.read_appended('matches', matches_path)
+        rebuilt = summary_new is None or matches_new is None
+        if rebuilt:
+            self.reset()
+            summary_new = self.read_appended('summary', summary_path)
+            matches_new = self.read_appended('matches', matches_path)
+        return {'summary': self.apply_summary(summary_new), 'matches': self.apply_matches(matches_new),
+                'rebuilt': rebuilt}
+
+    # ==================== 查询 ====================
+    def summary_frame(self):
+        """各届汇总行（按首次出现的顺序），附加场均进球数 AvgGoalsPerMatch"""
+        rows = [row for _, row in sorted(self.state['summary'].values(), key=lambda item: item[0])]
+        df = pd.DataFrame(rows, columns=list(SUMMARY_COLUMNS))
+        df['AvgGoalsPerMatch'] = df['GoalsScored'] / df['MatchesPlayed']
+        return df
+
+    def counts(self, name):
+        """计数器内容，按次数从多到少排列，同票时按首次出现的顺序"""
+        counter = self.state['counters'][name]
+        return {value: count for value, (count, _) in sorted(counter.items(), key=lambda item: (-item[1][0], item[1][1]))}
+
+    def match_totals(self):
+        """每届的比赛场数、总进球数和观众人数（由单场比赛汇总）"""
+        rows = sorted((int(year), *totals) for year, totals in self.state['match_years'].items() if totals[0] > 0)
+        return pd.DataFrame(rows, columns=['Year', 'Matches', 'Goals', 'Attendance'])
+
+    @property
+    def summary_rows(self):
+        return len(self.state['summary'])
+
+    @property
+    def match_rows(self):
+        return len(self.state['matches'])
+
+
+def add_arguments(parser):
+    parser.add_argument('--rebuild-aggregates', action='store_true',
+                        help='忽略已保存的汇总结果，重新读取全部 CSV')
+    return parser
+
+
+def options_from_argv():
+    """供没有命令行解析的脚本使用，返回是否需要重新汇总"""
+    args, _ = add_arguments(argparse.ArgumentParser(add_help=False)).parse_known_args()
+    return args.rebuild_aggregates
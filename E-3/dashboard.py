@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+单页仪表盘输出
+index.html 用八个 iframe 分别加载八个视图页面，每个页面各自加载一遍 echarts 和主题脚本。
+仪表盘模式只写出一个 dashboard.html：以 index.html 为模板（样式、标签页和视图说明保持一致），
+iframe 换成图表容器，echarts 运行时和主题只加载一次，八个视图的配置放在一个数据包中，
+某个标签页第一次显示时才创建对应的图表。
+
+数据包的输出方式沿用 --payload：json 直接嵌入紧凑 JSON，inline / sidecar 为 gzip 压缩（见 common.chart_payload）。
+"""
+
+import hashlib
+import json
+import re
+
+from pyecharts.render.engine import RenderEngine
+
+from common import stages
+from common.chart_payload import INFLATE_JS, encode_payload, payload_source, remove_sidecar, round_floats
+from views import view_fingerprint
+
+DASHBOARD_FILE = 'dashboard.html'
+TEMPLATE_FILE = 'index.html'
+# 页面脚本变化时修改版本号，旧的仪表盘缓存会失效
+DASHBOARD_VERSION = 1
+
+_IFRAME = re.compile(r'<iframe id="(view\d+)" class="(view-frame[^"]*)" src="([^"]+)"></iframe>')
+
+_SCRIPT = """
+    <script>
+        (function () {
+            var charts = {};
+            %(inflate)s
+            var ready = %(source)s;
+
+            function ensureChart(index) {
+                var el = document.getElementById('view' + index);
+                if (!el || charts[index]) return;
+                ready.then(function (payload) {
+                    var entry = payload[el.getAttribute('data-view')];
+                    if (charts[index]) return;
+                    if (!entry) {
+                        el.textContent = '未生成该视图';
+                        return;
+                    }
+                    charts[index] = echarts.init(el, entry.theme, {renderer: entry.renderer});
+                    charts[index].setOption(entry.option);
+                });
+            }
+
+            // 在原来的 showView 之后创建图表：容器显示出来以后才有尺寸
+            var show = window.showView;
+            window.showView = function (index) {
+                show(index);
+                ensureChart(index);
+            };
+            window.addEventListener('resize', function () {
+                Object.keys(charts).forEach(function (index) { charts[index].resize(); });
+            });
+        })();
+    </script>
+"""
+
+
+def chart_entry(chart, precision=2):
+    """图表在数据包中的内容：主题、渲染器和数值四舍五入后的配置"""
+    try:
+        option = json.loads(chart.dump_options())
+    except ValueError:
+        raise ValueError(f"图表 {chart.chart_id} 的配置包含 JS 函数，不能放入仪表盘数据包")
+    return {'theme': chart.theme, 'renderer': chart.renderer, 'option': round_floats(option, precision)}
+
+
+def script_links(charts):
+    """所有图表需要的脚本地址（echarts 和主题），去重后保持顺序"""
+    links = []
+    for chart in charts:
+        # 主题脚本在渲染时才加入依赖，这里按 pyecharts 渲染前的步骤补上
+        chart._use_theme()
+        links.extend(RenderEngine.generate_js_link(chart).dependencies)
+    return list(dict.fromkeys(links))
+
+
+def build_page(template, links, source):
+    """把 index.html 模板改写为仪表盘页面"""
+    page, count = _IFRAME.subn(r'<div id="\1" class="\2" data-view="\3"></div>', template)
+    if count == 0:
+        raise RuntimeError(f"{TEMPLATE_FILE} 中没有找到视图的 iframe")
+    tags = ''.join(f'    <script type="text/javascript" src="{link}"></script>\n' for link in links)
+    page = page.replace('</head>', tags + '</head>', 1)
+    script = _SCRIPT % {'inflate': INFLATE_JS, 'source': source}
+    # 放在页面原有脚本之后，showView 已经定义
+    return page.replace('</body>', script.lstrip('\n') + '</body>', 1)
+
+
+def render_dashboard(charts, template, path=DASHBOARD_FILE, mode='json', precision=2):
+    """
+    charts 为 {视图页面文件名: 图表}，文件名与模板中 iframe 的 src 对应；template 为 index.html 的内容
+    返回写出的文件列表
+    """
+    payload = {output: chart_entry(chart, precision) for output, chart in charts.items()}
+    text, blob = encode_payload(payload)
+    files = [path]
+    if mode == 'json':
+        remove_sidecar(path)
+        # 避免数据中的 "</script>" 提前结束脚本
+        source = "Promise.resolve(%s)" % text.decode('utf-8').replace('</', '<\\/')
+    else:
+        source, extra_files = payload_source(blob, mode, path)
+        files.extend(extra_files)
+
+    page = build_page(template, script_links(charts.values()), source)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    return files
+
+
+def build_dashboard(views, inputs, payload_opts=None, manifest=None, force=False,
+                    path=DASHBOARD_FILE, template_path=TEMPLATE_FILE):
+    """
+    构建选中视图的图表并写出仪表盘，返回 (写出的文件列表, 是否跳过)
+    给出 manifest 时，各视图指纹和模板都没有变化则跳过（force=True 时总是重新生成）
+    计算指纹记为“视图/指纹”阶段，各视图的构建记为“视图N”阶段，写出页面记为“仪表盘”阶段
+    """
+    payload_opts = payload_opts or {}
+    with open(template_path, 'r', encoding='utf-8') as f:
+        template = f.read()
+
+    kwargs = [{name: inputs[name] for name in view.inputs} for view in views]
+    fingerprint = None
+    if manifest is not None:
+        with stages.stage('视图/指纹', kind='render'):
+            h = hashlib.sha1(f"{DASHBOARD_VERSION}|".encode('utf-8'))
+            for view, view_kwargs in zip(views, kwargs):
+                h.update(view_fingerprint(view, view_kwargs, payload_opts).encode('utf-8'))
+            h.update(template.encode('utf-8'))
+            fingerprint = h.hexdigest()
+        if not force and manifest.is_fresh(path, fingerprint):
+            return manifest.files(path), True
+
+    charts = {}
+    for view, view_kwargs in zip(views, kwargs):
+        with stages.stage(view.label, kind='render'):
+            charts[view.output] = view.builder(**view_kwargs)
+    with stages.stage('仪表盘', kind='render'):
+        files = render_dashboard(charts, template, path, **payload_opts)
+    if manifest is not None:
+        manifest.record(path, fingerprint, files)
+    return files, False
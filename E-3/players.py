@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+WorldCupPlayers.csv 的紧凑读取
+按块读取 CSV，数值列使用显式的窄整数类型，重复度高的字符串列（队伍、教练、首发/替补、位置、事件、球员名）
+编码为 字典 + 整数编号：每块只对块内不同的字符串做一次查表，再用 NumPy 把块内编号换成全局编号，
+内存占用取决于不同字符串的数量而不是行数。
+
+结果保存为列式副本（与 common.sheet_cache 相同的思路）：
+    .cache/WorldCupPlayers.csv/meta.json       源文件指纹、行数、各列类型
+    .cache/WorldCupPlayers.csv/<列>.npy        数值列 / 编号列（可 mmap）
+    .cache/WorldCupPlayers.csv/dictionaries.json   各编码列的字典
+源文件不变时直接读取副本，不再解析 CSV。
+
+比赛事件（如 "G40' Y70'"）在事件字典上解析一次，再按编号展开为 (行, 类型, 分钟) 的事件表，
+不需要逐行解析字符串。
+"""
+
+import json
+import os
+import re
+import sys
+
+import numpy as np  # pyright: ignore[reportMissingImports]
+import pandas as pd  # pyright: ignore[reportMissingImports]
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from common.sheet_cache import source_fingerprint
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = '.cache'
+CHUNKSIZE = 100_000
+
+# 数值列的类型（RoundID / MatchID 最大约 3 亿，int32 足够）
+NUMERIC_DTYPES = {
+    'RoundID': np.int32,
+    'MatchID': np.int32,
+    'Shirt Number': np.int16,
+}
+# 编码列及其编号类型；缺失值的编号为 -1
+CODED_DTYPES = {
+    'Team Initials': np.int16,
+    'Coach Name': np.int16,
+    'Line-up': np.int16,
+    'Position': np.int16,
+    'Player Name': np.int32,
+    'Event': np.int32,
+}
+COLUMNS = ('RoundID', 'MatchID', 'Team Initials', 'Coach Name', 'Line-up', 'Shirt Number',
+           'Player Name', 'Position', 'Event')
+# 读取 CSV 时的类型：字符串列先按 str 读入，随后立即编码
+READ_DTYPES = {**NUMERIC_DTYPES, **{col: str for col in CODED_DTYPES}}
+
+# 单个事件：类型 + 分钟（可带补时，如 G90+2'）
+_EVENT_TOKEN = re.compile(r"([A-Z]+)(-?\d+)(?:\+(\d+))?'")
+
+
+class Dictionary:
+    """字符串 -> 编号，编号按首次出现的顺序分配"""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.index = {value: i for i, value in enumerate(self.values)}
+
+    def encode(self, column, dtype):
+        """把一列字符串编码为 dtype 类型的编号数组，缺失值为 -1"""
+        codes, uniques = pd.factorize(column, use_na_sentinel=True)
+        mapping = np.empty(len(uniques) + 1, dtype=np.int64)
+        mapping[-1] = -1
+        for i, value in enumerate(uniques):
+            code = self.index.get(value)
+            if code is None:
+                code = self.index[value] = len(self.values)
+                self.values.append(value)
+            mapping[i] = code
+        if len(self.values) - 1 > np.iinfo(dtype).max:
+            raise OverflowError(f"不同取值的数量 {len(self.values)} 超出了 {np.dtype(dtype).name} 的范围")
+        return mapping[codes].astype(dtype)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class PlayerTable:
+    """球员表：数值列和编号列均为 NumPy 数组，编号列附带字典"""
+
+    def __init__(self, columns, dictionaries):
+        self.columns = columns              # 列名 -> 数组
+        self.dictionaries = dictionaries    # 编码列名 -> 字符串列表
+
+    def __len__(self):
+        return len(self.columns[COLUMNS[0]])
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values())
+
+    def codes(self, column):
+        return self.columns[column]
+
+    def categorical(self, column):
+        """编码列转为 pandas Categorical（直接使用编号，不复制字符串）"""
+        return pd.Categorical.from_codes(self.columns[column], categories=self.dictionaries[column])
+
+    def to_frame(self, columns=COLUMNS):
+        """转为 DataFrame，编码列为 category 类型"""
+        data = {}
+        for col in columns:
+            data[col] = self.categorical(col) if col in self.dictionaries else self.columns[col]
+        return pd.DataFrame(data, columns=list(columns))
+
+    def events(self):
+        """
+        展开比赛事件，返回 DataFrame：row（所在行）、type（事件类型，category）、minute、added（补时分钟）
+        每个不同的事件字符串只解析一次
+        """
+        types = {}      # 事件类型 -> 编号，按首次出现的顺序
+        per_code = []   # 每个事件字符串解析出的 [(类型编号, 分钟, 补时)]
+        for text in self.dictionaries['Event']:
+            per_code.append([(types.setdefault(t, len(types)), int(minute), int(added or 0))
+                             for t, minute, added in _EVENT_TOKEN.findall(text)])
+
+        counts = np.array([len(tokens) for tokens in per_code] + [0], dtype=np.int64)
+        flat = np.array([token for tokens in per_code for token in tokens], dtype=np.int64).reshape(-1, 3)
+        starts = np.cumsum(counts) - counts
+
+        codes = self.columns['Event'].astype(np.int64)   # -1 取到 counts[-1] == 0
+        n = counts[codes]
+        rows = np.repeat(np.arange(len(codes)), n)
+        # 每个事件在该字符串中的序号
+        offset = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        picked = flat[np.repeat(starts[codes], n) + offset]
+        return pd.DataFrame({
+            'row': rows.astype(np.int32),
+            'type': pd.Categorical.from_codes(picked[:, 0].astype(np.int16), categories=list(types)),
+            'minute': picked[:, 1].astype(np.int16),
+            'added': picked[:, 2].astype(np.int16),
+        })
+
+    # ==================== 列式副本 ====================
+    def save(self, directory, source=None):
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, 'meta.json')
+        # 先删除旧的 meta，写入中途失败时不会读到半新半旧的副本
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        files = {}
+        for i, (col, values) in enumerate(self.columns.items()):
+            files[col] = f'c{i}.npy'
+            np.save(os.path.join(directory, files[col]), values)
+        with open(os.path.join(directory, 'dictionaries.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.dictionaries, f, ensure_ascii=False)
+        meta = {
+            'version': CACHE_VERSION,
+            'source': source,
+            'rows': len(self),
+            'columns': {col: {'file': files[col], 'dtype': self.columns[col].dtype.name} for col in self.columns},
+        }
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(os.path.join(directory, 'dictionaries.json'), 'r', encoding='utf-8') as f:
+            dictionaries = json.load(f)
+        columns = {col: np.load(os.path.join(directory, desc['file']), mmap_mode=mmap_mode)
+                   for col, desc in meta['columns'].items()}
+        return cls(columns, dictionaries)
+
+
+def iter_player_chunks(path, chunksize=CHUNKSIZE):
+    """按块读取原始 CSV（显式类型，字符串列为 str）"""
+    yield from pd.read_csv(path, chunksize=chunksize, dtype=READ_DTYPES, usecols=list(COLUMNS))
+
+
+def read_players(path, chunksize=CHUNKSIZE):
+    """按块读取并编码，返回 PlayerTable；每块编码后即丢弃，不保留字符串列"""
+    dictionaries = {col: Dictionary() for col in CODED_DTYPES}
+    parts = {col: [] for col in COLUMNS}
+    for chunk in iter_player_chunks(path, chunksize):
+        for col, dtype in NUMERIC_DTYPES.items():
+            parts[col].append(chunk[col].to_numpy(dtype=dtype))
+        for col, dtype in CODED_DTYPES.items():
+            parts[col].append(dictionaries[col].encode(chunk[col].to_numpy(dtype=object), dtype))
+
+    columns = {}
+    for col in COLUMNS:
+        dtype = NUMERIC_DTYPES.get(col) or CODED_DTYPES[col]
+        columns[col] = np.concatenate(parts[col]) if parts[col] else np.zeros(0, dtype=dtype)
+    return PlayerTable(columns, {col: d.values for col, d in dictionaries.items()})
+
+
+def _cache_dir(path, cache_dir=None):
+    base = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    return os.path.join(base, os.path.basename(path))
+
+
+def _is_fresh(directory, fingerprint):
+    try:
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta.get('version') == CACHE_VERSION and meta.get('source') == fingerprint
+
+
+def load_players(path, cache_dir=None, chunksize=CHUNKSIZE):
+    """读取球员表；列式副本存在且源文件未变化时直接以 mmap 方式打开副本"""
+    directory = _cache_dir(path, cache_dir)
+    fingerprint = source_fingerprint(path)
+    if _is_fresh(directory, fingerprint):
+        return PlayerTable.load(directory)
+    table = read_players(path, chunksize)
+    table.save(directory, source=fingerprint)
+    return table
+
+
+if __name__ == '__main__':
+    import time
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '世界杯数据集', 'WorldCupPlayers.csv')
+
+    start = time.perf_counter()
+    default_bytes = pd.read_csv(csv_path).memory_usage(deep=True).sum()
+    default_time = time.perf_counter() - start
+    start = time.perf_counter()
+    players = load_players(csv_path)
+    load_time = time.perf_counter() - start
+    events = players.events()
+    print(f"{len(players)} 行，{len(events)} 个比赛事件")
+    print(f"默认 read_csv：{default_bytes / 1024:.0f} KB，{default_time * 1000:.0f} ms")
+    print(f"紧凑表：{players.nbytes / 1024:.0f} KB（不含字典），{load_time * 1000:.0f} ms")
+    print(events['type'].value_counts().to_string())
@@ -0,0 +1,770 @@
+# -*- coding: utf-8 -*-
+"""
+世界杯数据的八个可视化视图
+每个视图是一个任务：构建函数 + 明确列出的输入（INPUTS 中的名字）+ 输出文件。
+实验脚本完成共享的预处理后，只计算选中视图需要的输入，再把各视图交给进程池并行构建和渲染，
+重新生成一个视图时不需要构建其他七个。
+
+渲染缓存：视图的指纹由输入数据和序列化后的图表配置（dump_options，已包含样式函数和配色的结果）
+共同计算，与渲染清单中上次的指纹相同且文件仍存在时跳过 Jinja 模板渲染和写文件。
+
+命令行参数（由 add_arguments / options_from_argv 解析）：
+    --views 1,6,view8   只生成这些视图（编号或名称，默认全部）
+    --jobs N            并行进程数，0 表示使用全部CPU核心，1 表示在当前进程顺序执行（默认: 0）
+    --force             忽略渲染缓存，重新生成选中的视图
+    --render dashboard  只写出一个仪表盘页面 dashboard.html（见 dashboard.py），默认 pages 为每个视图一个页面
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pyecharts
+from pyecharts.charts import Line, Bar, Pie
+from pyecharts import options as opts
+from pyecharts.globals import ThemeType
+
+from common import stages
+from common.chart_payload import render_chart
+
+RENDER_TARGETS = ('pages', 'dashboard')
+# 输出 HTML 的生成方式（模板、数据嵌入方式）变化时修改版本号，旧的缓存会失效
+RENDER_VERSION = 1
+
+# ==================== 通用样式配置 ====================
+# 现代配色方案
+COLORS = {
+    'primary': '#667eea',
+    'secondary': '#764ba2',
+    'success': '#10b981',
+    'warning': '#f59e0b',
+    'danger': '#ef4444',
+    'info': '#3b82f6',
+    'purple': '#8b5cf6',
+    'pink': '#ec4899',
+    'teal': '#14b8a6',
+    'orange': '#f97316'
+}
+
+# 渐变配色
+GRADIENTS = {
+    'blue_purple': {
+        "type": "linear",
+        "x": 0, "y": 0, "x2": 0, "y2": 1,
+        "colorStops": [
+            {"offset": 0, "color": "#667eea"},
+            {"offset": 1, "color": "#764ba2"}
+        ]
+    },
+    'green_teal': {
+        "type": "linear",
+        "x": 0, "y": 0, "x2": 0, "y2": 1,
+        "colorStops": [
+            {"offset": 0, "color": "#10b981"},
+            {"offset": 1, "color": "#14b8a6"}
+        ]
+    },
+    'orange_red': {
+        "type": "linear",
+        "x": 0, "y": 0, "x2": 0, "y2": 1,
+        "colorStops": [
+            {"offset": 0, "color": "#f97316"},
+            {"offset": 1, "color": "#ef4444"}
+        ]
+    },
+    'purple_pink': {
+        "type": "linear",
+        "x": 0, "y": 0, "x2": 0, "y2": 1,
+        "colorStops": [
+            {"offset": 0, "color": "#8b5cf6"},
+            {"offset": 1, "color": "#ec4899"}
+        ]
+    },
+    'yellow_orange': {
+        "type": "linear",
+        "x": 0, "y": 0, "x2": 0, "y2": 1,
+        "colorStops": [
+            {"offset": 0, "color": "#fbbf24"},
+            {"offset": 1, "color": "#f97316"}
+        ]
+    }
+}
+
+# 通用标题样式
+def get_title_opts(title, subtitle=""):
+    return opts.TitleOpts(
+        title=title,
+        subtitle=subtitle,
+        title_textstyle_opts=opts.TextStyleOpts(
+            font_size=28,
+            font_weight="bold",
+            color="#1e293b",
+            font_family="Arial, sans-serif"
+        ),
+        subtitle_textstyle_opts=opts.TextStyleOpts(
+            font_size=14,
+            color="#64748b",
+            font_family="Arial, sans-serif"
+        ),
+        pos_left="center",
+        pos_top="3%"
+    )
+
+# 通用坐标轴样式
+def get_axis_opts(name, name_gap=30, rotate=0, type_="category", interval="auto"):
+    return opts.AxisOpts(
+        type_=type_,
+        name=name,
+        name_location="middle",
+        name_gap=name_gap,
+        name_textstyle_opts=opts.TextStyleOpts(
+            font_size=15,
+            font_weight="bold",
+            color="#475569",
+            font_family="Arial, sans-serif"
+        ),
+        axislabel_opts=opts.LabelOpts(
+            font_size=12,
+            color="#64748b",
+            rotate=rotate,
+            font_family="Arial, sans-serif",
+            interval=interval  # 控制标签显示间隔，0表示显示所有，'auto'表示自动，数字表示每隔N个显示
+        ),
+        axisline_opts=opts.AxisLineOpts(
+            linestyle_opts=opts.LineStyleOpts(color="#cbd5e1", width=2)
+        ),
+        splitline_opts=opts.SplitLineOpts(
+            is_show=True,
+            linestyle_opts=opts.LineStyleOpts(
+                type_="dashed",
+                opacity=0.2,
+                color="#cbd5e1"
+            )
+        )
+    )
+
+# 通用提示框样式
+def get_tooltip_opts(trigger="axis", formatter=None):
+    return opts.TooltipOpts(
+        trigger=trigger,
+        axis_pointer_type="cross" if trigger == "axis" else "line",
+        formatter=formatter,
+        background_color="rgba(30, 41, 59, 0.95)",
+        border_color="#475569",
+        border_width=1,
+        textstyle_opts=opts.TextStyleOpts(
+            color="#f1f5f9",
+            font_size=13,
+            font_family="Arial, sans-serif"
+        ),
+        padding=[12, 16]
+    )
+
+
+# ==================== 视图1：历届世界杯总进球数趋势 ====================
+def build_view1(year_labels, goals):
+    x_data = year_labels
+    y_data = goals
+    line1 = (
+        Line(init_opts=opts.InitOpts(
+            theme=ThemeType.MACARONS,
+            width='1600px',
+            height='800px',
+            bg_color='#ffffff',
+            chart_id='chart1'
+        ))
+        .add_xaxis(x_data)
+        .add_yaxis(
+            "总进球数",
+            y_data,
+            is_smooth=True,
+            symbol="circle",
+            symbol_size=10,
+            linestyle_opts=opts.LineStyleOpts(width=4, color=COLORS['primary']),
+            itemstyle_opts=opts.ItemStyleOpts(
+                color=COLORS['primary'],
+                border_width=3,
+                border_color="#ffffff"
+            ),
+            label_opts=opts.LabelOpts(is_show=False),
+            areastyle_opts=opts.AreaStyleOpts(
+                opacity=0.2,
+                color=COLORS['primary']
+            ),
+            markpoint_opts=opts.MarkPointOpts(
+                data=[
+                    opts.MarkPointItem(type_="max", name="最大值", symbol_size=70),
+                    opts.MarkPointItem(type_="min", name="最小值", symbol_size=70)
+                ],
+                label_opts=opts.LabelOpts(
+                    color="#ffffff",
+                    font_size=13,
+                    font_weight="bold"
+                ),
+                itemstyle_opts=opts.ItemStyleOpts(color=COLORS['danger'])
+            ),
+            markline_opts=opts.MarkLineOpts(
+                data=[opts.MarkLineItem(type_="average", name="平均值")],
+                label_opts=opts.LabelOpts(
+                    font_size=13,
+                    color="#64748b",
+                    font_weight="bold"
+                ),
+                linestyle_opts=opts.LineStyleOpts(
+                    type_="dashed",
+                    width=2,
+                    color=COLORS['warning']
+                )
+            )
+        )
+        .set_global_opts(
+            title_opts=get_title_opts("历届世界杯总进球数趋势", "1930-2018年共21届世界杯进球数据"),
+            xaxis_opts=get_axis_opts("年份", 35, type_="category", interval=2),  # interval=2表示每隔2个年份显示一次
+            yaxis_opts=get_axis_opts("进球数", 60),
+            tooltip_opts=get_tooltip_opts(),
+            legend_opts=opts.LegendOpts(
+                pos_left="8%",
+                pos_top="12%",
+                textstyle_opts=opts.TextStyleOpts(
+                    font_size=14,
+                    color="#475569",
+                    font_family="Arial, sans-serif"
+                ),
+                item_width=25,
+                item_height=14
+            )
+        )
+    )
+    return line1
+
+
+# ==================== 视图2：各洲举办世界杯次数 ====================
+def build_view2(host_continent_count):
+    pie_data = [list(z) for z in zip(host_continent_count.keys(), host_continent_count.values())]
+    pie_colors = [COLORS['primary'], COLORS['success'], COLORS['warning'], COLORS['info'], COLORS['purple']]
+
+    pie1 = (
+        Pie(init_opts=opts.InitOpts(
+            theme=ThemeType.MACARONS,
+            width='1600px',
+            height='800px',
+            bg_color='#ffffff',
+            chart_id='chart2'
+        ))
+        .add(
+            "",
+            pie_data,
+            radius=["30%", "65%"],
+            center=["50%", "55%"],
+            rosetype="radius",
+            itemstyle_opts=opts.ItemStyleOpts(
+                border_width=3,
+                border_color="#ffffff"
+            )
+        )
+        .set_colors(pie_colors)
+        .set_global_opts(
+            title_opts=get_title_opts("各洲举办世界杯次数分布", "欧洲和美洲是主要举办地"),
+            legend_opts=opts.LegendOpts(
+                orient="vertical",
+                pos_left="78%",
+                pos_top="25%",
+                textstyle_opts=opts.TextStyleOpts(
+                    font_size=14,
+                    color="#475569",
+                    font_family="Arial, sans-serif"
+                ),
+                item_width=25,
+                item_height=16,
+                item_gap=12
+            ),
+            tooltip_opts=get_tooltip_opts(trigger="item", formatter="{b}: {c}次 ({d}%)")
+        )
+        .set_series_opts(
+            label_opts=opts.LabelOpts(
+                formatter="{b}\n{c}次\n({d}%)",
+                font_size=14,
+                font_weight="bold",
+                color="#1e293b",
+                font_family="Arial, sans-serif"
+            )
+        )
+    )
+    return pie1
+
+
+# ==================== 视图3：各洲获得冠军次数 ====================
+def build_view3(winner_continent_count):
+    bar1 = (
+        Bar(init_opts=opts.InitOpts(
+            theme=ThemeType.MACARONS,
+            width='1600px',
+            height='800px',
+            bg_color='#ffffff',
+            chart_id='chart3'
+        ))
+        .add_xaxis(list(winner_continent_count.keys()))
+        .add_yaxis(
+            "冠军次数",
+            list(winner_continent_count.values()),
+            itemstyle_opts=opts.ItemStyleOpts(
+                color=GRADIENTS['green_teal'],
+                border_radius=[10, 10, 0, 0]
+            ),
+            bar_width="55%",
+            label_opts=opts.LabelOpts(
+                is_show=True,
+                position="top",
+                font_size=15,
+                font_weight="bold",
+                color="#1e293b",
+                font_family="Arial, sans-serif"
+            )
+        )
+        .set_global_opts(
+            title_opts=get_title_opts("各洲获得世界杯冠军次数", "欧洲和南美洲占据绝对优势"),
+            xaxis_opts=get_axis_opts("大洲", 35),
+            yaxis_opts=get_axis_opts("冠军次数", 60),
+            tooltip_opts=get_tooltip_opts(        )
+        )
+    )
+    return bar1
+
+
+# ==================== 视图4：历届世界杯观众人数变化 ====================
+def build_view4(year_labels, attendance):
+    x_data2 = year_labels
+    y_data2 = [value / 10000 for value in attendance]
+    line2 = (
+        Line(init_opts=opts.InitOpts(
+            theme=ThemeType.MACARONS,
+            width='1600px',
+            height='800px',
+            bg_color='#ffffff',
+            chart_id='chart4'
+        ))
+        .add_xaxis(x_data2)
+        .add_yaxis(
+            "观众人数（万人）",
+            y_data2,
+            is_smooth=True,
+            symbol="circle",
+            symbol_size=10,
+            linestyle_opts=opts.LineStyleOpts(width=4, color=COLORS['success']),
+            itemstyle_opts=opts.ItemStyleOpts(
+                color=COLORS['success'],
+                border_width=3,
+                border_color="#ffffff"
+            ),
+            label_opts=opts.LabelOpts(is_show=False),
+            areastyle_opts=opts.AreaStyleOpts(
+                opacity=0.2,
+                color=COLORS['success']
+            ),
+            markline_opts=opts.MarkLineOpts(
+                data=[opts.MarkLineItem(type_="average", name="平均值")],
+                label_opts=opts.LabelOpts(
+                    font_size=13,
+                    color="#64748b",
+                    font_weight="bold"
+                ),
+                linestyle_opts=opts.LineStyleOpts(
+                    type_="dashed",
+                    width=2,
+                    color=COLORS['warning']
+                )
+            ),
+            markpoint_opts=opts.MarkPointOpts(
+                data=[opts.MarkPointItem(type_="max", name="最大值", symbol_size=70)],
+                label_opts=opts.LabelOpts(
+                    color="#ffffff",
+                    font_size=13,
+                    font_weight="bold"
+                ),
+                itemstyle_opts=opts.ItemStyleOpts(color=COLORS['danger'])
+            )
+        )
+        .set_global_opts(
+            title_opts=get_title_opts("历届世界杯观众人数变化", "观众人数持续增长，影响力不断扩大"),
+            xaxis_opts=get_axis_opts("年份", 35, type_="category", interval=2),  # interval=2表示每隔2个年份显示一次
+            yaxis_opts=get_axis_opts("观众人数（万人）", 70),
+            tooltip_opts=get_tooltip_opts(formatter="{b}年<br/>{a}: {c}万人"),
+            legend_opts=opts.LegendOpts(
+                pos_left="8%",
+                pos_top="12%",
+                textstyle_opts=opts.TextStyleOpts(
+                    font_size=14,
+                    color="#475569",
+                    font_family="Arial, sans-serif"
+                )
+            )
+        )
+    )
+    return line2
+
+
+# ==================== 视图5：参赛队伍数量变化 ====================
+def build_view5(years, qualified_teams):
+    bar2 = (
+        Bar(init_opts=opts.InitOpts(
+            theme=ThemeType.MACARONS,
+            width='1600px',
+            height='800px',
+            bg_color='#ffffff',
+            chart_id='chart5'
+        ))
+        .add_xaxis(years)
+        .add_yaxis(
+            "参赛队伍数",
+            qualified_teams,
+            itemstyle_opts=opts.ItemStyleOpts(
+                color=GRADIENTS['yellow_orange'],
+                border_radius=[10, 10, 0, 0]
+            ),
+            bar_width="35%",
+            label_opts=opts.LabelOpts(
+                is_show=True,
+                position="top",
+                font_size=12,
+                font_weight="bold",
+                color="#1e293b",
+                font_family="Arial, sans-serif"
+            )
+        )
+        .set_global_opts(
+            title_opts=get_title_opts("历届世界杯参赛队伍数量变化", "从13支到32支，国际化程度不断提升"),
+            xaxis_opts=get_axis_opts("年份", 35, rotate=45),
+            yaxis_opts=get_axis_opts("队伍数", 50),
+            tooltip_opts=get_tooltip_opts(),
+            datazoom_opts=opts.DataZoomOpts(
+                type_="slider",
+                range_start=0,
+                range_end=100
+            )
+        )
+    )
+    return bar2
+
+
+# ==================== 视图6：各队进入前四名次数（Top 10） ====================
+def build_view6(team_top4_count):
+    top10_teams = dict(sorted(team_top4_count.items(), key=lambda x: x[1], reverse=True)[:10])
+    bar3 = (
+        Bar(init_opts=opts.InitOpts(
+            theme=ThemeType.MACARONS,
+            width='1600px',
+            height='800px',
+            bg_color='#ffffff',
+            chart_id='chart6'
+        ))
+        .add_xaxis(list(top10_teams.keys()))
+        .add_yaxis(
+            "进入前四名次数",
+            list(top10_teams.values()),
+            itemstyle_opts=opts.ItemStyleOpts(
+                color=GRADIENTS['purple_pink'],
+                border_radius=[0, 10, 10, 0]
+            ),
+            bar_width="65%",
+            label_opts=opts.LabelOpts(
+                is_show=True,
+                position="right",
+                font_size=14,
+                font_weight="bold",
+                color="#1e293b",
+                font_family="Arial, sans-serif"
+            )
+        )
+        .reversal_axis()
+        .set_global_opts(
+            title_opts=get_title_opts("进入前四名次数最多的10支队伍", "传统强队的稳定表现"),
+            xaxis_opts=get_axis_opts("次数", 35),
+            yaxis_opts=get_axis_opts("队伍", 100),
+            tooltip_opts=get_tooltip_opts(        )
+        )
+    )
+    return bar3
+
+
+# ==================== 视图7：历届世界杯场均进球数 ====================
+def build_view7(year_labels, avg_goals):
+    x_data3 = year_labels
+    y_data3 = avg_goals
+    line3 = (
+        Line(init_opts=opts.InitOpts(
+            theme=ThemeType.MACARONS,
+            width='1600px',
+            height='800px',
+            bg_color='#ffffff',
+            chart_id='chart7'
+        ))
+        .add_xaxis(x_data3)
+        .add_yaxis(
+            "场均进球数",
+            y_data3,
+            is_smooth=True,
+            symbol="circle",
+            symbol_size=10,
+            linestyle_opts=opts.LineStyleOpts(width=4, color=COLORS['purple']),
+            itemstyle_opts=opts.ItemStyleOpts(
+                color=COLORS['purple'],
+                border_width=3,
+                border_color="#ffffff"
+            ),
+            label_opts=opts.LabelOpts(is_show=False),
+            areastyle_opts=opts.AreaStyleOpts(
+                opacity=0.2,
+                color=COLORS['purple']
+            ),
+            markline_opts=opts.MarkLineOpts(
+                data=[opts.MarkLineItem(type_="average", name="平均值")],
+                label_opts=opts.LabelOpts(
+                    font_size=13,
+                    color="#64748b",
+                    font_weight="bold"
+                ),
+                linestyle_opts=opts.LineStyleOpts(
+                    type_="dashed",
+                    width=2,
+                    color=COLORS['warning']
+                )
+            ),
+            markpoint_opts=opts.MarkPointOpts(
+                data=[
+                    opts.MarkPointItem(type_="max", name="最大值", symbol_size=70),
+                    opts.MarkPointItem(type_="min", name="最小值", symbol_size=70)
+                ],
+                label_opts=opts.LabelOpts(
+                    color="#ffffff",
+                    font_size=13,
+                    font_weight="bold"
+                ),
+                itemstyle_opts=opts.ItemStyleOpts(color=COLORS['danger'])
+            )
+        )
+        .set_global_opts(
+            title_opts=get_title_opts("历届世界杯场均进球数变化", "现代足球战术发展对进球数的影响"),
+            xaxis_opts=get_axis_opts("年份", 35, type_="category", interval=2),  # interval=2表示每隔2个年份显示一次
+            yaxis_opts=get_axis_opts("场均进球数", 60),
+            tooltip_opts=get_tooltip_opts(),
+            legend_opts=opts.LegendOpts(
+                pos_left="8%",
+                pos_top="12%",
+                textstyle_opts=opts.TextStyleOpts(
+                    font_size=14,
+                    color="#475569",
+                    font_family="Arial, sans-serif"
+                )
+            )
+        )
+    )
+    return line3
+
+
+# ==================== 视图8：各队获得冠军次数 ====================
+def build_view8(champion_count):
+    champion_sorted = dict(sorted(champion_count.items(), key=lambda x: x[1], reverse=True))
+    bar4 = (
+        Bar(init_opts=opts.InitOpts(
+            theme=ThemeType.MACARONS,
+            width='1600px',
+            height='800px',
+            bg_color='#ffffff',
+            chart_id='chart8'
+        ))
+        .add_xaxis(list(champion_sorted.keys()))
+        .add_yaxis(
+            "冠军次数",
+            list(champion_sorted.values()),
+            itemstyle_opts=opts.ItemStyleOpts(
+                color=GRADIENTS['orange_red'],
+                border_radius=[10, 10, 0, 0]
+            ),
+            bar_width="50%",
+            label_opts=opts.LabelOpts(
+                is_show=True,
+                position="top",
+                font_size=15,
+                font_weight="bold",
+                color="#1e293b",
+                font_family="Arial, sans-serif"
+            )
+        )
+        .set_global_opts(
+            title_opts=get_title_opts("各队获得世界杯冠军次数", "巴西5次夺冠，是世界杯历史上最成功的球队"),
+            xaxis_opts=get_axis_opts("队伍", 35, rotate=-45),
+            yaxis_opts=get_axis_opts("冠军次数", 50),
+            tooltip_opts=get_tooltip_opts(        )
+        )
+    )
+    return bar4
+
+
+# ==================== 任务定义 ====================
+# 输入名 -> 从 (各届汇总表, 汇总存储) 计算该输入的函数；只有选中的视图用到的输入才会计算
+INPUTS = {
+    # 将年份转换为字符串，确保category类型正常工作
+    'year_labels': lambda summary, aggregates: [str(year) for year in summary['Year'].astype(int).tolist()],
+    'years': lambda summary, aggregates: summary['Year'].astype(int).tolist(),
+    'goals': lambda summary, aggregates: summary['GoalsScored'].tolist(),
+    'attendance': lambda summary, aggregates: summary['Attendance'].tolist(),
+    'qualified_teams': lambda summary, aggregates: summary['QualifiedTeams'].tolist(),
+    'avg_goals': lambda summary, aggregates: summary['AvgGoalsPerMatch'].round(2).tolist(),
+    'host_continent_count': lambda summary, aggregates: aggregates.counts('host_continents'),
+    'winner_continent_count': lambda summary, aggregates: aggregates.counts('winner_continents'),
+    'team_top4_count': lambda summary, aggregates: aggregates.counts('top4'),
+    'champion_count': lambda summary, aggregates: aggregates.counts('champions'),
+}
+
+
+class View:
+    def __init__(self, number, name, title, builder, inputs):
+        self.number = number
+        self.name = name
+        self.title = title
+        self.builder = builder
+        self.inputs = inputs
+
+    @property
+    def output(self):
+        return f"{self.name}.html"
+
+    @property
+    def label(self):
+        return f"视图{self.number}"
+
+
+VIEWS = (
+    View(1, 'view1_goals_trend', '历届世界杯总进球数趋势', build_view1, ('year_labels', 'goals')),
+    View(2, 'view2_host_continent', '各洲举办世界杯次数', build_view2, ('host_continent_count',)),
+    View(3, 'view3_winner_continent', '各洲获得冠军次数', build_view3, ('winner_continent_count',)),
+    View(4, 'view4_attendance_trend', '历届世界杯观众人数变化', build_view4, ('year_labels', 'attendance')),
+    View(5, 'view5_teams_count', '参赛队伍数量变化', build_view5, ('years', 'qualified_teams')),
+    View(6, 'view6_top4_teams', '各队进入前四名次数（Top 10）', build_view6, ('team_top4_count',)),
+    View(7, 'view7_avg_goals', '历届世界杯场均进球数', build_view7, ('year_labels', 'avg_goals')),
+    View(8, 'view8_champions', '各队获得冠军次数', build_view8, ('champion_count',)),
+)
+
+
+def select_views(spec=None):
+    """按 --views 的值（逗号分隔的编号或名称，如 "1,6" 或 "view8_champions"）选出视图，None 表示全部"""
+    if not spec:
+        return list(VIEWS)
+    selected = []
+    for item in spec.split(','):
+        item = item.strip()
+        matches = [view for view in VIEWS
+                   if item in (str(view.number), f"view{view.number}", view.name, view.output)]
+        if not matches:
+            raise ValueError(f"没有名为 {item} 的视图")
+        selected.extend(view for view in matches if view not in selected)
+    return sorted(selected, key=lambda view: view.number)
+
+
+def view_inputs(views, summary, aggregates):
+    """计算 views 需要的全部输入，返回 {输入名: 值}"""
+    names = dict.fromkeys(name for view in views for name in view.inputs)
+    return {name: INPUTS[name](summary, aggregates) for name in names}
+
+
+def build_and_render(builder, kwargs, output, payload_opts):
+    """工作进程：构建一个视图并渲染为 HTML，返回写出的文件列表"""
+    return render_chart(builder(**kwargs), output, **payload_opts)
+
+
+def view_fingerprint(view, kwargs, payload_opts):
+    """视图的内容指纹：输入数据 + 序列化后的图表配置 + 输出方式"""
+    h = hashlib.sha1()
+    h.update(f"{RENDER_VERSION}|{pyecharts.__version__}|{view.name}|".encode('utf-8'))
+    h.update(json.dumps(kwargs, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8'))
+    h.update(view.builder(**kwargs).dump_options().encode('utf-8'))
+    h.update(json.dumps(payload_opts, sort_keys=True).encode('utf-8'))
+    return h.hexdigest()
+
+
+def resolve_jobs(jobs, count):
+    """实际使用的进程数：0 表示全部CPU核心，且不超过任务数"""
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    return max(1, min(jobs, count))
+
+
+def render_views(views, inputs, payload_opts=None, jobs=0, manifest=None, force=False):
+    """
+    渲染一组视图，每个视图只拿到自己声明的输入
+    给出 manifest（common.render_manifest.RenderManifest）时，指纹未变化的视图直接跳过（force=True 时全部重新渲染），
+    需要渲染的视图在 jobs=1 时在当前进程顺序执行，否则交给进程池。
+    计算指纹记为“视图/指纹”阶段，每个视图的渲染记为“视图N”阶段（进程池中的计时由工作进程返回）。
+    按视图顺序依次 yield (视图, 写出的文件列表, 是否跳过)；调用方负责 manifest.save()
+    """
+    payload_opts = payload_opts or {}
+    stages.start('视图/指纹', kind='render')
+    tasks = []
+    for view in views:
+        kwargs = {name: inputs[name] for name in view.inputs}
+        fingerprint = view_fingerprint(view, kwargs, payload_opts) if manifest is not None else None
+        fresh = manifest is not None and not force and manifest.is_fresh(view.output, fingerprint)
+        tasks.append((view, kwargs, fingerprint, fresh))
+    stages.stop()
+
+    pending = [(view, kwargs) for view, kwargs, _, fresh in tasks if not fresh]
+    jobs = resolve_jobs(jobs, len(pending))
+    if jobs <= 1:
+        yield from _merge_results(tasks, _render_sequential(pending, payload_opts), manifest)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [(view, pool.submit(stages.measure, build_and_render, view.builder, kwargs, view.output, payload_opts))
+                   for view, kwargs in pending]
+        yield from _merge_results(tasks, _collect(futures), manifest)
+
+
+def _render_sequential(pending, payload_opts):
+    for view, kwargs in pending:
+        with stages.stage(view.label, kind='render'):
+            files = build_and_render(view.builder, kwargs, view.output, payload_opts)
+        yield files
+
+
+def _collect(futures):
+    """按顺序取进程池的结果，并把工作进程中的计时记为该视图的阶段"""
+    for view, future in futures:
+        files, timing = future.result()
+        stages.add_record(view.label, 'render', timing)
+        yield files
+
+
+def _merge_results(tasks, results, manifest):
+    """按视图顺序合并跳过的视图和渲染结果，渲染完成的视图记入 manifest"""
+    for view, _, fingerprint, fresh in tasks:
+        if fresh:
+            yield view, manifest.files(view.output), True
+            continue
+        files = next(results)
+        if manifest is not None:
+            manifest.record(view.output, fingerprint, files)
+        yield view, files, False
+
+
+def add_arguments(parser):
+    parser.add_argument('--views', default=None,
+                        help='只生成这些视图，逗号分隔的编号或名称（如 1,6 或 view8_champions，默认全部）')
+    parser.add_argument('--jobs', type=int, default=0,
+                        help='并行渲染视图的进程数，0 表示使用全部CPU核心，1 表示顺序执行（默认: 0）')
+    parser.add_argument('--force', action='store_true', help='忽略渲染缓存，重新生成选中的视图')
+    parser.add_argument('--render', choices=RENDER_TARGETS, default='pages',
+                        help='pages 为每个视图写一个页面，dashboard 只写出一个加载全部视图的仪表盘页面（默认: pages）')
+    return parser
+
+
+def options_from_argv():
+    """供没有命令行解析的脚本使用，返回参数，其中 views 已换成选中的 View 列表"""
+    parser = add_arguments(argparse.ArgumentParser(add_help=False))
+    args, _ = parser.parse_known_args()
+    try:
+        args.views = select_views(args.views)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""
+三个实验的性能基准
+    python -m benchmarks --scales 1 10 100 1000 --output base.json
+    python -m benchmarks compare base.json new.json
+    python -m benchmarks extract [快照.html ...]
+"""
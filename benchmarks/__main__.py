@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.extract import run_extract_benchmark
+from benchmarks.runner import EXPERIMENTS, git_commit, run_experiment, serve_board
+from benchmarks.scale import build_dataset
+
+
+def run(args):
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [],
+    }
+    for factor in args.scales:
+        workdir = tempfile.mkdtemp(prefix=f'bench_x{factor}_')
+        server = None
+        try:
+            print(f"生成 {factor}x 数据...", file=sys.stderr)
+            build_dataset(workdir, factor)
+            server, board_url = serve_board(workdir)
+            extra_args = {'E-2': ['--board-url', board_url]}
+            for name in args.experiments:
+                print(f"运行 {name}（{factor}x）...", file=sys.stderr)
+                result = run_experiment(name, workdir, timeout=args.timeout, extra_args=extra_args.get(name, ()))
+                result['scale'] = factor
+                report['results'].append(result)
+                status = '完成' if result['returncode'] == 0 else f"失败（返回码 {result['returncode']}）"
+                print(f"  {status}：{result['wall_time']:.2f}s，内存峰值 {result['peak_rss_kb']} KB，"
+                      f"输出 {result['output_bytes']} 字节", file=sys.stderr)
+        finally:
+            if server is not None:
+                server.shutdown()
+            if args.keep:
+                print(f"  数据目录保留在 {workdir}", file=sys.stderr)
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+def _index(report):
+    index = {}
+    for result in report['results']:
+        key = (result['experiment'], result['scale'])
+        index[(*key, '总计')] = result['wall_time']
+        for stage in result['stages']:
+            index[(*key, stage['name'])] = stage['wall_time']
+    return index
+
+
+def compare(args):
+    with open(args.base, 'r', encoding='utf-8') as f:
+        base = _index(json.load(f))
+    with open(args.new, 'r', encoding='utf-8') as f:
+        new = _index(json.load(f))
+
+    print(f"{'实验':<6}{'倍数':>6}  {'阶段':<16}{'基准(s)':>10}{'新(s)':>10}{'比值':>8}")
+    for key in (k for k in base if k in new):
+        ratio = new[key] / base[key] if base[key] else float('inf')
+        print(f"{key[0]:<6}{key[1]:>6}  {key[2]:<16}{base[key]:>10.3f}{new[key]:>10.3f}{ratio:>8.2f}")
+
+
+def extract(args):
+    results = run_extract_benchmark(args.snapshots, repeat=args.repeat)
+    print(f"{'快照':<40}{'大小(KB)':>10}{'原实现(ms)':>12}{'单次遍历(ms)':>14}{'加速':>8}  结果")
+    for r in results:
+        name = r['snapshot'] if len(r['snapshot']) <= 38 else '...' + r['snapshot'][-35:]
+        same = f"一致（{r['words']} 条）" if r['same'] else '不一致'
+        print(f"{name:<40}{r['bytes'] / 1024:>10.1f}{r['soup'] * 1000:>12.2f}{r['single_pass'] * 1000:>14.2f}"
+              f"{r['speedup']:>8.1f}  {same}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if not all(r['same'] for r in results):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='实验一~三的性能基准')
+    sub = parser.add_subparsers(dest='command')
+
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100, 1000],
+                        help='数据放大倍数（默认: 1 10 100 1000）')
+    parser.add_argument('--experiments', nargs='+', choices=sorted(EXPERIMENTS), default=sorted(EXPERIMENTS),
+                        help='要运行的实验（默认: 全部）')
+    parser.add_argument('--timeout', type=float, default=None, help='单个实验的超时时间（秒）')
+    parser.add_argument('--output', default=None, help='结果 JSON 文件（默认输出到标准输出）')
+    parser.add_argument('--keep', action='store_true', help='保留生成的数据目录')
+
+    cmp_parser = sub.add_parser('compare', help='比较两次基准结果')
+    cmp_parser.add_argument('base')
+    cmp_parser.add_argument('new')
+
+    ext_parser = sub.add_parser('extract', help='热搜词条提取：原实现与单次遍历实现对比')
+    ext_parser.add_argument('snapshots', nargs='*', help='榜单快照 HTML（默认: E-2 热搜缓存中的快照）')
+    ext_parser.add_argument('--repeat', type=int, default=5, help='每个快照重复次数，取最短时间')
+    ext_parser.add_argument('--output', default=None, help='结果 JSON 文件')
+
+    args = parser.parse_args()
+    if args.command == 'compare':
+        compare(args)
+    elif args.command == 'extract':
+        extract(args)
+    else:
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
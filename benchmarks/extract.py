@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+热搜词条提取的基准
+对保存的榜单快照分别运行原来的 BeautifulSoup 逐个选择器实现（本模块的 extract_hot_words_soup）
+和单次遍历实现（hot_extract.extract_hot_words），比较耗时并校验两者结果一致。
+快照默认取 E-2 热搜缓存中的 body.html；没有快照时使用按榜单结构生成的示例网页。
+"""
+
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+from .scale import REPO_ROOT
+
+E2_DIR = os.path.join(REPO_ROOT, 'E-2')
+
+
+def default_snapshots():
+    return sorted(glob.glob(os.path.join(E2_DIR, '.cache', 'hot_search', '*', 'body.html')))
+
+
+def synthetic_snapshot(items=50, filler=3000, seed=0):
+    """生成与热搜榜页面结构类似的网页：大量无关元素 + 榜单条目 + 内嵌 JSON 脚本"""
+    rng = random.Random(seed)
+    parts = ['<html><head><title>热搜榜</title><style>.x{color:red}</style></head><body>']
+    for i in range(filler):
+        cls = rng.choice(['nav-item', 'footer-link', 'content-wrap', 'banner', 'tag'])
+        parts.append(f'<div class="{cls}"><span>占位{i}</span><a href="#{i}">链接{i}</a></div>')
+    parts.append('<div class="list">')
+    for i in range(items):
+        parts.append(f'<div class="category-wrap"><a class="title_dIF3B" href="#">'
+                     f'<div class="c-single-text-ellipsis"> 热搜条目{i:03d} </div></a>'
+                     f'<div class="hot-index">{rng.randint(10000, 9999999)}</div></div>')
+    parts.append('</div><script>var data={"cards":[')
+    parts.append(','.join(f'{{"word":"热搜条目{i:03d}","query":"q{i}"}}' for i in range(items)))
+    parts.append(']};</script></body></html>')
+    return ''.join(parts)
+
+
+# 原来基于 BeautifulSoup 的逐个选择器提取，只作为 hot_extract 的对照（耗时和结果校验）
+SCRIPT_PATTERNS = [
+    r'"title":"([^"]+)"',
+    r'"keyword":"([^"]+)"',
+    r'"word":"([^"]+)"',
+]
+
+
+def extract_hot_words_soup(html, limit=20):
+    """从热搜网页中提取前 limit 个不重复的词条，返回 [(词条, 权重)]"""
+    from bs4 import BeautifulSoup  # pyright: ignore[reportMissingModuleSource]
+    from hot_extract import SELECTORS
+
+    soup = BeautifulSoup(html, 'html.parser')
+    hot_words = []
+    found = False
+    seen_texts = set()
+
+    for selector in SELECTORS:
+        elements = soup.select(selector)
+        if elements:
+            for elem in elements[:30]:
+                text = elem.get_text(strip=True)
+                if text and 2 <= len(text) <= 50 and text not in seen_texts:
+                    seen_texts.add(text)
+                    hot_words.append((text, limit + 1 - len(hot_words)))
+                    if len(hot_words) >= limit:
+                        break
+            if len(hot_words) >= limit:
+                found = True
+                break
+
+    if not found:
+        for script in soup.find_all('script'):
+            if script.string:
+                for pattern in SCRIPT_PATTERNS:
+                    for match in re.findall(pattern, script.string)[:limit]:
+                        if match and 2 <= len(match) <= 50 and match not in seen_texts:
+                            seen_texts.add(match)
+                            hot_words.append((match, limit + 1 - len(hot_words)))
+                            if len(hot_words) >= limit:
+                                break
+                    if len(hot_words) >= limit:
+                        found = True
+                        break
+                if found:
+                    break
+    return hot_words
+
+
+def _best_time(func, html, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_extract_benchmark(paths=None, repeat=5):
+    """返回每个快照的 {'snapshot', 'bytes', 'soup', 'single_pass', 'speedup', 'same'}"""
+    if E2_DIR not in sys.path:
+        sys.path.insert(0, E2_DIR)
+    from hot_extract import extract_hot_words
+
+    snapshots = []
+    for path in paths or default_snapshots():
+        with open(path, 'rb') as f:
+            snapshots.append((path, f.read().decode('utf-8', errors='replace')))
+    if not snapshots:
+        snapshots.append(('<示例网页>', synthetic_snapshot()))
+
+    results = []
+    for name, html in snapshots:
+        soup_time, expected = _best_time(extract_hot_words_soup, html, repeat)
+        fast_time, actual = _best_time(extract_hot_words, html, repeat)
+        results.append({
+            'snapshot': name,
+            'bytes': len(html.encode('utf-8')),
+            'soup': soup_time,
+            'single_pass': fast_time,
+            'speedup': soup_time / fast_time if fast_time else float('inf'),
+            'same': expected == actual,
+            'words': len(actual),
+        })
+    return results
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+运行实验脚本并收集计时结果
+每个实验在独立子进程中运行（工作目录为放大数据所在目录），
+脚本通过 common.stages 记录各阶段耗时，这里汇总为总耗时、内存峰值和输出文件大小。
+E-2 的热搜榜从本地 HTTP 服务器读取数据目录中的快照（serve_board），结果不依赖网络。
+"""
+
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common.stages import STAGES_OUT_ENV
+
+from .scale import BOARD_DIR, REPO_ROOT
+
+# 实验名 -> (脚本, 相对工作目录, 额外参数, 输出文件模式)
+EXPERIMENTS = {
+    'E-1': ('E-1/experiment.py', '.', ['--force'], '*.png'),
+    'E-2': ('E-2/experiment.py', 'E-2', [], '*.html'),
+    'E-3': ('E-3/experiment.py', 'E-3', [], '*.html'),
+}
+
+
+def serve_board(workdir):
+    """用 E-2 的 serve_directory 提供 workdir 中的热搜榜快照，返回 (server, 榜单地址)"""
+    e2_dir = os.path.join(REPO_ROOT, 'E-2')
+    if e2_dir not in sys.path:
+        sys.path.insert(0, e2_dir)
+    from hot_search import serve_directory
+
+    server, base_url = serve_directory(os.path.join(workdir, BOARD_DIR))
+    return server, base_url + 'index.html'
+
+
+def run_experiment(name, workdir, timeout=None, extra_args=()):
+    script, rel_cwd, args, pattern = EXPERIMENTS[name]
+    args = args + list(extra_args)
+    cwd = os.path.join(workdir, rel_cwd)
+    fd, stages_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    env = dict(os.environ, **{STAGES_OUT_ENV: stages_path, 'MPLBACKEND': 'Agg'})
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, os.path.join(REPO_ROOT, script)] + args,
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=timeout,
+    )
+    wall_time = time.perf_counter() - start
+
+    try:
+        with open(stages_path, 'r', encoding='utf-8') as f:
+            stages = json.load(f)
+    except (OSError, ValueError):
+        stages = {'stages': [], 'peak_rss_kb': None}
+    finally:
+        os.remove(stages_path)
+
+    outputs = {os.path.basename(p): os.path.getsize(p) for p in sorted(glob.glob(os.path.join(cwd, pattern)))}
+    result = {
+        'experiment': name,
+        'returncode': proc.returncode,
+        'wall_time': wall_time,
+        'peak_rss_kb': stages['peak_rss_kb'],
+        'output_bytes': sum(outputs.values()),
+        'outputs': outputs,
+        'stages': stages['stages'],
+    }
+    if proc.returncode != 0:
+        result['stderr'] = proc.stderr[-2000:]
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
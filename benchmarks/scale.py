@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+生成放大版数据集
+把三个实验的输入数据复制 N 倍写入工作目录，目录结构与仓库一致：
+    <workdir>/E-1/covid19_data.xls
+    <workdir>/E-2/student.xls, weibo.json
+    <workdir>/E-3/世界杯数据集/*.csv
+    <workdir>/hot_board/index.html    热搜榜快照（由本地 HTTP 服务器提供给 E-2，不访问网络）
+每份副本的名称类字段加后缀、编号类字段加偏移，避免重复键被合并。
+"""
+
+import json
+import os
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORLD_CUP_DIR = '世界杯数据集'
+BOARD_DIR = 'hot_board'
+
+# .xls 格式单个工作表的行数上限
+XLS_MAX_ROWS = 65535
+
+
+def tile_frame(df, factor, suffix_cols=(), offsets=None):
+    """把 df 复制 factor 份；第 i 份的 suffix_cols 加后缀 _i，offsets 中的列加 i*偏移量"""
+    offsets = offsets or {}
+    copies = []
+    for i in range(factor):
+        part = df.copy()
+        if i:
+            for col in suffix_cols:
+                part[col] = part[col].astype(str) + f'_{i}'
+            for col, step in offsets.items():
+                part[col] = part[col] + i * step
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True)
+
+
+def write_xls(path, sheets):
+    """用 xlwt 写 .xls（pandas 已不再支持写 .xls）"""
+    try:
+        import xlwt
+    except ImportError as e:
+        raise ImportError("生成放大版 .xls 需要安装 xlwt") from e
+
+    book = xlwt.Workbook(encoding='utf-8')
+    for name, df in sheets.items():
+        if len(df) > XLS_MAX_ROWS:
+            raise ValueError(f"{name} 共 {len(df)} 行，超过 .xls 单表上限 {XLS_MAX_ROWS} 行")
+        sheet = book.add_sheet(name)
+        for j, col in enumerate(df.columns):
+            sheet.write(0, j, str(col))
+        for i, row in enumerate(df.itertuples(index=False), start=1):
+            for j, value in enumerate(row):
+                if pd.isna(value):
+                    continue
+                sheet.write(i, j, value.item() if hasattr(value, 'item') else value)
+    book.save(path)
+
+
+def scale_covid(workdir, factor):
+    src = os.path.join(REPO_ROOT, 'E-1', 'covid19_data.xls')
+    sheets = pd.read_excel(src, sheet_name=['data_history', 'data_world', 'current_prov'])
+
+    history = tile_frame(sheets['data_history'], factor)
+    start = pd.to_datetime(sheets['data_history']['date'].iloc[0])
+    history['date'] = pd.date_range(start, periods=len(history), freq='D').strftime('%Y-%m-%d')
+
+    out_dir = os.path.join(workdir, 'E-1')
+    os.makedirs(out_dir, exist_ok=True)
+    write_xls(os.path.join(out_dir, 'covid19_data.xls'), {
+        'data_history': history,
+        'data_world': tile_frame(sheets['data_world'], factor, suffix_cols=['country']),
+        'current_prov': tile_frame(sheets['current_prov'], factor, suffix_cols=['province']),
+    })
+
+
+def scale_student(workdir, factor):
+    df = pd.read_excel(os.path.join(REPO_ROOT, 'E-2', 'student.xls'))
+    df = tile_frame(df, factor, suffix_cols=['姓名'], offsets={'学号': 10 ** 10})
+    out_dir = os.path.join(workdir, 'E-2')
+    os.makedirs(out_dir, exist_ok=True)
+    write_xls(os.path.join(out_dir, 'student.xls'), {'Sheet1': df})
+
+
+def scale_weibo(workdir, factor):
+    with open(os.path.join(REPO_ROOT, 'E-2', 'weibo.json'), 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    nodes, links, categories = data[0], data[1], data[2]
+
+    def rename(value, i):
+        return f'{value}_{i}' if i and value else value
+
+    scaled_nodes, scaled_links, scaled_categories = [], [], []
+    for i in range(factor):
+        for node in nodes:
+            scaled_nodes.append(dict(node, name=rename(node.get('name'), i),
+                                     category=rename(node.get('category'), i)))
+        for link in links:
+            scaled_links.append(dict(link, source=rename(link.get('source'), i),
+                                     target=rename(link.get('target'), i)))
+        for cat in categories:
+            scaled_categories.append(dict(cat, name=rename(cat.get('name'), i)))
+
+    out_dir = os.path.join(workdir, 'E-2')
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, 'weibo.json'), 'w', encoding='utf-8') as f:
+        json.dump([scaled_nodes, scaled_links, scaled_categories] + data[3:], f, ensure_ascii=False)
+
+
+def scale_world_cup(workdir, factor):
+    src_dir = os.path.join(REPO_ROOT, 'E-3', WORLD_CUP_DIR)
+    out_dir = os.path.join(workdir, 'E-3', WORLD_CUP_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    def scale_csv(name, **kwargs):
+        df = pd.read_csv(os.path.join(src_dir, name))
+        tile_frame(df, factor, **kwargs).to_csv(os.path.join(out_dir, name), index=False, encoding='utf-8-sig')
+
+    scale_csv('WorldCupsSummary.csv', offsets={'Year': 100})
+    scale_csv('WorldCupMatches.csv', offsets={'Year': 100, 'MatchID': 10 ** 6, 'RoundID': 10 ** 6})
+    scale_csv('WorldCupPlayers.csv', offsets={'MatchID': 10 ** 6, 'RoundID': 10 ** 6})
+
+
+def write_hot_board(workdir):
+    """写出热搜榜快照：优先用 E-2 热搜缓存中的第一个快照，没有时用固定种子生成的示例网页"""
+    from .extract import default_snapshots, synthetic_snapshot
+
+    snapshots = default_snapshots()
+    if snapshots:
+        with open(snapshots[0], 'rb') as f:
+            body = f.read()
+    else:
+        body = synthetic_snapshot().encode('utf-8')
+    out_dir = os.path.join(workdir, BOARD_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, 'index.html'), 'wb') as f:
+        f.write(body)
+
+
+def build_dataset(workdir, factor):
+    """在 workdir 下生成放大 factor 倍的全部数据"""
+    scale_covid(workdir, factor)
+    scale_student(workdir, factor)
+    scale_weibo(workdir, factor)
+    scale_world_cup(workdir, factor)
+    write_hot_board(workdir)
+    return workdir
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+直方图分箱
+先用 np.searchsorted 把每个值换算成整数箱号，再用 np.bincount 一次统计所有列，
+支持多列同时统计和加权计数。箱边界只由数据范围和参数决定，同样的输入每次得到同样的边界。
+"""
+
+import numpy as np
+
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=float)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def equal_width_edges(values, bins):
+    """
+    每列按自身取值范围等分为 bins 个箱，与 np.histogram(bins=int) 的边界一致
+    返回形状为 (bins+1, 列数) 的边界矩阵
+    """
+    values = _as_2d(values)
+    lo = np.nanmin(values, axis=0)
+    hi = np.nanmax(values, axis=0)
+    # 取值全部相同时与 numpy 一样左右各扩展 0.5
+    same = lo == hi
+    lo = np.where(same, lo - 0.5, lo)
+    hi = np.where(same, hi + 0.5, hi)
+    # np.linspace 的最后一个点就是 hi，最大值不会因为舍入落到最后一条边界之外
+    return np.linspace(lo, hi, bins + 1)
+
+
+def fixed_width_edges(min_value, max_value, bin_size):
+    """按固定宽度分箱，边界对齐到 bin_size 的整数倍"""
+    min_value = int(min_value)
+    max_value = int(max_value)
+    edges = list(range(min_value - (min_value % bin_size), max_value + bin_size, bin_size))
+    if edges[-1] < max_value:
+        edges.append(edges[-1] + bin_size)
+    return np.asarray(edges)
+
+
+def bin_indices(values, edges, closed_last=True):
+    """
+    计算每个值所在的箱号，箱外或缺失值为 -1
+    edges 为一维（所有列共用）或 (bins+1, 列数)（每列各自的边界）
+    closed_last=True 时最后一个箱包含右端点（同 np.histogram），否则所有箱都是左闭右开
+    """
+    values = _as_2d(values)
+    edges = np.asarray(edges, dtype=float)
+    if edges.ndim == 1:
+        edges = np.repeat(edges[:, None], values.shape[1], axis=1)
+    nbins = edges.shape[0] - 1
+
+    # 边界不要求等宽：逐列二分查找，第 i 箱为 [edges[i], edges[i+1])
+    idx = np.empty(values.shape, dtype=np.int64)
+    for col in range(values.shape[1]):
+        idx[:, col] = np.searchsorted(edges[:, col], values[:, col], side='right') - 1
+
+    last = edges[-1]
+    if closed_last:
+        idx = np.where(values == last, nbins - 1, idx)
+    # 左侧箱外为 -1，右侧箱外和 NaN（排在所有边界之后）为 nbins
+    return np.where((idx >= 0) & (idx < nbins), idx, -1)
+
+
+def histogram(values, edges, weights=None, closed_last=True):
+    """
+    多列直方图，返回形状为 (bins, 列数) 的计数矩阵
+    weights 与 values 形状相同时为加权计数
+    """
+    values = _as_2d(values)
+    edges = np.asarray(edges)
+    nbins = edges.shape[0] - 1
+    ncols = values.shape[1]
+
+    idx = bin_indices(values, edges, closed_last=closed_last)
+    valid = idx >= 0
+    flat = (idx + np.arange(ncols) * nbins)[valid]
+    if weights is not None:
+        weights = _as_2d(weights)[valid]
+        counts = np.bincount(flat, weights=weights, minlength=nbins * ncols)
+    else:
+        counts = np.bincount(flat, minlength=nbins * ncols)
+    return counts.reshape(ncols, nbins).T
+
+
+def fixed_width_group_edges(values, groups, n_groups, bin_size):
+    """
+    按组计算 fixed_width_edges 的分箱：每组的边界从该组最小值（取整后）向下对齐到 bin_size 的整数倍开始，
+    到覆盖该组最大值为止。返回 (各组起点, 各组箱数)，没有数据的组起点和箱数都是 0
+    """
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups)
+    valid = ~np.isnan(values)
+    lo_raw = np.full(n_groups, np.nan)
+    hi_raw = np.full(n_groups, np.nan)
+    np.fmin.at(lo_raw, groups[valid], values[valid])
+    np.fmax.at(hi_raw, groups[valid], values[valid])
+    present = ~np.isnan(lo_raw)
+
+    lo = np.zeros(n_groups, dtype=np.int64)
+    nbins = np.zeros(n_groups, dtype=np.int64)
+    imin = np.trunc(lo_raw[present]).astype(np.int64)
+    imax = np.trunc(hi_raw[present]).astype(np.int64)
+    lo[present] = imin - imin % bin_size
+    nbins[present] = (imax + bin_size - lo[present] + bin_size - 1) // bin_size - 1
+    return lo, nbins
+
+
+def group_histogram(values, groups, lo, nbins, bin_size):
+    """
+    分组等宽直方图：第 g 组的第 i 个箱为 [lo[g] + i*bin_size, lo[g] + (i+1)*bin_size)，i < nbins[g]（左闭右开）
+    各组的箱首尾相接，用一次 np.bincount 统计所有组。
+    返回 (各组在计数中的起点, 计数)，第 g 组为 counts[offsets[g]:offsets[g] + nbins[g]]
+    """
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups)
+    offsets = np.cumsum(nbins) - nbins
+    valid = ~np.isnan(values)
+    g = groups[valid]
+    idx = np.floor((values[valid] - lo[g]) / bin_size).astype(np.int64)
+    inside = (idx >= 0) & (idx < nbins[g])
+    counts = np.bincount(offsets[g[inside]] + idx[inside], minlength=int(nbins.sum()))
+    return offsets, counts
+
+
+if __name__ == '__main__':
+    # 自检：最大值必须落在最后一箱，非等宽边界按实际边界分箱
+    rng = np.random.default_rng(0)
+    samples = rng.normal(size=(10000, 4)) * [1, 1e3, 1e-3, 7.3] + [0, 1e6, 0, -3]
+    edges = equal_width_edges(samples, bins=15)
+    assert (edges[-1] == samples.max(axis=0)).all()
+    counts = histogram(samples, edges)
+    assert (counts.sum(axis=0) == len(samples)).all()
+    for col in range(samples.shape[1]):
+        expected, expected_edges = np.histogram(samples[:, col], bins=15)
+        assert (counts[:, col] == expected).all() and (edges[:, col] == expected_edges).all()
+
+    uneven = [0, 10, 11, 12, 13]
+    values = [-1, 0, 9.99, 10, 10.5, 11, 12.5, 13, 14, np.nan]
+    assert bin_indices(values, uneven).ravel().tolist() == [-1, 0, 0, 1, 1, 2, 3, 3, -1, -1]
+    assert bin_indices(values, uneven, closed_last=False).ravel().tolist() == [-1, 0, 0, 1, 1, 2, 3, -1, -1, -1]
+    assert (histogram(values, uneven).ravel() == np.histogram(np.asarray(values)[~np.isnan(values)], uneven)[0]).all()
+
+    # 分组版本与逐组 fixed_width_edges + histogram(closed_last=False) 一致
+    scores = np.round(rng.uniform(-5, 100, 3000), 1)
+    scores[rng.random(3000) < 0.1] = np.nan
+    groups = rng.integers(0, 40, 3000)
+    lo, nbins = fixed_width_group_edges(scores, groups, 41, 10)
+    offsets, counts = group_histogram(scores, groups, lo, nbins, 10)
+    for g in range(41):
+        part = scores[(groups == g) & ~np.isnan(scores)]
+        if len(part) == 0:
+            assert nbins[g] == 0
+            continue
+        edges = fixed_width_edges(part.min(), part.max(), 10)
+        assert lo[g] == edges[0] and nbins[g] == len(edges) - 1
+        expected = histogram(part, edges, closed_last=False).ravel()
+        assert (counts[offsets[g]:offsets[g] + nbins[g]] == expected).all()
+    print("binning 自检通过")
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+pyecharts 图表的紧凑数据输出
+默认的 chart.render() 把所有系列数据以缩进 JSON 写进 HTML。这里把各系列的 data / nodes / links
+取出来，数值四舍五入到显示精度，压缩为 gzip JSON，页面加载后用浏览器的 DecompressionStream 解压再 setOption：
+
+    json      原样输出（chart.render）
+    inline    gzip 数据以 base64 嵌入 HTML，直接双击打开也能显示
+    sidecar   gzip 数据写入同名的 .data.json.gz 文件，由页面 fetch（需要通过 HTTP 访问）
+
+命令行参数（由 add_arguments / options_from_argv 解析）：
+    --payload {json,inline,sidecar}   默认取环境变量 EXPERIMENT_PAYLOAD，未设置时为 json
+    --precision N                     保留的小数位数，默认 2
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import re
+
+from pyecharts.charts.base import default as _pyecharts_default  # pyright: ignore[reportMissingImports]
+
+MODES = ('json', 'inline', 'sidecar')
+PAYLOAD_ENV = 'EXPERIMENT_PAYLOAD'
+PAYLOAD_KEYS = ('data', 'nodes', 'links')
+# 数据少于该字节数时不值得压缩，仍按原样嵌入
+MIN_PAYLOAD_BYTES = 4096
+# pyecharts 用这个占位符包裹 JsCode，含有 JS 函数的数据不能放进 JSON
+_JS_PLACEHOLDER = '--x_x--0_0--'
+
+# 解压函数；payload_source 返回的表达式中用到 inflate
+INFLATE_JS = """function inflate(stream) {
+                return new Response(stream.pipeThrough(new DecompressionStream('gzip'))).json();
+            }"""
+
+_LOADER = """
+        (function () {
+            var chart = chart_%(id)s, option = option_%(id)s;
+            %(inflate)s
+            %(source)s.then(function (payload) {
+                payload.forEach(function (item) {
+                    option.series[item.series][item.key] = item.value;
+                });
+                chart.setOption(option);
+            });
+        })();"""
+
+_INLINE_SOURCE = "inflate(new Blob([Uint8Array.from(atob('%s'), function (c) { return c.charCodeAt(0); })]).stream())"
+_SIDECAR_SOURCE = "fetch('%s').then(function (r) { return inflate(r.body); })"
+
+
+def add_arguments(parser):
+    parser.add_argument('--payload', choices=MODES, default=os.environ.get(PAYLOAD_ENV, 'json'),
+                        help='图表数据的输出方式：json 原样嵌入，inline 压缩后嵌入，sidecar 压缩为单独文件')
+    parser.add_argument('--precision', type=int, default=2, help='压缩输出时数值保留的小数位数')
+    return parser
+
+
+def options_from_argv():
+    """供没有命令行解析的脚本使用，返回 render_chart 的关键字参数"""
+    args, _ = add_arguments(argparse.ArgumentParser(add_help=False)).parse_known_args()
+    return {'mode': args.payload, 'precision': args.precision}
+
+
+def round_floats(obj, digits):
+    """递归地把浮点数四舍五入到 digits 位，整数值的浮点数写成整数"""
+    if isinstance(obj, float):
+        value = round(obj, digits)
+        return int(value) if value.is_integer() else value
+    if isinstance(obj, list):
+        return [round_floats(item, digits) for item in obj]
+    if isinstance(obj, dict):
+        return {key: round_floats(value, digits) for key, value in obj.items()}
+    return obj
+
+
+def extract_payload(chart, precision=2):
+    """
+    从图表的各系列中取出数据，返回 (payload, 原始数据)
+    payload 为 [{'series': 系列下标, 'key': 键名, 'value': 数据}]，原始数据用于 restore_payload
+    """
+    payload, removed = [], []
+    for index, series in enumerate(chart.options.get('series') or []):
+        for key in PAYLOAD_KEYS:
+            value = series.get(key)
+            if not isinstance(value, list) or not value:
+                continue
+            text = json.dumps(value, default=_pyecharts_default, ensure_ascii=False)
+            if _JS_PLACEHOLDER in text:
+                continue
+            payload.append({'series': index, 'key': key, 'value': round_floats(json.loads(text), precision)})
+            removed.append((series, key, value))
+            series[key] = []
+    return payload, removed
+
+
+def restore_payload(removed):
+    for series, key, value in removed:
+        series[key] = value
+
+
+def encode_payload(payload):
+    text = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    # mtime=0 让相同的数据得到相同的文件
+    return text, gzip.compress(text, compresslevel=9, mtime=0)
+
+
+def sidecar_path(path):
+    return os.path.splitext(path)[0] + '.data.json.gz'
+
+
+def remove_sidecar(path):
+    """删除 path 之前以 sidecar 方式输出时留下的数据文件"""
+    try:
+        os.remove(sidecar_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def payload_source(blob, mode, path):
+    """
+    返回 (得到 payload 的 JS 表达式（Promise，需要 INFLATE_JS 中的 inflate）, 额外写出的文件列表)
+    inline 时数据以 base64 嵌入表达式；sidecar 时写出 path 对应的 .data.json.gz，由页面 fetch
+    """
+    if mode == 'inline':
+        remove_sidecar(path)
+        return _INLINE_SOURCE % base64.b64encode(blob).decode('ascii'), []
+    if mode != 'sidecar':
+        raise ValueError(f"不支持的压缩数据输出方式: {mode}")
+    data_path = sidecar_path(path)
+    with open(data_path, 'wb') as f:
+        f.write(blob)
+    return _SIDECAR_SOURCE % os.path.basename(data_path), [data_path]
+
+
+def render_chart(chart, path, mode='json', precision=2):
+    """按 mode 渲染图表，返回写出的文件列表"""
+    if mode not in MODES:
+        raise ValueError(f"不支持的数据输出方式: {mode}")
+    if mode == 'json':
+        remove_sidecar(path)
+        chart.render(path)
+        return [path]
+
+    payload, removed = extract_payload(chart, precision)
+    text, blob = encode_payload(payload)
+    if len(text) < MIN_PAYLOAD_BYTES:
+        restore_payload(removed)
+        remove_sidecar(path)
+        chart.render(path)
+        return [path]
+    try:
+        chart.render(path)
+    finally:
+        restore_payload(removed)
+
+    source, extra_files = payload_source(blob, mode, path)
+    files = [path] + extra_files
+
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    chart_id = re.escape(chart.chart_id)
+    set_option = re.compile(rf"chart_{chart_id}\.setOption\(option_{chart_id}\);")
+    loader = _LOADER % {'id': chart.chart_id, 'inflate': INFLATE_JS, 'source': source}
+    html, count = set_option.subn(lambda _: loader.strip(), html, count=1)
+    if count == 0:
+        raise RuntimeError(f"{path} 中没有找到图表 {chart.chart_id} 的 setOption 调用")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return files
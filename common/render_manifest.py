@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+渲染清单
+记录每个输出文件对应的输入指纹和写出的文件，指纹没有变化且文件仍存在时跳过渲染。
+指纹的计算方式由各实验决定（E-1 为数据内容 + 构建函数，E-3 为视图输入 + 图表配置）。
+"""
+
+import json
+import os
+
+
+class RenderManifest:
+    """任务输出名 -> (输入指纹, 写出的文件列表) 的映射，保存为 JSON"""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def is_fresh(self, output, fingerprint):
+        entry = self.entries.get(os.path.abspath(output))
+        return (
+            isinstance(entry, dict)
+            and entry.get('fingerprint') == fingerprint
+            and all(os.path.exists(path) for path in entry.get('files', []))
+        )
+
+    def files(self, output):
+        """上次为 output 写出的文件列表"""
+        entry = self.entries.get(os.path.abspath(output))
+        return list(entry.get('files', [])) if isinstance(entry, dict) else []
+
+    def record(self, output, fingerprint, files):
+        self.entries[os.path.abspath(output)] = {
+            'fingerprint': fingerprint,
+            'files': [os.path.abspath(path) for path in files],
+        }
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Excel 工作表列式缓存
+首次读取时把每个工作表按列保存为 .npy 文件（可 mmap），
+之后只要源文件的 mtime 和大小不变，就直接读取缓存而不再经过 xlrd 解析。
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = '.cache'
+
+
+def source_fingerprint(path):
+    """源文件指纹：修改时间（纳秒）+ 文件大小"""
+    st = os.stat(path)
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+
+
+def _sheet_cache_dir(path, sheet_name, cache_dir=None):
+    base = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+    return os.path.join(base, os.path.basename(path), str(sheet_name))
+
+
+def _options_key(kwargs):
+    return repr(sorted(kwargs.items()))
+
+
+def _read_meta(sheet_dir):
+    try:
+        with open(os.path.join(sheet_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_fresh(meta, fingerprint, options):
+    return (
+        meta is not None
+        and meta.get('version') == CACHE_VERSION
+        and meta.get('source') == fingerprint
+        and meta.get('options') == options
+    )
+
+
+def _save_column(sheet_dir, i, series):
+    """保存单列，返回列描述；数值/日期列直接保存，纯字符串列转为定长 unicode 数组 + 空值掩码"""
+    values = series.to_numpy()
+    if values.dtype.kind in 'biufcmM':
+        np.save(os.path.join(sheet_dir, f'c{i}.npy'), values)
+        return {'kind': 'array'}
+
+    values = series.to_numpy(dtype=object)
+    mask = pd.isna(values)
+    present = values[~mask]
+    if all(isinstance(v, str) for v in present):
+        filled = np.where(mask, '', values).astype(str)
+        np.save(os.path.join(sheet_dir, f'c{i}.npy'), filled)
+        np.save(os.path.join(sheet_dir, f'c{i}_null.npy'), mask)
+        return {'kind': 'str'}
+
+    # 混合类型列无法 mmap，只能退回 pickle 保存
+    np.save(os.path.join(sheet_dir, f'c{i}.npy'), values, allow_pickle=True)
+    return {'kind': 'object'}
+
+
+def _load_column(sheet_dir, i, kind):
+    path = os.path.join(sheet_dir, f'c{i}.npy')
+    if kind == 'array':
+        return np.load(path, mmap_mode='r')
+    if kind == 'str':
+        values = np.load(path, mmap_mode='r').astype(object)
+        mask = np.load(os.path.join(sheet_dir, f'c{i}_null.npy'))
+        values[mask] = None
+        return values
+    return np.load(path, allow_pickle=True)
+
+
+def _write_cache(sheet_dir, df, fingerprint, options):
+    os.makedirs(sheet_dir, exist_ok=True)
+    # 先删除旧的 meta，保证写入中途失败时不会读到半新半旧的缓存
+    meta_path = os.path.join(sheet_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    for name in os.listdir(sheet_dir):
+        if name.endswith('.npy'):
+            os.remove(os.path.join(sheet_dir, name))
+
+    index_names = []
+    if not isinstance(df.index, pd.RangeIndex):
+        index_names = [name if name is not None else f'level_{i}' for i, name in enumerate(df.index.names)]
+        df = df.reset_index(names=index_names)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        desc = _save_column(sheet_dir, i, df.iloc[:, i])
+        desc['name'] = name
+        columns.append(desc)
+
+    meta = {
+        'version': CACHE_VERSION,
+        'source': fingerprint,
+        'options': options,
+        'rows': len(df),
+        'columns': columns,
+        'index': index_names,
+    }
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, meta_path)
+
+
+def _load_cache(sheet_dir, meta):
+    data = {}
+    for i, col in enumerate(meta['columns']):
+        data[col['name']] = _load_column(sheet_dir, i, col['kind'])
+    df = pd.DataFrame(data, columns=[col['name'] for col in meta['columns']])
+    if meta['index']:
+        df = df.set_index(meta['index'])
+    return df
+
+
+def read_sheets_cached(path, sheet_names, cache_dir=None, **kwargs):
+    """
+    读取多个工作表，返回 {sheet_name: DataFrame}
+    只有缓存缺失或过期的工作表才会打开工作簿解析，且整个工作簿只打开一次
+    """
+    fingerprint = source_fingerprint(path)
+    options = _options_key(kwargs)
+
+    result = {}
+    stale = []
+    for sheet in sheet_names:
+        sheet_dir = _sheet_cache_dir(path, sheet, cache_dir)
+        meta = _read_meta(sheet_dir)
+        if _is_fresh(meta, fingerprint, options):
+            result[sheet] = _load_cache(sheet_dir, meta)
+        else:
+            stale.append(sheet)
+
+    if stale:
+        with pd.ExcelFile(path) as book:
+            for sheet in stale:
+                df = pd.read_excel(book, sheet_name=sheet, **kwargs)
+                _write_cache(_sheet_cache_dir(path, sheet, cache_dir), df, fingerprint, options)
+                result[sheet] = df
+
+    return {sheet: result[sheet] for sheet in sheet_names}
+
+
+def read_excel_cached(path, sheet_name=0, cache_dir=None, **kwargs):
+    """pd.read_excel 的缓存版本，只支持单个工作表"""
+    return read_sheets_cached(path, [sheet_name], cache_dir=cache_dir, **kwargs)[sheet_name]
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+实验脚本的阶段计时与性能追踪
+脚本在“数据读取”“任务1”“视图1”等步骤处标记阶段，记录每个阶段的耗时、CPU 时间和内存峰值；
+开启追踪后还会用 tracemalloc 记录内存分配变化，并可导出 Chrome trace-event JSON
+（在 chrome://tracing 或 Perfetto 中打开），开启 --profile 时每个阶段单独保存 cProfile 统计。
+
+用法：
+    stages.start('数据读取', kind='load')   # 开始新阶段，自动结束上一个阶段
+    stages.stop()                          # 结束当前阶段
+    with stages.stage('任务1', kind='render'): ...
+    @stages.timed_stage('任务1', kind='render')
+    result, timing = stages.measure(func, ...)   # 在工作进程中计时，
+    stages.add_record('视图1', 'render', timing) # 再由主进程记录
+
+命令行参数（由 add_arguments / configure_from_argv 解析）：
+    --trace PATH     导出 Chrome trace 并记录内存分配
+    --profile DIR    每个阶段的 cProfile 统计写入 DIR
+环境变量 EXPERIMENT_STAGES_OUT 设置时，进程退出前把记录写成 JSON（供 benchmarks 使用）。
+"""
+
+import argparse
+import atexit
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+STAGES_OUT_ENV = 'EXPERIMENT_STAGES_OUT'
+TRACE_OUT_ENV = 'EXPERIMENT_TRACE_OUT'
+PROFILE_DIR_ENV = 'EXPERIMENT_PROFILE_DIR'
+
+
+def peak_rss_kb():
+    """
+    当前进程到目前为止的内存峰值（KB），不支持的平台返回 None
+    Linux 上读 /proc/self/status 的 VmHWM：它在 exec 时清零，只反映本进程；
+    ru_maxrss 会继承 fork 前父进程的峰值，由基准脚本启动的实验会报告成父进程的内存
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 上单位是字节，Linux 上是 KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class StageRecorder:
+    def __init__(self):
+        self.records = []
+        self.trace_path = None
+        self.profile_dir = None
+        self._origin = time.perf_counter()
+        self._current = None
+
+    @property
+    def trace_memory(self):
+        return self.trace_path is not None
+
+    def configure(self, trace_path=None, profile_dir=None):
+        self.trace_path = trace_path
+        self.profile_dir = profile_dir
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def start(self, name, kind=None):
+        self.stop()
+        current = {'name': name, 'kind': kind}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            current['alloc_start'] = tracemalloc.get_traced_memory()[0]
+        if self.profile_dir:
+            current['profiler'] = cProfile.Profile()
+            current['profiler'].enable()
+        current['cpu_start'] = time.process_time()
+        current['start'] = time.perf_counter()
+        self._current = current
+
+    def stop(self):
+        if self._current is None:
+            return None
+        end = time.perf_counter()
+        cpu_end = time.process_time()
+        current, self._current = self._current, None
+
+        record = {
+            'name': current['name'],
+            'kind': current['kind'],
+            'ts': current['start'] - self._origin,
+            'wall_time': end - current['start'],
+            'cpu_time': cpu_end - current['cpu_start'],
+            'peak_rss_kb': peak_rss_kb(),
+        }
+        if 'alloc_start' in current:
+            allocated, peak = tracemalloc.get_traced_memory()
+            record['alloc_delta_kb'] = (allocated - current['alloc_start']) / 1024
+            record['alloc_peak_kb'] = (peak - current['alloc_start']) / 1024
+        if 'profiler' in current:
+            current['profiler'].disable()
+            safe_name = re.sub(r'[\\/:*?"<>|\s]+', '_', current['name'])
+            path = os.path.join(self.profile_dir, f'{len(self.records) + 1:02d}_{safe_name}.prof')
+            current['profiler'].dump_stats(path)
+            record['profile'] = path
+        self.records.append(record)
+        return record
+
+    def add(self, name, kind, timing):
+        """记录在其他进程中完成的阶段（timing 由 measure() 返回），开始时间换算到本进程的时间轴"""
+        start = timing['start_epoch'] - (time.time() - time.perf_counter())
+        record = {
+            'name': name,
+            'kind': kind,
+            'ts': start - self._origin,
+            'wall_time': timing['wall_time'],
+            'cpu_time': timing['cpu_time'],
+            'peak_rss_kb': timing['peak_rss_kb'],
+            'pid': timing['pid'],
+        }
+        self.records.append(record)
+        return record
+
+    def dump(self, path):
+        self.stop()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'stages': self.records, 'peak_rss_kb': peak_rss_kb()}, f, ensure_ascii=False, indent=2)
+
+    def chrome_trace(self):
+        """转换为 Chrome trace-event 格式（时间单位为微秒）"""
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            args = {key: value for key, value in record.items()
+                    if key not in ('name', 'kind', 'ts', 'wall_time', 'pid')}
+            events.append({
+                'name': record['name'],
+                'cat': record['kind'] or 'stage',
+                'ph': 'X',
+                'ts': record['ts'] * 1e6,
+                'dur': record['wall_time'] * 1e6,
+                'pid': record.get('pid', pid),
+                'tid': 0,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_trace(self, path):
+        self.stop()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+    def summary(self):
+        lines = [f"{'阶段':<16}{'耗时(s)':>10}{'CPU(s)':>10}{'分配(KB)':>12}{'分配峰值(KB)':>14}"]
+        for r in self.records:
+            delta = f"{r['alloc_delta_kb']:.1f}" if 'alloc_delta_kb' in r else '-'
+            peak = f"{r['alloc_peak_kb']:.1f}" if 'alloc_peak_kb' in r else '-'
+            lines.append(f"{r['name']:<16}{r['wall_time']:>10.3f}{r['cpu_time']:>10.3f}{delta:>12}{peak:>14}")
+        return '\n'.join(lines)
+
+
+recorder = StageRecorder()
+start = recorder.start
+stop = recorder.stop
+add_record = recorder.add
+
+
+@contextlib.contextmanager
+def stage(name, kind=None):
+    recorder.start(name, kind)
+    try:
+        yield
+    finally:
+        recorder.stop()
+
+
+def timed_stage(name, kind=None):
+    """把整个函数记为一个阶段"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def measure(func, *args, **kwargs):
+    """运行 func 并计时，返回 (结果, 计时)；用于工作进程，计时交给主进程的 add_record 记录"""
+    start_epoch = time.time()
+    cpu_start = time.process_time()
+    begin = time.perf_counter()
+    result = func(*args, **kwargs)
+    timing = {
+        'start_epoch': start_epoch,
+        'wall_time': time.perf_counter() - begin,
+        'cpu_time': time.process_time() - cpu_start,
+        'peak_rss_kb': peak_rss_kb(),
+        'pid': os.getpid(),
+    }
+    return result, timing
+
+
+def add_arguments(parser):
+    parser.add_argument('--trace', default=os.environ.get(TRACE_OUT_ENV),
+                        help='导出各阶段的 Chrome trace JSON，并记录内存分配')
+    parser.add_argument('--profile', default=os.environ.get(PROFILE_DIR_ENV),
+                        help='把每个阶段的 cProfile 统计保存到该目录')
+    return parser
+
+
+def configure(args):
+    recorder.configure(trace_path=args.trace, profile_dir=args.profile)
+
+
+def configure_from_argv():
+    """供没有命令行解析的脚本使用，只解析追踪相关参数"""
+    args, _ = add_arguments(argparse.ArgumentParser(add_help=False)).parse_known_args()
+    configure(args)
+
+
+def _dump_on_exit():
+    recorder.stop()
+    path = os.environ.get(STAGES_OUT_ENV)
+    if path:
+        recorder.dump(path)
+    if recorder.trace_path:
+        recorder.export_trace(recorder.trace_path)
+    if recorder.trace_path or recorder.profile_dir:
+        print("\n各阶段性能统计：")
+        print(recorder.summary())
+        if recorder.trace_path:
+            print(f"Chrome trace 已保存为 {recorder.trace_path}")
+        if recorder.profile_dir:
+            print(f"cProfile 统计已保存到 {recorder.profile_dir}")
+
+
+atexit.register(_dump_on_exit)
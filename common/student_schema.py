@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+学生成绩表的列角色推断
+根据列名判断姓名、性别、各科成绩、总分分别是哪一列。推断结果与 sheet_cache 的列式缓存放在同一目录
+（schema.json），按源文件指纹和规则版本校验，源文件不变时重复运行或批量处理都不需要重新解析 .xls，
+也不需要重新推断。
+
+匹配规则与原来 E-2 任务3 的 if/elif 链一致：
+    每一列取第一个匹配的角色（按 ROLES 的顺序），同一角色有多列匹配时取最后一列。
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .sheet_cache import _sheet_cache_dir, read_excel_cached, source_fingerprint
+
+# 匹配规则变化时修改版本号，旧的推断结果会失效
+SCHEMA_VERSION = 1
+SCHEMA_FILENAME = 'schema.json'
+
+# (角色, 原样匹配的中文关键字, 小写后匹配的英文关键字)，顺序即优先级
+ROLES = (
+    ('name', ('姓名',), ('name',)),
+    ('gender', ('性别',), ('gender', 'sex')),
+    ('english', ('英语',), ('english', 'eng')),
+    ('math_analysis', ('数分', '数学分析'), ('math',)),
+    ('linear_algebra', ('高代', '线性代数'), ('linear',)),
+    ('analytic_geometry', ('解几', '解析几何'), ('analytic',)),
+    ('total', ('总分',), ('total', 'sum')),
+)
+ROLE_NAMES = tuple(role for role, _, _ in ROLES)
+# 四门课程及其在图表中的显示名
+COURSE_ROLES = (
+    ('english', '英语'),
+    ('math_analysis', '数分'),
+    ('linear_algebra', '高代'),
+    ('analytic_geometry', '解几'),
+)
+
+
+def _keyword_pattern(keywords):
+    return '|'.join(map(str, keywords))
+
+
+def infer_roles(columns):
+    """返回 {角色: 列名或 None}"""
+    columns = list(columns)
+    if not columns:
+        return {role: None for role in ROLE_NAMES}
+    text = pd.Index([str(col) for col in columns])
+    lower = text.str.lower()
+    # matches[r, c]：第 c 列是否匹配第 r 个角色
+    matches = np.array([
+        text.str.contains(_keyword_pattern(zh), regex=True) | lower.str.contains(_keyword_pattern(en), regex=True)
+        for _, zh, en in ROLES
+    ])
+    first_role = np.where(matches.any(axis=0), matches.argmax(axis=0), -1)
+
+    roles = {}
+    for r, role in enumerate(ROLE_NAMES):
+        hits = np.flatnonzero(first_role == r)
+        roles[role] = columns[hits[-1]] if len(hits) else None
+    return roles
+
+
+def _schema_path(path, sheet_name, cache_dir=None):
+    return os.path.join(_sheet_cache_dir(path, sheet_name, cache_dir), SCHEMA_FILENAME)
+
+
+def _load_schema(schema_path, fingerprint, columns):
+    try:
+        with open(schema_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (cached.get('version') != SCHEMA_VERSION or cached.get('source') != fingerprint
+            or cached.get('columns') != columns):
+        return None
+    return cached['roles']
+
+
+def _save_schema(schema_path, fingerprint, columns, roles):
+    os.makedirs(os.path.dirname(schema_path), exist_ok=True)
+    payload = {'version': SCHEMA_VERSION, 'source': fingerprint, 'columns': columns, 'roles': roles}
+    tmp_path = schema_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, schema_path)
+
+
+def cached_roles(path, df, sheet_name=0, cache_dir=None):
+    """读取或推断 df（来自 path 的 sheet_name 工作表）的列角色"""
+    fingerprint = source_fingerprint(path)
+    columns = [str(col) for col in df.columns]
+    schema_path = _schema_path(path, sheet_name, cache_dir)
+    stored = _load_schema(schema_path, fingerprint, columns)
+    if stored is not None:
+        # json 中的列名都是字符串，换回 DataFrame 中实际的列名
+        by_text = dict(zip(columns, df.columns))
+        return {role: by_text.get(col) if col is not None else None for role, col in stored.items()}
+
+    roles = infer_roles(df.columns)
+    _save_schema(schema_path, fingerprint, columns,
+                 {role: str(col) if col is not None else None for role, col in roles.items()})
+    return roles
+
+
+def read_student_sheet(path, sheet_name=0, cache_dir=None):
+    """读取成绩表，返回 (DataFrame, {角色: 列名或 None})，表格和列角色都走缓存"""
+    df = read_excel_cached(path, sheet_name=sheet_name, cache_dir=cache_dir)
+    return df, cached_roles(path, df, sheet_name=sheet_name, cache_dir=cache_dir)
+
+
+def score_columns(roles):
+    """已找到的课程列，按 COURSE_ROLES 的顺序返回 [(列名, 显示名)]"""
+    return [(roles[role], label) for role, label in COURSE_ROLES if roles.get(role) is not None]